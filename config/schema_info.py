@@ -0,0 +1,40 @@
+# === dtype schema for HCO tables (English column names after column_mapping) ===
+from config.mapping_info import department_mapping_snake_case
+
+# Low-cardinality text → pandas category
+category_columns = [
+    "category",
+    "category_en",
+    "province",
+    "province_en",
+    "city",
+    "department",
+    "source_file",
+    "group",
+    "crawl_ts",
+]
+
+# Free text → compact (Arrow-backed where available) strings
+string_columns = [
+    "hospital_name",
+    "address",
+    "homepage_address",
+    "ykiho",
+    "doctor_info",
+    "specialties",
+    "special_fields",
+]
+
+# Counts → smallest integer type that fits
+count_columns = [
+    "NO",
+    "num_beds",
+    "num_doctors",
+    "num_dentists",
+    "num_korean_med",
+    "total_medical_staff",
+] + list(department_mapping_snake_case.values())
+
+# Identifiers normalized to compact strings
+phone_columns = ["phone"]
+postal_code_columns = ["postal_code"]
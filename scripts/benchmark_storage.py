@@ -0,0 +1,75 @@
+# scripts/benchmark_storage.py
+
+import os
+import sys
+import time
+import resource
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# edit file_path to load utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.analysis_utils import load_and_merge_files
+from utils.storage import ingest_folder, load_dataset
+
+# 📁 Base directory
+base_dir = os.path.dirname(os.path.abspath(__file__))
+
+# 📂 Raw download folders and their Parquet datasets
+sources = {
+    "hco": os.path.join(base_dir, "../data/hco"),
+    "clinic": os.path.join(base_dir, "../data/clinic"),
+}
+parquet_root = os.path.join(base_dir, "../data/parquet")
+
+
+# Each measurement runs in a freshly spawned process so peak RSS belongs to that load path only
+def load_xlsx():
+    frames = [load_and_merge_files(folder, file_type="xlsx") for folder in sources.values()]
+    return frames
+
+
+def load_parquet():
+    return [load_dataset(os.path.join(parquet_root, name)) for name in sources]
+
+
+def load_parquet_projected():
+    columns = ["hospital_name", "address", "group"]
+    return [load_dataset(os.path.join(parquet_root, name), columns=columns) for name in sources]
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(name):
+    baseline = peak_rss_mb()  # interpreter + pandas/pyarrow imports
+    start = time.perf_counter()
+    frames = globals()[name]()
+    seconds = time.perf_counter() - start
+    return {
+        "path": name,
+        "seconds": round(seconds, 2),
+        "rows": sum(len(df) for df in frames),
+        "frame_mb": round(sum(df.memory_usage(deep=True).sum() for df in frames) / 1024 ** 2, 1),
+        "peak_rss_mb": round(peak_rss_mb() - baseline, 1),
+    }
+
+
+if __name__ == "__main__":
+    # 📦 Ingest once (already converted files are skipped)
+    start = time.perf_counter()
+    for name, folder in sources.items():
+        ingest_folder(folder, os.path.join(parquet_root, name))
+    print(f"📦 Ingest: {time.perf_counter() - start:.1f}s")
+
+    # ⏱️ Full-dataset load: xlsx (current path) vs Parquet (full and projected)
+    results = []
+    for name in ("load_xlsx", "load_parquet", "load_parquet_projected"):
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results.append(executor.submit(measure, name).result())
+
+    for r in results:
+        print(f" - {r['path']}: {r['seconds']}s, {r['rows']} rows, "
+              f"frame {r['frame_mb']} MB, peak RSS +{r['peak_rss_mb']} MB")
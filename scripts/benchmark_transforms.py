@@ -0,0 +1,84 @@
+# scripts/benchmark_transforms.py
+
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+# edit file_path to load utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config.mapping_info import department_mapping_snake_case
+from utils.analysis_utils import (
+    extract_doctor_counts,
+    extract_doctor_counts_vectorized,
+    extract_region_info,
+    extract_region_info_vectorized,
+    pivot_specialties,
+)
+
+# 📁 Base directory
+base_dir = os.path.dirname(os.path.abspath(__file__))
+
+# 📂 Real detail data, tiled up to the benchmark sizes
+detail_path = os.path.join(base_dir, "../data/final_dataset/hco_detail_merged_20250519_1244.csv")
+addresses = ["서울특별시 종로구 율곡로 1", "강원도 춘천시 중앙로 1", "경기 수원시 팔달구", "전라북도 전주시 완산구", None]
+
+
+def tile(series, n):
+    return pd.Series(series.tolist() * (n // len(series) + 1), dtype="string").iloc[:n].reset_index(drop=True)
+
+
+# Per-row paths as the notebook ran them
+def doctor_counts_row_wise(doctor_info):
+    return doctor_info.apply(extract_doctor_counts)
+
+
+def specialties_row_wise(df):
+    df = df.copy()
+    dept_set = set()
+    for row in df["specialties"].dropna().to_list():
+        dept_set.update(dept.strip() for dept in re.findall(r"([^,()]+)\s*\(\d+\)", row))
+    for dept in dept_set:
+        df[dept] = 0
+    for idx, row in df.iterrows():
+        if pd.isna(row["specialties"]):
+            continue
+        for dept, count in re.findall(r"([^,()]+)\s*\((\d+)\)", row["specialties"]):
+            df.at[idx, dept.strip()] = int(count)
+    return df[sorted(dept_set)].rename(columns=department_mapping_snake_case)
+
+
+def regions_row_wise(address):
+    return address.apply(extract_region_info)
+
+
+def measure(func, data):
+    start = time.perf_counter()
+    func(data)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    # 📌 Parameters
+    doctor_rows = 1_000_000
+    specialty_rows = 100_000
+    region_rows = 100_000
+
+    detail = pd.read_csv(detail_path)
+    cases = [
+        ("doctor counts", doctor_rows, tile(detail["doctor_info"], doctor_rows),
+         doctor_counts_row_wise, extract_doctor_counts_vectorized),
+        ("specialties", specialty_rows, tile(detail["specialties"], specialty_rows).to_frame("specialties"),
+         specialties_row_wise, pivot_specialties),
+        ("regions", region_rows, tile(pd.Series(addresses), region_rows),
+         regions_row_wise, extract_region_info_vectorized),
+    ]
+
+    # ⏱️ Per-row vs vectorized on the same input
+    for name, rows, data, row_wise, vectorized in cases:
+        slow = measure(row_wise, data)
+        fast = measure(vectorized, data)
+        print(f" - {name} ({rows:,} rows): row-wise {slow:.2f}s, vectorized {fast:.2f}s, x{slow / fast:.0f}")
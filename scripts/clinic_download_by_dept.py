@@ -5,6 +5,7 @@ import sys
 # edit file_path to load utils
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from utils.scraper_clinic import ClinicScraper
+from utils.scraper_pool import ScraperPool
 
 if __name__ == "__main__":
     # 🧾 Base settings & 
@@ -15,12 +16,27 @@ if __name__ == "__main__":
     download_path = os.path.join(base_dir, "../data/clinic_data")
     log_path = os.path.join(base_dir, "../log/clinic")
     filename_pattern = "clinic_{dept}_auto_{timestamp}{ext}"
+    checkpoint_path = os.path.join(log_path, "checkpoint.jsonl")  # resume point after a crash
+    num_workers = 1  # > 1 shards departments across headless Chrome workers
 
     # 🚀 Run scraper
-    scraper = ClinicScraper(
-        url=target_url,
-        download_dir=download_path,
-        log_dir=log_path,
-        file_naming_rule=filename_pattern
-    )
+    if num_workers > 1:
+        scraper = ScraperPool(
+            ClinicScraper,
+            url=target_url,
+            download_dir=download_path,
+            log_dir=log_path,
+            num_workers=num_workers,
+            lean=True,  # headless, no images/map tiles: more workers per box
+            file_naming_rule=filename_pattern,
+            checkpoint_path=checkpoint_path
+        )
+    else:
+        scraper = ClinicScraper(
+            url=target_url,
+            download_dir=download_path,
+            log_dir=log_path,
+            file_naming_rule=filename_pattern,
+            checkpoint_path=checkpoint_path
+        )
     scraper.run()
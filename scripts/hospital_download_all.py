@@ -6,6 +6,7 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from utils.scraper_hospital import HospitalScraper
+from utils.scraper_pool import ScraperPool
 
 if __name__ == "__main__":
     # 🧾 Base settings
@@ -17,13 +18,29 @@ if __name__ == "__main__":
     log_path = os.path.join(base_dir, "../log/hco")
     exclude = ["의원"]
     filename_pattern = "{category}_auto_{timestamp}{ext}"  # Customizable
+    checkpoint_path = os.path.join(log_path, "checkpoint.jsonl")  # resume point after a crash
+    num_workers = 1  # > 1 shards categories across headless Chrome workers
 
     # 🚀 Run scraper
-    scraper = HospitalScraper(
-        url=target_url,
-        download_dir=download_path,
-        log_dir=log_path,
-        exclude_categories=exclude,
-        file_naming_rule=filename_pattern
-    )
+    if num_workers > 1:
+        scraper = ScraperPool(
+            HospitalScraper,
+            url=target_url,
+            download_dir=download_path,
+            log_dir=log_path,
+            num_workers=num_workers,
+            lean=True,  # headless, no images/map tiles: more workers per box
+            exclude_categories=exclude,
+            file_naming_rule=filename_pattern,
+            checkpoint_path=checkpoint_path
+        )
+    else:
+        scraper = HospitalScraper(
+            url=target_url,
+            download_dir=download_path,
+            log_dir=log_path,
+            exclude_categories=exclude,
+            file_naming_rule=filename_pattern,
+            checkpoint_path=checkpoint_path
+        )
     scraper.run()
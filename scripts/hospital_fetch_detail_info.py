@@ -17,6 +17,8 @@ if __name__ == "__main__":
 
     # 📂 Output directories
     save_dir = os.path.join(base_dir, "../data/hco_detail")
+    cache_path = os.path.join(base_dir, "../data/cache/hco_detail_cache.sqlite")
+    checkpoint_path = os.path.join(base_dir, "../log/hco_detail/checkpoint.jsonl")
 
     # 📄 File naming rule
     filename_pattern = "hco_info_auto_{category}_{timestamp}.csv"
@@ -29,6 +31,8 @@ if __name__ == "__main__":
         url=target_url,
         save_dir=save_dir,
         target_categories=target_categories,
-        file_naming_rule=filename_pattern
+        file_naming_rule=filename_pattern,
+        cache_path=cache_path,
+        checkpoint_path=checkpoint_path
     )
     scraper.run()
@@ -0,0 +1,25 @@
+# scripts/ingest_to_parquet.py
+
+import os
+import sys
+
+# edit file_path to load utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.storage import ingest_folder
+
+if __name__ == "__main__":
+    # 📁 Base directory
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+
+    # 📂 Raw download folders → partitioned Parquet datasets
+    sources = {
+        "hco": os.path.join(base_dir, "../data/hco"),
+        "clinic": os.path.join(base_dir, "../data/clinic"),
+        "hco_detail": os.path.join(base_dir, "../data/hco_detail"),
+    }
+    parquet_root = os.path.join(base_dir, "../data/parquet")
+
+    # 🚀 Convert each downloaded file once (existing partitions are skipped)
+    for name, folder in sources.items():
+        ingest_folder(folder, os.path.join(parquet_root, name))
@@ -0,0 +1,85 @@
+# scripts/query_hco.py
+
+import os
+import sys
+import time
+import argparse
+
+import duckdb
+import pandas as pd
+
+# edit file_path to load utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.query_engine import HCOQueryEngine, SUMMARY_QUERIES, SUMMARY_PARAMS
+
+# 📁 Base directory
+base_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Examples:
+#   python scripts/query_hco.py --list
+#   python scripts/query_hco.py --summary category_share
+#   python scripts/query_hco.py --summary top_hospitals_by_staff --param category=종합병원 --param n=5
+#   python scripts/query_hco.py --ingest "SELECT province, COUNT(*) FROM raw_hco_latest GROUP BY ALL"
+#   python scripts/query_hco.py "SELECT * FROM hco_all WHERE province = '서울특별시'" --out seoul.parquet
+
+
+def parse_params(pairs):
+    params = {}
+    for pair in pairs:
+        key, _, value = pair.partition("=")
+        params[key] = int(value) if value.lstrip("-").isdigit() else value
+    return params
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run SQL over the HCO pipeline outputs (DuckDB)")
+    parser.add_argument("sql", nargs="?", help="SQL over the registered views")
+    parser.add_argument("--summary", choices=sorted(SUMMARY_QUERIES), help="run a notebook summary table")
+    parser.add_argument("--param", action="append", default=[], help="query parameter as name=value")
+    parser.add_argument("--list", action="store_true", help="list views and exit")
+    parser.add_argument("--describe", metavar="VIEW", help="show the columns of a view and exit")
+    parser.add_argument("--out", help="write the result to .parquet or .csv instead of printing")
+    parser.add_argument("--data-dir", default=os.path.join(base_dir, "../data"))
+    parser.add_argument("--memory-limit", default="2GB")
+    parser.add_argument("--ingest", action="store_true", help="convert new raw downloads to Parquet first")
+    args = parser.parse_args()
+
+    engine = HCOQueryEngine(args.data_dir, memory_limit=args.memory_limit, ingest_raw=args.ingest)
+    params = parse_params(args.param)
+    pd.set_option("display.max_rows", 100)
+    pd.set_option("display.width", 200)
+    exit_code = 0
+
+    if args.list:
+        print(engine.views().to_string(index=False))
+    elif args.describe:
+        print(engine.describe(args.describe)[["column_name", "column_type"]].to_string(index=False))
+    elif args.summary and engine.missing_views(args.summary):
+        print(f"❌ '{args.summary}' needs view(s) {', '.join(engine.missing_views(args.summary))}, "
+              f"but no outputs were found under {os.path.abspath(args.data_dir)} "
+              f"(run scripts/run_pipeline.py or check --data-dir; --list shows the registered views)")
+        exit_code = 1
+    elif args.summary or args.sql:
+        sql = SUMMARY_QUERIES[args.summary] if args.summary else args.sql
+        if args.summary:
+            params = {**SUMMARY_PARAMS.get(args.summary, {}), **params}
+
+        # 🚀 Run query (large results go straight to a file without pandas)
+        start = time.time()
+        try:
+            if args.out:
+                engine.copy_to(sql, args.out, params)
+            else:
+                result = engine.query(sql, params)
+                print(result.to_string(index=False))
+                print(f"⏱️ {len(result)} row(s) in {(time.time() - start) * 1000:.0f} ms")
+        except duckdb.CatalogException as e:
+            # e.g. a view whose files are missing; keep only DuckDB's first line
+            print(f"❌ {str(e).splitlines()[0]} (--list shows the registered views)")
+            exit_code = 1
+    else:
+        parser.print_help()
+
+    engine.close()
+    sys.exit(exit_code)
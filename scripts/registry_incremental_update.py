@@ -0,0 +1,36 @@
+# scripts/registry_incremental_update.py
+
+import os
+import sys
+import glob
+
+# edit file_path to load utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.incremental import IncrementalStore
+from utils.storage import parse_snapshot_name
+
+if __name__ == "__main__":
+    # 📁 Base directory
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+
+    # 📂 Latest crawl folders and incremental state
+    hco_dir = os.path.join(base_dir, "../data/hco")
+    clinic_dir = os.path.join(base_dir, "../data/clinic")
+    state_dir = os.path.join(base_dir, "../data/incremental")
+
+    store = IncrementalStore(state_dir)
+
+    # 🏥 One group per category file (e.g., "병원_auto_20250516_1421.xlsx" → "병원")
+    # 🩺 One group per clinic department, for both naming rules
+    # (e.g., "의원_auto_내과_20250516_1945.xlsx" → "의원_내과", "clinic_내과_auto_20250516_1945.xlsx" → "clinic_내과")
+    # Oldest crawl first per group; crawls the store already applied are skipped
+    snapshots = []
+    for file_path in glob.glob(os.path.join(hco_dir, "*.xls*")) + glob.glob(os.path.join(clinic_dir, "*.xls*")):
+        group, crawl_ts = parse_snapshot_name(file_path)
+        snapshots.append((group, crawl_ts, file_path))
+
+    for group, crawl_ts, file_path in sorted(snapshots):
+        store.ingest(file_path, group, crawl_ts)
+
+    print(f"✅ Master table: {store.master_path}")
@@ -0,0 +1,211 @@
+# scripts/run_pipeline.py
+
+import os
+import sys
+import glob
+
+import pandas as pd
+
+# edit file_path to load utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config.mapping_info import category_mapping
+from utils.pipeline_dag import PipelineDAG
+from utils.scraper_base import get_browser_pool
+from utils.scraper_hospital import HospitalScraper
+from utils.scraper_clinic import ClinicScraper
+from utils.scraper_detail import HospitalDetailScraper
+from utils.streaming_etl import run_streaming_etl, run_clinic_dedup
+from utils.entity_resolution import EntityResolver, attach_registry_columns
+from utils.analysis_utils import extract_doctor_counts_vectorized, pivot_specialties
+from utils.s3_uploader import S3BulkUploader
+from utils.export_writer import write_partitioned_export
+from utils.aggregate_cube import AggregateCube
+from utils.storage import parse_snapshot_name
+
+# 📁 Base directory
+base_dir = os.path.dirname(os.path.abspath(__file__))
+
+# 🌐 URL to access
+target_url = "https://www.hira.or.kr/ra/hosp/getHealthMap.do?pgmid=HIRAA030002010000"
+
+# 📂 Data folders
+hco_dir = os.path.join(base_dir, "../data/hco")
+clinic_dir = os.path.join(base_dir, "../data/clinic")
+detail_dir = os.path.join(base_dir, "../data/hco_detail")
+work_dir = os.path.join(base_dir, "../data/pipeline")
+final_dir = os.path.join(base_dir, "../data/final_dataset")
+state_path = os.path.join(work_dir, "pipeline_state.json")
+
+registry_path = os.path.join(work_dir, "registry_clean.parquet")
+clinic_path = os.path.join(work_dir, "clinic_clean.parquet")
+merged_path = os.path.join(work_dir, "hco_detail_merged.parquet")
+cube_dir = os.path.join(work_dir, "cube")
+
+# 📌 Parameters (editable)
+force_stages = []  # e.g., ["download_hco", "download_clinic", "fetch_detail"] to re-crawl
+s3_bucket = None  # set to upload data/final_dataset
+s3_prefix = "final_dataset"
+
+
+# The three crawl stages run in parallel and borrow drivers from one warm browser pool
+def download_hco():
+    HospitalScraper(
+        url=target_url,
+        download_dir=hco_dir,
+        log_dir=os.path.join(base_dir, "../log/hco"),
+        exclude_categories=["의원"],
+        file_naming_rule="{category}_auto_{timestamp}{ext}",
+        headless=True,
+        checkpoint_path=os.path.join(base_dir, "../log/hco/checkpoint.jsonl"),
+        browser_pool=get_browser_pool(target_url, size=3)
+    ).run()
+
+
+def download_clinic():
+    ClinicScraper(
+        url=target_url,
+        download_dir=clinic_dir,
+        log_dir=os.path.join(base_dir, "../log/clinic"),
+        file_naming_rule="의원_auto_{dept}_{timestamp}{ext}",
+        headless=True,
+        checkpoint_path=os.path.join(base_dir, "../log/clinic/checkpoint.jsonl"),
+        browser_pool=get_browser_pool(target_url, size=3)
+    ).run()
+
+
+def fetch_detail():
+    HospitalDetailScraper(
+        url=target_url,
+        save_dir=detail_dir,
+        target_categories=["상급종합병원", "종합병원"],
+        file_naming_rule="hco_info_auto_{category}_{timestamp}.csv",
+        cache_path=os.path.join(base_dir, "../data/cache/hco_detail_cache.sqlite"),
+        checkpoint_path=os.path.join(base_dir, "../log/hco_detail/checkpoint.jsonl"),
+        browser_pool=get_browser_pool(target_url, size=3)
+    ).run()
+
+
+# Latest download per category/department ("병원_auto_20250516_1421.xlsx" → "병원")
+# Older crawls are left out: the streaming dedup keeps the first row it sees per hospital,
+# so stale rows would win over current ones and closed hospitals would never drop out
+def latest_snapshot_files(folder):
+    latest = {}
+    for file_path in glob.glob(os.path.join(folder, "*.xls*")):
+        group, crawl_ts = parse_snapshot_name(file_path)
+        if group not in latest or crawl_ts > latest[group][0]:
+            latest[group] = (crawl_ts, file_path)
+    return [path for _, (_, path) in sorted(latest.items())]
+
+
+def clean():
+    # Registry categories and clinic departments, streamed with bounded memory
+    run_streaming_etl(latest_snapshot_files(hco_dir), registry_path)
+    run_clinic_dedup(latest_snapshot_files(clinic_dir), clinic_path)
+
+
+# Latest detail file per category ("hco_info_auto_종합병원_20250517_0811.csv" → "종합병원")
+def latest_detail_files():
+    latest = {}
+    for file_path in glob.glob(os.path.join(detail_dir, "hco_info_*.csv")):
+        parts = os.path.splitext(os.path.basename(file_path))[0].split("_")
+        category, crawl_ts = parts[-3], "_".join(parts[-2:])
+        if category not in latest or crawl_ts > latest[category][0]:
+            latest[category] = (crawl_ts, file_path)
+    return {category: path for category, (_, path) in sorted(latest.items())}
+
+
+def merge():
+    frames = []
+    for category, file_path in latest_detail_files().items():
+        df = pd.read_csv(file_path, dtype=str).rename(columns={"name": "hospital_name"})
+        df["category"] = category
+        df["source_file"] = os.path.basename(file_path)
+        frames.append(df)
+    detail_df = pd.concat(frames, ignore_index=True)
+    detail_df = detail_df.drop(columns=["index", "onclick"], errors="ignore")
+
+    counts = extract_doctor_counts_vectorized(detail_df["doctor_info"])
+    specialties = pivot_specialties(detail_df)
+    detail_df = pd.concat([detail_df, counts, specialties], axis=1)
+    detail_df["category_en"] = detail_df["category"].map(category_mapping)
+
+    registry_df = pd.read_parquet(registry_path)
+    crosswalk = EntityResolver(registry_df).match(detail_df)
+    merged = attach_registry_columns(detail_df, registry_df, crosswalk)
+    merged.to_parquet(merged_path, index=False, compression="zstd")
+    print(f"✅ Merged {len(merged)} detail rows ({crosswalk['hco_id'].notna().sum()} matched)")
+
+
+def export():
+    # zstd Parquet partitioned by province/category (+ gzip csv), replacing the previous export
+    hco_all = pd.concat([pd.read_parquet(registry_path), pd.read_parquet(clinic_path)], ignore_index=True)
+    write_partitioned_export(hco_all, final_dir, "hco_all", write_csv_gz=True)
+    # The detail table is small and wide (one column per specialty): per-file overhead
+    # outweighs pruning, so it is only split by category
+    write_partitioned_export(pd.read_parquet(merged_path), final_dir, "hco_detail_merged",
+                             partition_cols=("category",), write_csv_gz=True)
+
+
+def build_cubes():
+    # Dashboards read these instead of the row-level tables
+    hco_all = pd.concat([pd.read_parquet(registry_path), pd.read_parquet(clinic_path)], ignore_index=True)
+    AggregateCube.build(hco_all, measures=[], multi_value_col="departments").save(
+        os.path.join(cube_dir, "hco_all"))
+    AggregateCube.build(pd.read_parquet(merged_path), top_k=50).save(
+        os.path.join(cube_dir, "hco_detail"))
+    print(f"🧊 Cubes saved: {cube_dir}")
+
+
+def upload():
+    # Unchanged files (matching ETag) are skipped, so re-uploading the folder is cheap
+    manifest = S3BulkUploader(s3_bucket, prefix=s3_prefix).upload_directory(
+        final_dir, manifest_path=os.path.join(work_dir, "upload_manifest.json"))
+    if manifest["failed"]:
+        raise RuntimeError(f"{manifest['failed']} file(s) failed to upload")
+
+
+def build_pipeline():
+    dag = PipelineDAG(state_path, max_workers=3)
+
+    # Crawls have no local inputs: they run once, then only when listed in force_stages
+    dag.add_stage("download_hco", download_hco, outputs=[os.path.join(hco_dir, "*.xls*")])
+    dag.add_stage("download_clinic", download_clinic, outputs=[os.path.join(clinic_dir, "*.xls*")])
+    dag.add_stage("fetch_detail", fetch_detail, outputs=[os.path.join(detail_dir, "hco_info_*.csv")])
+
+    dag.add_stage(
+        "clean", clean,
+        inputs=[os.path.join(hco_dir, "*.xls*"), os.path.join(clinic_dir, "*.xls*")],
+        outputs=[registry_path, clinic_path],
+        deps=["download_hco", "download_clinic"]
+    )
+    dag.add_stage(
+        "merge", merge,
+        inputs=[registry_path, os.path.join(detail_dir, "hco_info_*.csv")],
+        outputs=[merged_path],
+        deps=["clean", "fetch_detail"]
+    )
+    dag.add_stage(
+        "export", export,
+        inputs=[registry_path, clinic_path, merged_path],
+        outputs=[os.path.join(final_dir, name, "_manifest.json") for name in ("hco_all", "hco_detail_merged")],
+        deps=["merge"]
+    )
+    dag.add_stage(
+        "cube", build_cubes,
+        inputs=[registry_path, clinic_path, merged_path],
+        outputs=[os.path.join(cube_dir, name, "cube.json") for name in ("hco_all", "hco_detail")],
+        deps=["merge"]
+    )
+    if s3_bucket:
+        dag.add_stage("upload", upload, deps=["export"])
+    return dag
+
+
+if __name__ == "__main__":
+    os.makedirs(work_dir, exist_ok=True)
+
+    # 🚀 Run stages (unchanged ones are skipped, independent ones run in parallel)
+    status = build_pipeline().run(force=force_stages)
+    for name, result in status.items():
+        print(f" - {name}: {result}")
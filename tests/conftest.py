@@ -0,0 +1,7 @@
+# tests/conftest.py
+
+import os
+import sys
+
+# edit file_path to load utils/config (same as the scripts)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
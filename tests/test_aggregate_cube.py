@@ -0,0 +1,88 @@
+# tests/test_aggregate_cube.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.aggregate_cube import AggregateCube
+
+
+def hospitals():
+    return pd.DataFrame({
+        "hospital_name": ["가병원", "나병원", "다병원", "라병원", "마병원", "바병원"],
+        "province": ["서울특별시", "서울특별시", "서울특별시", "부산광역시", "부산광역시", None],
+        "city": ["종로구", "종로구", "강남구", "해운대구", "해운대구", "수원시"],
+        "category": ["종합병원", "병원", "종합병원", "종합병원", "병원", "병원"],
+        "total_medical_staff": [120, 15, 80, 60, np.nan, 20],
+        "num_beds": [300, 50, 200, 150, 40, 30],
+        "departments": ["내과, 외과", "내과", "외과", "내과, 소아청소년과", "", None],
+    })
+
+
+@pytest.fixture
+def cube():
+    return AggregateCube.build(hospitals(), multi_value_col="departments", top_k=2)
+
+
+def test_build_keeps_one_cell_per_dimension_combination(cube):
+    assert cube.dims == ["province", "city", "category"]
+    assert cube.measures == ["total_medical_staff", "num_beds", "dept:내과", "dept:소아청소년과", "dept:외과"]
+    assert len(cube.cells) == 6 and cube.cells["count"].sum() == 6
+    # Missing dimension values get their own 'unknown' cell
+    assert cube.cells.loc[cube.cells["province"] == "unknown", "city"].tolist() == ["수원시"]
+
+
+def test_rollup_matches_groupby_on_the_rows(cube):
+    df = hospitals()
+
+    means = cube.rollup("category", measures=["total_medical_staff", "num_beds"])
+    expected = df.groupby("category")[["total_medical_staff", "num_beds"]].mean()
+    pd.testing.assert_frame_equal(means.set_index("category")[["total_medical_staff", "num_beds"]], expected)
+    assert means.set_index("category")["count"].to_dict() == {"병원": 3, "종합병원": 3}
+
+    sums = cube.rollup("province", measures="num_beds", stat="sum", filters={"category": "종합병원"})
+    assert sums.set_index("province")["num_beds"].to_dict() == {"부산광역시": 150, "서울특별시": 500}
+
+    # Non-null count and a full-table rollup
+    assert cube.rollup(measures="total_medical_staff", stat="cnt")["total_medical_staff"].tolist() == [5]
+    assert cube.rollup("category", measures="dept:내과", stat="sum")["dept:내과"].tolist() == [1, 2]
+
+
+def test_share_adds_rates_and_english_names(cube):
+    share = cube.share("province")
+
+    assert share["province"].tolist() == ["서울특별시", "부산광역시", "unknown"]
+    assert share["rate(%)"].tolist() == [50.0, 33.33, 16.67]
+    assert share["province_en"].tolist()[:2] == ["Seoul", "Busan"]
+
+
+def test_top_groups_ranks_rollup_groups(cube):
+    top = cube.top_groups("city", "num_beds", n=2)
+
+    assert top["city"].tolist() == ["종로구", "강남구"]
+    assert top["num_beds"].tolist() == [350, 200]
+
+
+def test_top_rows_matches_the_row_level_ranking(cube):
+    df = hospitals()
+
+    top = cube.top_rows(2, filters={"category": "종합병원"})
+    expected = df[df["category"] == "종합병원"].nlargest(2, "total_medical_staff")
+    assert top["hospital_name"].tolist() == expected["hospital_name"].tolist() == ["가병원", "다병원"]
+
+    # Rows were kept by total_medical_staff: another measure would silently miss rows
+    with pytest.raises(ValueError, match="num_beds"):
+        cube.top_rows(2, by="num_beds")
+    with pytest.raises(ValueError, match="without top_k"):
+        AggregateCube.build(hospitals()).top_rows(2)
+
+
+def test_save_and_load_round_trip(cube, tmp_path):
+    loaded = AggregateCube.load(cube.save(str(tmp_path / "cube")))
+
+    assert (loaded.dims, loaded.measures, loaded.top_by) == (cube.dims, cube.measures, cube.top_by)
+    pd.testing.assert_frame_equal(loaded.rollup("province"), cube.rollup("province"))
+    # Dimension columns come back as Arrow strings
+    pd.testing.assert_frame_equal(loaded.top_rows(3), cube.top_rows(3), check_dtype=False)
+    plain = AggregateCube.load(AggregateCube.build(hospitals()).save(str(tmp_path / "plain")))
+    assert plain.ranked_rows is None and plain.top_by is None
@@ -0,0 +1,236 @@
+# tests/test_analysis_utils.py
+
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.mapping_info import department_mapping_snake_case
+from utils import analysis_utils
+from utils.analysis_utils import (
+    extract_doctor_counts_vectorized,
+    extract_region_info_vectorized,
+    get_top_hospitals_by_staff,
+    get_top_n_index,
+    pivot_specialties,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+DETAIL_CSV = os.path.join(DATA_DIR, "final_dataset", "hco_detail_merged_20250519_1244.csv")
+REGISTRY_FILES = [
+    os.path.join(DATA_DIR, "hco", name)
+    for name in ("상급종합병원_auto_20250516_1421.xlsx", "정신병원_auto_20250516_1421.xlsx",
+                 "조산원_auto_20250516_1421.xlsx")
+]
+
+
+# ---------- per-row reference implementations (as they were before vectorization) ----------
+
+def legacy_extract_doctor_counts(text):
+    try:
+        doctor = int(re.search(r"의사\s*:\s*(\d+)", text).group(1))
+    except:
+        doctor = None
+    try:
+        dentist = int(re.search(r"치과의사\s*:\s*(\d+)", text).group(1))
+    except:
+        dentist = None
+    try:
+        korean_med = int(re.search(r"한의사\s*:\s*(\d+)", text).group(1))
+    except:
+        korean_med = None
+    return pd.Series([doctor, dentist, korean_med])
+
+
+def legacy_pivot_specialties(df):
+    # Notebook steps 3-6: dept_set scan, one zero column per department, iterrows fill
+    df = df.copy()
+    dept_set = set()
+    for row in df["specialties"].dropna().to_list():
+        matches = re.findall(r"([^,()]+)\s*\(\d+\)", row)
+        dept_set.update([dept.strip() for dept in matches])
+    for dept in dept_set:
+        df[dept] = 0
+    for idx, row in df.iterrows():
+        if pd.isna(row["specialties"]):
+            continue
+        for dept, count in re.findall(r"([^,()]+)\s*\((\d+)\)", row["specialties"]):
+            df.at[idx, dept.strip()] = int(count)
+    return df[sorted(dept_set)].rename(columns=department_mapping_snake_case)
+
+
+def legacy_extract_region_info(address):
+    try:
+        parts = address.split()
+        province = parts[0] if len(parts) > 0 else None
+        city = parts[1] if len(parts) > 1 else None
+    except:
+        province, city = None, None
+    return pd.Series([province, city])
+
+
+def legacy_regions(address):
+    regions = address.apply(legacy_extract_region_info)
+    regions.columns = ["province", "city"]
+    # Notebook fix-up after the apply
+    regions.loc[regions["province"] == "강원도", "province"] = "강원특별자치도"
+    return regions
+
+
+def as_object(frame):
+    return frame.astype(object).where(frame.notna(), None)
+
+
+def staff_frame(categories, staff, names=None):
+    return pd.DataFrame({
+        "hospital_name": names or [f"병원{i}" for i in range(len(staff))],
+        "category": categories,
+        "total_medical_staff": staff,
+    })
+
+
+def expected_top(df, category, n):
+    return df[df["category"] == category].sort_values("total_medical_staff", ascending=False, kind="stable").head(n)
+
+
+def test_categoricals_with_same_codes_do_not_share_a_cache_entry():
+    # Same codes [0, 1, 0], different categories
+    first = staff_frame(pd.Categorical(["a", "b", "a"]), [3, 2, 1])
+    second = staff_frame(pd.Categorical(["x", "y", "x"]), [3, 2, 1])
+
+    assert get_top_n_index(first) is not get_top_n_index(second)
+    assert get_top_hospitals_by_staff(second, "x", 5)["hospital_name"].tolist() == ["병원0", "병원2"]
+    assert get_top_hospitals_by_staff(first, "x", 5).empty
+
+
+def test_identical_frames_reuse_the_index():
+    df = staff_frame(["종합병원", "병원", "종합병원"], [10, 5, 20])
+
+    assert get_top_n_index(df) is get_top_n_index(df.copy())
+
+
+def test_mixed_type_object_column_is_ranked_without_cache():
+    # Arrow cannot convert an object column holding str and int
+    df = staff_frame(pd.Series(["종합병원", 1, "종합병원", "병원"], dtype=object), [1, 9, 5, 7])
+    before = len(analysis_utils._top_n_indexes)
+
+    result = get_top_hospitals_by_staff(df, "종합병원", 5)
+
+    pd.testing.assert_frame_equal(result, expected_top(df, "종합병원", 5))
+    assert len(analysis_utils._top_n_indexes) == before
+
+
+# ---------- parity with the per-row implementations ----------
+
+def test_doctor_counts_match_row_wise_on_detail_data():
+    doctor_info = pd.read_csv(DETAIL_CSV)["doctor_info"]
+
+    counts = extract_doctor_counts_vectorized(doctor_info)
+    expected = doctor_info.apply(legacy_extract_doctor_counts)
+
+    assert counts[["num_doctors", "num_dentists", "num_korean_med"]].astype(object).values.tolist() == \
+        expected.astype(object).values.tolist()
+    assert str(counts["num_doctors"].dtype) == "Int32"
+
+
+def test_doctor_counts_edge_strings():
+    doctor_info = pd.Series([
+        "총 인원 : 0명",                                   # no per-type counts
+        None,                                              # missing text
+        "총 인원 : 7명 (치과의사 : 7)",                     # only dentists: not a doctor count
+        "총 인원 : 3명 (한의사 : 2, 의사 : 1)",             # any order
+        "총 인원 : 5명 (의사 : 5, 치과의사 : , 한의사 : 0)",  # empty count
+    ])
+
+    counts = extract_doctor_counts_vectorized(doctor_info)
+
+    assert as_object(counts).values.tolist() == [
+        [None, None, None, None],
+        [None, None, None, None],
+        [None, 7, None, 7],
+        [1, None, 2, 3],
+        [5, None, 0, 5],
+    ]
+    # The bare "의사" token of the per-row version read the dentist count as doctors
+    assert legacy_extract_doctor_counts("총 인원 : 7명 (치과의사 : 7)").tolist()[0] == 7
+
+
+def test_specialty_pivot_matches_row_wise_on_detail_data():
+    detail = pd.read_csv(DETAIL_CSV)[["specialties"]]
+
+    wide = pivot_specialties(detail)
+    expected = legacy_pivot_specialties(detail)
+
+    assert sorted(wide.columns) == sorted(expected.columns)
+    np.testing.assert_array_equal(wide[expected.columns].to_numpy(), expected.to_numpy())
+    assert set(wide.dtypes) == {np.dtype("int16")}
+
+
+def test_specialty_pivot_edge_strings():
+    detail = pd.DataFrame({"specialties": ["내과, 외과 (3)", None, "내과 (2), 미표시과 (1)", ""]}, index=[10, 11, 12, 13])
+
+    wide = pivot_specialties(detail)
+    long = pivot_specialties(detail, output="long")
+    sparse = pivot_specialties(detail, output="sparse")
+
+    # "내과" without a count is skipped (as before); unmapped names keep their Korean name
+    assert wide.to_dict("index") == {
+        10: {"internal_medicine": 0, "surgery": 3, "미표시과": 0},
+        11: {"internal_medicine": 0, "surgery": 0, "미표시과": 0},
+        12: {"internal_medicine": 2, "surgery": 0, "미표시과": 1},
+        13: {"internal_medicine": 0, "surgery": 0, "미표시과": 0},
+    }
+    assert long.values.tolist() == [[10, "surgery", 3], [12, "internal_medicine", 2], [12, "미표시과", 1]]
+    assert sparse.sparse.to_dense().astype("int16").equals(wide)
+    with pytest.raises(ValueError):
+        pivot_specialties(detail, output="matrix")
+
+
+def test_regions_match_row_wise_on_registry_files():
+    address = pd.concat([pd.read_excel(path)["소재지주소"] for path in REGISTRY_FILES], ignore_index=True)
+
+    regions = extract_region_info_vectorized(address)
+
+    assert as_object(regions[["province", "city"]]).values.tolist() == \
+        as_object(legacy_regions(address)).values.tolist()
+    assert regions["province_en"].notna().all()
+
+
+def test_regions_canonicalize_aliases_and_keep_missing():
+    address = pd.Series(["강원도 춘천시 중앙로 1", "전라북도 전주시 완산구", "서울 종로구 율곡로 1",
+                         "경기 수원시", np.nan, "세종특별자치시", "  "])
+
+    regions = extract_region_info_vectorized(address)
+
+    assert as_object(regions).values.tolist() == [
+        ["강원특별자치도", "춘천시", "Gangwon"],
+        ["전북특별자치도", "전주시", "Jeonbuk"],
+        ["서울특별시", "종로구", "Seoul"],
+        ["경기도", "수원시", "Gyeonggi"],
+        [None, None, None],
+        ["세종특별자치시", None, "Sejong"],
+        [None, None, None],
+    ]
+    assert all(isinstance(regions[c].dtype, pd.CategoricalDtype) for c in regions.columns)
+
+
+# ---------- vectorized vs. per-row timing (full-size runs: scripts/benchmark_transforms.py) ----------
+
+def test_vectorized_transforms_beat_row_wise():
+    detail = pd.read_csv(DETAIL_CSV)
+    detail = pd.concat([detail] * 25, ignore_index=True)  # ~10k rows
+    address = pd.Series(["서울특별시 종로구 율곡로 1", "강원도 춘천시 중앙로 1"] * 5000)
+
+    def seconds(func, *args):
+        start = time.perf_counter()
+        func(*args)
+        return time.perf_counter() - start
+
+    assert seconds(extract_doctor_counts_vectorized, detail["doctor_info"]) * 5 < \
+        seconds(lambda s: s.apply(legacy_extract_doctor_counts), detail["doctor_info"])
+    assert seconds(pivot_specialties, detail[["specialties"]]) * 5 < \
+        seconds(legacy_pivot_specialties, detail[["specialties"]])
+    assert seconds(extract_region_info_vectorized, address) * 5 < seconds(legacy_regions, address)
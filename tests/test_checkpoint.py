@@ -0,0 +1,63 @@
+# tests/test_checkpoint.py
+
+import os
+
+from utils.checkpoint import CheckpointJournal
+
+
+def test_mark_done_is_replayed_by_the_next_run(tmp_path):
+    path = str(tmp_path / "log" / "checkpoint.jsonl")
+    journal = CheckpointJournal(path)
+    journal.mark_done("downloaded", "종합병원", file="종합병원.xlsx")
+    journal.mark_done("detail", "Y1", doctor_info="총 인원 : 의사 3명", specialties=["내과(3)"])
+    journal.close()
+
+    resumed = CheckpointJournal(path)
+    assert resumed.is_done("downloaded", "종합병원")
+    assert not resumed.is_done("downloaded", "병원")
+    assert resumed.get("detail", "Y1") == {"doctor_info": "총 인원 : 의사 3명", "specialties": ["내과(3)"]}
+    assert resumed.get("detail", "Y2", default={}) == {}
+    resumed.close()
+
+
+def test_torn_last_line_is_dropped_and_appends_stay_readable(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    journal = CheckpointJournal(path)
+    journal.mark_done("detail", "Y1", doctor_info="a")
+    journal.close()
+    # Crash in the middle of the second write
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"kind": "detail", "key": "Y2", "val')
+
+    resumed = CheckpointJournal(path)
+    assert resumed.is_done("detail", "Y1") and not resumed.is_done("detail", "Y2")
+    resumed.mark_done("detail", "Y3", doctor_info="c")
+    resumed.close()
+
+    again = CheckpointJournal(path)
+    assert again.is_done("detail", "Y3")
+    again.close()
+
+
+def test_resume_run_id_keeps_the_interrupted_run_id(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    journal = CheckpointJournal(path)
+    assert journal.resume_run_id("20250516_1945") == "20250516_1945"
+    journal.close()
+
+    resumed = CheckpointJournal(path)
+    assert resumed.resume_run_id("20250517_0800") == "20250516_1945"
+    resumed.close()
+
+
+def test_finish_deletes_and_close_keeps_the_journal(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    journal = CheckpointJournal(path)
+    journal.mark_done("downloaded", "병원", file="병원.xlsx")
+    journal.close()
+    assert os.path.exists(path)
+
+    journal = CheckpointJournal(path)
+    journal.finish()
+    assert not os.path.exists(path)
+    assert not CheckpointJournal(path).is_done("downloaded", "병원")
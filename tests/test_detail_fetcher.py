@@ -0,0 +1,196 @@
+# tests/test_detail_fetcher.py
+
+import time
+import random
+import threading
+from collections import defaultdict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+from utils.detail_fetcher import DetailFetcher
+from utils.response_cache import ResponseCache
+
+
+def detail_html(ykiho):
+    return (
+        "<table><tr><td>총 인원 : 의사 {0}명</td></tr></table>"
+        "<ul class='pop_list_style'><li>내과({0})</li></ul>"
+    ).format(int(ykiho[1:]))
+
+
+class StubHira:
+    """Local stand-in for hospInfoAjax.do with scripted failures and random latency."""
+
+    def __init__(self, failures=None, max_delay=0.0, delay=0.0, pages=None):
+        self.failures = dict(failures or {})  # ykiho → list of status codes served before a 200
+        self.pages = dict(pages or {})  # ykiho → HTML served instead of the detail page
+        self.max_delay = max_delay
+        self.delay = delay
+        self.requests = []
+        self.attempts = defaultdict(int)
+        self.lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                ykiho = parse_qs(urlparse(self.path).query)["ykiho"][0]
+                with stub.lock:
+                    stub.requests.append(time.monotonic())
+                    attempt = stub.attempts[ykiho]
+                    stub.attempts[ykiho] += 1
+                    scripted = stub.failures.get(ykiho, [])
+                status = scripted[attempt] if attempt < len(scripted) else 200
+                time.sleep(stub.delay + (random.uniform(0, stub.max_delay) if stub.max_delay else 0))
+
+                page = stub.pages.get(ykiho, detail_html(ykiho))
+                body = (page if status == 200 else "error").encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/ra/hosp/hospInfoAjax.do"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_factory():
+    servers = []
+
+    def make(**kwargs):
+        servers.append(StubHira(**kwargs))
+        return servers[-1]
+
+    yield make
+    for server in servers:
+        server.close()
+
+
+def test_results_keep_input_order(stub_factory):
+    stub = stub_factory(max_delay=0.05)
+    ykihos = [f"Y{i}" for i in range(40)]
+    fetcher = DetailFetcher(stub.url, max_workers=8, requests_per_second=0)
+
+    results = fetcher.fetch_all(ykihos)
+    fetcher.close()
+
+    assert [r["doctor_info"] for r in results] == [f"총 인원 : 의사 {i}명" for i in range(40)]
+    assert [r["specialties"] for r in results] == [[f"내과({i})"] for i in range(40)]
+
+
+def test_concurrent_fetch_beats_sequential(stub_factory):
+    # Benchmark: 24 pages at 50 ms server latency (sequential ≈ 1.2 s)
+    stub = stub_factory(delay=0.05)
+    ykihos = [f"Y{i}" for i in range(24)]
+
+    sequential = DetailFetcher(stub.url, max_workers=1, requests_per_second=0)
+    start = time.monotonic()
+    sequential.fetch_all(ykihos)
+    sequential_seconds = time.monotonic() - start
+    sequential.close()
+
+    concurrent = DetailFetcher(stub.url, max_workers=8, requests_per_second=0)
+    start = time.monotonic()
+    concurrent.fetch_all(ykihos)
+    concurrent_seconds = time.monotonic() - start
+    concurrent.close()
+
+    assert concurrent_seconds < sequential_seconds / 3
+
+
+def test_rate_limit_spaces_requests(stub_factory):
+    stub = stub_factory()
+    fetcher = DetailFetcher(stub.url, max_workers=8, requests_per_second=20)
+
+    fetcher.fetch_all([f"Y{i}" for i in range(15)])
+    fetcher.close()
+
+    stamps = sorted(stub.requests)
+    assert len(stamps) == 15
+    # 15 requests at 20/s need at least 14 intervals of 50 ms, even with 8 workers
+    assert stamps[-1] - stamps[0] >= 14 * 0.05 * 0.9
+
+
+def test_retries_429_and_5xx_with_backoff(stub_factory):
+    stub = stub_factory(failures={"Y1": [429, 503], "Y2": [500]})
+    fetcher = DetailFetcher(stub.url, max_workers=4, requests_per_second=0, max_retries=3, backoff_base=0.01)
+
+    results = fetcher.fetch_all(["Y0", "Y1", "Y2"])
+    fetcher.close()
+
+    assert [r["doctor_info"] for r in results] == [f"총 인원 : 의사 {i}명" for i in range(3)]
+    assert stub.attempts == {"Y0": 1, "Y1": 3, "Y2": 2}
+
+
+def test_gives_up_after_max_retries(stub_factory):
+    stub = stub_factory(failures={"Y1": [503] * 10})
+    fetcher = DetailFetcher(stub.url, max_workers=2, requests_per_second=0, max_retries=2, backoff_base=0.01)
+
+    results = fetcher.fetch_all(["Y0", "Y1"])
+    fetcher.close()
+
+    assert results[0]["doctor_info"] == "총 인원 : 의사 0명"
+    assert results[1]["doctor_info"].startswith("Request failed")
+    assert stub.attempts["Y1"] == 3
+
+
+def test_non_retryable_status_is_not_retried(stub_factory):
+    stub = stub_factory(failures={"Y1": [404]})
+    fetcher = DetailFetcher(stub.url, max_workers=1, requests_per_second=0, backoff_base=0.01)
+
+    result = fetcher.fetch_one("Y1")
+    fetcher.close()
+
+    assert result["doctor_info"].startswith("Request failed")
+    assert stub.attempts["Y1"] == 1
+
+
+def test_cache_skips_error_pages_served_with_200(stub_factory, tmp_path):
+    blocked = "<html><body>요청이 차단되었습니다</body></html>"
+    stub = stub_factory(pages={"Y1": blocked})
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    fetcher = DetailFetcher(stub.url, max_workers=2, requests_per_second=0, cache=cache)
+
+    first = fetcher.fetch_all(["Y0", "Y1"])
+    second = fetcher.fetch_all(["Y0", "Y1"])
+    fetcher.close()
+
+    assert first == second
+    assert cache.get("Y0") is not None
+    assert cache.get("Y1") is None
+    # Y0 came from the cache the second time; the blocked page was requested again
+    assert stub.attempts == {"Y0": 1, "Y1": 2}
+    cache.close()
+
+
+def test_results_are_reported_while_input_is_still_producing(stub_factory):
+    stub = stub_factory()
+    fetcher = DetailFetcher(stub.url, max_workers=4, requests_per_second=0)
+    reported = []
+    reported_before_end = []
+
+    def slow_scroll():
+        yield "Y0"
+        yield "Y1"
+        time.sleep(0.3)  # next result page still rendering
+        yield "Y2"
+        reported_before_end.append(sorted(reported))
+
+    fetcher.fetch_all(slow_scroll(), on_result=lambda pos, result: reported.append(pos))
+    fetcher.close()
+
+    # Y0/Y1 were checkpointable before the stream ended, not only after it
+    assert reported_before_end == [[0, 1]]
+    assert sorted(reported) == [0, 1, 2]
@@ -0,0 +1,74 @@
+# tests/test_entity_resolution.py
+
+import pandas as pd
+
+from utils.entity_resolution import EntityResolver, attach_registry_columns
+
+
+def registry(rows, index=None):
+    return pd.DataFrame(
+        rows, columns=["hospital_name", "category", "phone", "postal_code", "province", "city"], index=index
+    )
+
+
+def detail(names, category="종합병원"):
+    # hospInfoAjax detail rows: name and category only, no phone/postal code
+    return pd.DataFrame({"hospital_name": names, "category": category})
+
+
+def test_name_only_near_miss_matches():
+    # Detail names from data/hco_detail vs. registry spellings without "부속"
+    reg = registry([
+        ["순천향대학교천안병원", "종합병원", "041-570-2114", "31151", "충청남도", "천안시"],
+        ["순천향대학교 서울병원", "종합병원", "02-709-9114", "04401", "서울특별시", "용산구"],
+        ["천안충무병원", "종합병원", "041-570-7555", "31148", "충청남도", "천안시"],
+    ])
+    det = detail(["순천향대학교부속 천안병원", "순천향대학교 부속 서울병원"])
+
+    crosswalk = EntityResolver(reg).match(det)
+
+    assert crosswalk["registry_pos"].tolist() == [0, 1]
+    assert crosswalk["match_rule"].str.startswith("name~").all()
+    assert crosswalk["match_rule"].str.endswith("+category").all()
+
+
+def test_name_only_weak_similarity_stays_unmatched():
+    reg = registry([["영남대학교의료원", "종합병원", "053-623-8001", "42415", "대구광역시", "남구"]])
+    det = detail(["영남대학교의과대학부속영천병원"])
+
+    crosswalk = EntityResolver(reg).match(det)
+
+    assert crosswalk["hco_id"].isna().all()
+    assert crosswalk["match_rule"].iloc[0] == "unmatched"
+
+
+def test_duplicate_names_are_ambiguous():
+    # Two different "명지병원" (제천, 고양) share the normalized name and category
+    reg = registry([
+        ["의료법인 명지의료재단 명지병원", "종합병원", "043-640-8114", "27136", "충청북도", "제천시"],
+        ["의료법인명지의료재단명지병원", "종합병원", "1899-1234", "10475", "경기도", "고양시"],
+        ["명지병원", "요양병원", "02-000-0000", "00000", "서울특별시", "종로구"],
+    ])
+    det = detail(["의료법인 명지의료재단 명지병원"])
+
+    crosswalk = EntityResolver(reg).match(det)
+
+    assert crosswalk["registry_pos"].isna().all()
+    assert crosswalk["match_rule"].iloc[0] == "ambiguous(2)"
+
+
+def test_attach_with_non_unique_registry_index():
+    # e.g., registry concatenated from several crawls without ignore_index
+    reg = registry([
+        ["강북삼성병원", "종합병원", "02-2001-2001", "03181", "서울특별시", "종로구"],
+        ["강남세브란스병원", "종합병원", "02-2019-3114", "06273", "서울특별시", "강남구"],
+        ["인하대학교의과대학부속병원", "종합병원", "032-890-2114", "22332", "인천광역시", "중구"],
+    ], index=[0, 0, 1])
+    det = detail(["인하대학교의과대학부속병원", "강남세브란스병원", "없는병원"])
+
+    crosswalk = EntityResolver(reg).match(det)
+    merged = attach_registry_columns(det, reg, crosswalk)
+
+    assert len(merged) == len(det)
+    assert merged["city"].iloc[:2].tolist() == ["중구", "강남구"]
+    assert pd.isna(merged["city"].iloc[2]) and pd.isna(merged["hco_id"].iloc[2])
@@ -0,0 +1,58 @@
+# tests/test_export_writer.py
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import export_writer
+from utils.export_writer import write_partitioned_export, verify_export
+
+
+def hco_frame():
+    return pd.DataFrame({
+        "hospital_name": ["가나병원", "다라병원", "마바병원", "사아병원"],
+        "province": ["서울특별시", "서울특별시", np.nan, "경기도"],
+        "category": ["종합병원", "한방/요양", "종합병원", "한방_요양"],
+    })
+
+
+def test_manifest_keeps_original_partition_values(tmp_path):
+    manifest = write_partitioned_export(hco_frame(), str(tmp_path), "hco_all")
+
+    by_path = {f["path"]: f["partition_values"] for f in manifest["files"]}
+    # "한방/요양" and "한방_요양" share a directory; NaN is written as 'unknown'
+    assert by_path["province=경기도/category=한방_요양/part-0.parquet"] == {
+        "province": ["경기도"], "category": ["한방_요양"]}
+    assert by_path["province=서울특별시/category=한방_요양/part-0.parquet"] == {
+        "province": ["서울특별시"], "category": ["한방/요양"]}
+    assert by_path["province=unknown/category=종합병원/part-0.parquet"] == {
+        "province": [None], "category": ["종합병원"]}
+    assert verify_export(str(tmp_path / "hco_all")) == []
+
+
+def test_rerun_replaces_previous_export(tmp_path):
+    write_partitioned_export(hco_frame(), str(tmp_path), "hco_all")
+    manifest = write_partitioned_export(hco_frame().iloc[:1], str(tmp_path), "hco_all")
+
+    assert sorted(os.listdir(tmp_path)) == ["hco_all"]
+    assert [f["path"] for f in manifest["files"]] == ["province=서울특별시/category=종합병원/part-0.parquet"]
+    assert verify_export(str(tmp_path / "hco_all")) == []
+
+
+def test_failed_swap_keeps_previous_export(tmp_path, monkeypatch):
+    write_partitioned_export(hco_frame(), str(tmp_path), "hco_all")
+    real_replace = os.replace
+
+    def failing_replace(src, dst):
+        if str(src).endswith(".tmp"):
+            raise OSError("disk full")
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(export_writer.os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        write_partitioned_export(hco_frame().iloc[:1], str(tmp_path), "hco_all")
+
+    assert len(os.listdir(tmp_path / "hco_all")) == 4  # three provinces + _manifest.json
+    assert verify_export(str(tmp_path / "hco_all")) == []
@@ -0,0 +1,99 @@
+# tests/test_incremental.py
+
+import pandas as pd
+
+from utils.incremental import IncrementalStore, apply_changeset, build_record_key, diff_snapshots
+
+COLUMNS = ["병원/약국명", "전화번호", "우편번호", "병상수"]
+
+SNAPSHOT_A = [
+    ["가병원", "02-111-1111", "03151", "10"],
+    ["나병원", "02-222-2222", "04401", "20"],
+    ["라병원", "02-444-4444", "06273", "40"],
+]
+# 나병원 changed its bed count, 다병원 opened, 라병원 closed
+SNAPSHOT_B = [
+    ["가병원", "02-111-1111", "03151", "10"],
+    ["나병원", "02-222-2222", "04401", "25"],
+    ["다병원", "02-333-3333", "10475", "30"],
+]
+
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=["hospital_name", "phone", "postal_code", "num_beds"], dtype="string")
+
+
+def write_snapshot(folder, name, rows):
+    path = folder / name
+    pd.DataFrame(rows, columns=COLUMNS).to_csv(path, index=False)
+    return str(path)
+
+
+def ops(changeset):
+    return dict(zip(changeset["hospital_name"], changeset["_op"]))
+
+
+def test_build_record_key_prefers_ykiho():
+    df = frame(SNAPSHOT_A)
+    df["ykiho"] = pd.array(["Y1", None, ""], dtype="string")
+
+    keys = build_record_key(df)
+
+    assert keys.iloc[0] == "Y1"
+    assert len(keys.iloc[1]) == 20 and keys.iloc[1] != keys.iloc[2]
+    # Same name/phone/postal code → same key in another snapshot
+    assert build_record_key(frame(SNAPSHOT_A)).iloc[1] == keys.iloc[1]
+
+
+def test_diff_snapshots_insert_update_delete():
+    changeset = diff_snapshots(frame(SNAPSHOT_A), frame(SNAPSHOT_B))
+
+    assert ops(changeset) == {"다병원": "insert", "나병원": "update", "라병원": "delete"}
+    assert diff_snapshots(frame(SNAPSHOT_A), frame(SNAPSHOT_A)).empty
+    assert set(diff_snapshots(None, frame(SNAPSHOT_A))["_op"]) == {"insert"}
+
+
+def test_apply_changeset_upserts_and_deletes_per_group():
+    master = apply_changeset(None, diff_snapshots(None, frame(SNAPSHOT_A)).assign(_group="병원"))
+    changeset = diff_snapshots(master, frame(SNAPSHOT_B)).assign(_group="병원")
+
+    master = apply_changeset(master, changeset)
+
+    assert sorted(master["hospital_name"]) == ["가병원", "나병원", "다병원"]
+    assert master.set_index("hospital_name").loc["나병원", "num_beds"] == "25"
+
+
+def test_store_applies_crawls_in_order_and_reruns_are_no_ops(tmp_path):
+    path_a = write_snapshot(tmp_path, "병원_auto_20250501_0900.csv", SNAPSHOT_A)
+    path_b = write_snapshot(tmp_path, "병원_auto_20250516_0900.csv", SNAPSHOT_B)
+    store = IncrementalStore(str(tmp_path / "state"))
+
+    store.ingest(path_a, "병원")
+    changeset, changeset_path = store.ingest(path_b, "병원")
+    assert ops(changeset) == {"다병원": "insert", "나병원": "update", "라병원": "delete"}
+    assert changeset_path.endswith("병원_20250516_0900.parquet")
+    master = store.load_master()
+
+    # Rerunning the folder (a, then b again) must not roll the master back
+    reopened = IncrementalStore(str(tmp_path / "state"))
+    for path in (path_a, path_b):
+        changeset, changeset_path = reopened.ingest(path, "병원")
+        assert changeset.empty and changeset_path is None
+
+    pd.testing.assert_frame_equal(reopened.load_master(), master)
+    assert reopened.applied == {"병원": "20250516_0900"}
+
+
+def test_store_skips_out_of_order_snapshot(tmp_path):
+    path_a = write_snapshot(tmp_path, "병원_auto_20250501_0900.csv", SNAPSHOT_A)
+    path_b = write_snapshot(tmp_path, "병원_auto_20250516_0900.csv", SNAPSHOT_B)
+    store = IncrementalStore(str(tmp_path / "state"))
+
+    store.ingest(path_b, "병원")
+    changeset, _ = store.ingest(path_a, "병원")
+    # Other groups are tracked separately
+    other, _ = store.ingest(path_a, "요양병원")
+
+    assert changeset.empty
+    assert sorted(store.load_master().query("_group == '병원'")["hospital_name"]) == ["가병원", "나병원", "다병원"]
+    assert set(other["_op"]) == {"insert"}
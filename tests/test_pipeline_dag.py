@@ -0,0 +1,108 @@
+# tests/test_pipeline_dag.py
+
+import os
+
+import pytest
+
+from utils.pipeline_dag import PipelineDAG
+
+
+class Pipeline:
+    """raw.txt → clean (clean.txt) → report (report.txt), with call counts and a switchable failure."""
+
+    def __init__(self, tmp_path):
+        self.dir = tmp_path
+        self.state_path = str(tmp_path / "state" / "pipeline_state.json")
+        self.calls = []
+        self.fail = set()
+        self.write("raw.txt", "v1")
+
+    def path(self, name):
+        return str(self.dir / name)
+
+    def write(self, name, text):
+        with open(self.path(name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def read(self, name):
+        with open(self.path(name), encoding="utf-8") as f:
+            return f.read()
+
+    def stage(self, name, source, target):
+        def run():
+            self.calls.append(name)
+            if name in self.fail:
+                raise RuntimeError(f"{name} broke")
+            self.write(target, self.read(source).upper())
+        return run
+
+    def dag(self):
+        dag = PipelineDAG(self.state_path, max_workers=2)
+        dag.add_stage("clean", self.stage("clean", "raw.txt", "clean.txt"),
+                      inputs=[self.path("raw.txt")], outputs=[self.path("clean.txt")])
+        dag.add_stage("report", self.stage("report", "clean.txt", "report.txt"),
+                      inputs=[self.path("clean.txt")], outputs=[self.path("report.txt")], deps=["clean"])
+        return dag
+
+    def run(self, **kwargs):
+        self.calls = []
+        return self.dag().run(**kwargs)
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    return Pipeline(tmp_path)
+
+
+def test_unchanged_inputs_are_skipped(pipeline):
+    assert pipeline.run() == {"clean": "done", "report": "done"}
+
+    assert pipeline.run() == {"clean": "skipped", "report": "skipped"}
+    assert pipeline.calls == []
+
+
+def test_input_change_reruns_stage_and_downstream(pipeline):
+    pipeline.run()
+    pipeline.write("raw.txt", "v2")
+
+    assert pipeline.run() == {"clean": "done", "report": "done"}
+    assert pipeline.read("report.txt") == "V2"
+
+
+def test_missing_output_or_force_reruns(pipeline):
+    pipeline.run()
+    os.remove(pipeline.path("report.txt"))
+
+    assert pipeline.run() == {"clean": "skipped", "report": "done"}
+    assert pipeline.run(force=["clean"])["clean"] == "done"
+
+
+def test_failure_blocks_downstream_and_resumes(pipeline):
+    pipeline.run()
+    pipeline.write("raw.txt", "v2")
+    pipeline.write("clean.txt", "stale")
+    pipeline.fail = {"clean"}
+
+    assert pipeline.run() == {"clean": "failed", "report": "blocked"}
+    assert pipeline.calls == ["clean"]
+
+    # A new runner reads the saved state: the failed stage runs again, then its downstream
+    pipeline.fail = {"report"}
+    assert pipeline.run() == {"clean": "done", "report": "failed"}
+    pipeline.fail = set()
+    assert pipeline.run() == {"clean": "skipped", "report": "done"}
+    assert pipeline.calls == ["report"]
+    assert pipeline.read("report.txt") == "V2"
+
+
+def test_cycle_and_unknown_dependency_are_rejected(tmp_path):
+    dag = PipelineDAG(str(tmp_path / "state.json"))
+    dag.add_stage("a", lambda: None, deps=["b"])
+    dag.add_stage("b", lambda: None, deps=["a"])
+    with pytest.raises(ValueError, match="Cycle"):
+        dag.run()
+
+    dag = PipelineDAG(str(tmp_path / "state.json"))
+    dag.add_stage("a", lambda: None, deps=["missing"])
+    with pytest.raises(ValueError, match="Unknown dependency"):
+        dag.run()
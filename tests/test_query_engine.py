@@ -0,0 +1,87 @@
+# tests/test_query_engine.py
+
+import os
+import sys
+import subprocess
+
+import pandas as pd
+import pytest
+
+from utils.export_writer import write_partitioned_export
+from utils.query_engine import HCOQueryEngine
+
+
+def write_raw_download(data_dir):
+    os.makedirs(os.path.join(data_dir, "hco"))
+    pd.DataFrame({
+        "병원/약국명": ["가나병원", "다라병원"],
+        "병원/약국구분": ["병원", "종합병원"],
+        "소재지주소": ["서울특별시 종로구 율곡로 1", "부산광역시 해운대구 중동 1"],
+    }).to_csv(os.path.join(data_dir, "hco", "병원_auto_20250516_1945.csv"), index=False)
+
+
+def test_engine_is_read_only_by_default(tmp_path):
+    write_raw_download(str(tmp_path))
+
+    engine = HCOQueryEngine(str(tmp_path))
+    views = engine.views()
+    engine.close()
+
+    assert not os.path.exists(tmp_path / "parquet")
+    assert "raw_hco" not in set(views["name"])
+
+
+def test_ingest_raw_opt_in_registers_raw_views(tmp_path):
+    write_raw_download(str(tmp_path))
+
+    engine = HCOQueryEngine(str(tmp_path), ingest_raw=True)
+    result = engine.query("SELECT hospital_name FROM raw_hco_latest ORDER BY hospital_name")
+    engine.close()
+
+    assert result["hospital_name"].tolist() == ["가나병원", "다라병원"]
+
+
+def write_export(data_dir):
+    hco_all = pd.DataFrame({
+        "hospital_name": ["가나병원", "다라병원", "마바병원", "사아병원"],
+        "category": ["병원", "종합병원", "병원", None],
+        "province": ["서울특별시", "서울특별시", None, "부산광역시"],
+    })
+    write_partitioned_export(hco_all, os.path.join(data_dir, "final_dataset"), "hco_all")
+
+
+def test_missing_partition_values_read_back_as_null(tmp_path):
+    write_export(str(tmp_path))
+
+    with HCOQueryEngine(str(tmp_path)) as engine:
+        rows = engine.query("SELECT hospital_name, province, category FROM hco_all ORDER BY hospital_name")
+        provinces = engine.summary("province_share")
+        categories = engine.summary("category_share")
+
+    assert rows.set_index("hospital_name").isna().to_dict() == {
+        "province": {"가나병원": False, "다라병원": False, "마바병원": True, "사아병원": False},
+        "category": {"가나병원": False, "다라병원": False, "마바병원": False, "사아병원": True},
+    }
+    assert provinces["province_ko"].tolist() == ["서울특별시", "부산광역시"]
+    assert "unknown" not in set(categories["category_ko"].dropna())
+    assert categories["category_ko"].isna().sum() == 1
+
+
+def test_summary_without_its_view_is_reported(tmp_path):
+    with HCOQueryEngine(str(tmp_path)) as engine:
+        assert engine.missing_views("category_share") == ["hco_all"]
+        with pytest.raises(LookupError, match="hco_all"):
+            engine.summary("category_share")
+
+    script = os.path.join(os.path.dirname(__file__), "..", "scripts", "query_hco.py")
+    result = subprocess.run([sys.executable, script, "--summary", "province_share", "--data-dir", str(tmp_path)],
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 1
+    assert "'province_share' needs view(s) hco_all" in result.stdout
+    assert "Traceback" not in result.stderr
+
+    result = subprocess.run([sys.executable, script, "SELECT * FROM hco_all", "--data-dir", str(tmp_path)],
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 1
+    assert "❌ Catalog Error: Table with name hco_all does not exist!" in result.stdout
+    assert "Traceback" not in result.stderr
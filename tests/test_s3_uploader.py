@@ -0,0 +1,88 @@
+# tests/test_s3_uploader.py
+
+import os
+import json
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from utils import s3_uploader
+from utils.s3_uploader import MB, S3BulkUploader, local_etag
+
+BUCKET = "hco-test"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.delenv("AWS_ENDPOINT_URL", raising=False)
+    # Pooled clients must be created inside the mock
+    monkeypatch.setattr(s3_uploader, "_clients", {})
+    with mock_aws():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def make_uploader():
+    # 5 MB is the smallest part size S3 (and moto) accepts
+    return S3BulkUploader(BUCKET, prefix="final_dataset", max_workers=4,
+                          multipart_threshold=5 * MB, multipart_chunksize=5 * MB)
+
+
+def test_local_etag_matches_s3_for_single_and_multipart(s3, tmp_path):
+    write(str(tmp_path / "small.csv"), "hospital_name\n가나병원\n".encode("utf-8"))
+    write(str(tmp_path / "large.parquet"), os.urandom(11 * MB))
+
+    manifest = make_uploader().upload_directory(str(tmp_path))
+
+    assert manifest["uploaded"] == 2 and manifest["failed"] == 0
+    for name in ("small.csv", "large.parquet"):
+        remote = s3.head_object(Bucket=BUCKET, Key=f"final_dataset/{name}")["ETag"].strip('"')
+        assert remote == local_etag(str(tmp_path / name), 5 * MB, 5 * MB)
+    # 11 MB in 5 MB parts → 3 parts
+    assert local_etag(str(tmp_path / "large.parquet"), 5 * MB, 5 * MB).endswith("-3")
+
+
+def test_unchanged_files_are_skipped(s3, tmp_path):
+    write(str(tmp_path / "hco_all" / "province=서울특별시" / "part-0.parquet"), b"a" * 1000)
+    write(str(tmp_path / "hco_all" / "_manifest.json"), b"{}")
+    write(str(tmp_path / "large.parquet"), os.urandom(6 * MB))
+    uploader = make_uploader()
+    uploader.upload_directory(str(tmp_path))
+
+    write(str(tmp_path / "hco_all" / "_manifest.json"), b'{"rows": 1}')
+    manifest = uploader.upload_directory(str(tmp_path))
+
+    status = {f["key"]: f["status"] for f in manifest["files"]}
+    assert status == {
+        "final_dataset/hco_all/_manifest.json": "uploaded",
+        "final_dataset/hco_all/province=서울특별시/part-0.parquet": "skipped",
+        "final_dataset/large.parquet": "skipped",
+    }
+    assert manifest["bytes_uploaded"] == len(b'{"rows": 1}')
+    body = s3.get_object(Bucket=BUCKET, Key="final_dataset/hco_all/_manifest.json")["Body"].read()
+    assert body == b'{"rows": 1}'
+
+
+def test_manifest_written_with_failures(s3, tmp_path):
+    write(str(tmp_path / "data" / "a.csv"), b"a")
+    manifest_path = tmp_path / "work" / "upload_manifest.json"
+
+    manifest = S3BulkUploader("missing-bucket").upload_directory(
+        str(tmp_path / "data"), manifest_path=str(manifest_path))
+
+    with open(manifest_path, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["failed"] == manifest["failed"] == 1
+    assert saved["files"][0]["key"] == "a.csv"
+    assert saved["files"][0]["error"]
@@ -0,0 +1,68 @@
+# tests/test_schema.py
+
+import numpy as np
+import pandas as pd
+
+from utils.schema import apply_schema, memory_usage_report
+
+
+def registry():
+    # Raw Korean headers as downloaded, plus one column the schema does not know
+    return pd.DataFrame({
+        "병원/약국명": ["가병원", "나병원", "다병원", "라병원"],
+        "병원/약국구분": ["병원", "종합병원", "병원", "병원"],
+        "전화번호": ["051-760-0600", "02 2072 2114", "-", None],
+        "우편번호": [6000, 48108, 3080, np.nan],
+        "병상수": [30.0, 1200.0, np.nan, 0.0],
+        "NO": [1, 2, 3, 4],
+        "비고": ["a", "b", "c", "d"],
+    })
+
+
+def test_apply_schema_casts_declared_columns():
+    df = registry()
+
+    result = apply_schema(df)
+
+    assert isinstance(result["병원/약국구분"].dtype, pd.CategoricalDtype)
+    assert str(result["병상수"].dtype) == "Int16"  # missing value → nullable
+    assert result["NO"].dtype == np.uint8
+    assert pd.api.types.is_string_dtype(result["병원/약국명"])
+    assert result["비고"].dtype == df["비고"].dtype  # unknown column untouched
+    assert df["병상수"].dtype == np.float64  # copy by default
+    assert result["병상수"].tolist()[:2] == [30, 1200]
+
+
+def test_apply_schema_normalizes_phone_and_postal_code():
+    # Intended normalization: the same number must compare equal across files
+    result = apply_schema(registry())
+
+    assert result["전화번호"].tolist() == ["0517600600", "0220722114", pd.NA, pd.NA]
+    assert result["우편번호"].tolist() == ["06000", "48108", "03080", pd.NA]
+    text_codes = apply_schema(pd.DataFrame({"postal_code": ["6000.0", "06000", "미상"]}))
+    assert text_codes["postal_code"].tolist() == ["06000", "06000", "미상"]
+
+
+def test_apply_schema_inplace_and_fractional_counts():
+    df = pd.DataFrame({"num_beds": [1.5, 2.0], "category": ["병원", "병원"]})
+
+    result = apply_schema(df, inplace=True)
+
+    assert result is df
+    assert df["num_beds"].dtype == np.float32  # fractions are kept, only downcast
+    assert isinstance(df["category"].dtype, pd.CategoricalDtype)
+
+
+def test_memory_usage_report_compares_with_baseline(capsys):
+    df = pd.DataFrame({
+        "category": pd.Series(["종합병원", "병원"] * 5000, dtype=object),
+        "num_beds": np.arange(10000, dtype="int64") % 100,
+    })
+
+    report = memory_usage_report(apply_schema(df), baseline=df)
+
+    assert report.loc["category", "dtype"] == "category"
+    assert report.loc["num_beds", ["dtype", "baseline_dtype"]].tolist() == ["uint8", "int64"]
+    assert (report["ratio"] > 1).all()
+    assert "smaller" in capsys.readouterr().out
+    assert list(memory_usage_report(df).columns) == ["dtype", "mb"]
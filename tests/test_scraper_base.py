@@ -0,0 +1,222 @@
+# tests/test_scraper_base.py
+
+import os
+import sys
+import threading
+import subprocess
+
+import pytest
+
+from utils import scraper_base, scraper_clinic, scraper_hospital
+from utils.scraper_base import BrowserPool, snapshot_downloads, wait_for_new_download
+
+
+def write(path, data=b"xlsx"):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_stale_partial_does_not_block_new_download(tmp_path):
+    write(tmp_path / "old.xlsx.crdownload", b"")  # left over from a crashed run
+    before = snapshot_downloads(str(tmp_path))
+    write(tmp_path / "병원_new.xlsx")
+
+    path = wait_for_new_download(str(tmp_path), before, timeout=5, poll_interval=0.05)
+    assert path == str(tmp_path / "병원_new.xlsx")
+
+
+def test_waits_for_partial_created_after_snapshot(tmp_path):
+    before = snapshot_downloads(str(tmp_path))
+    partial = tmp_path / "new.xlsx.crdownload"
+    write(partial)
+
+    def finish():
+        os.replace(partial, tmp_path / "new.xlsx")
+
+    threading.Timer(0.5, finish).start()
+    path = wait_for_new_download(str(tmp_path), before, timeout=5, poll_interval=0.05)
+    assert path == str(tmp_path / "new.xlsx")
+
+
+def test_partial_alone_is_not_a_download(tmp_path):
+    before = snapshot_downloads(str(tmp_path))
+    write(tmp_path / "new.xlsx.crdownload")
+
+    assert wait_for_new_download(str(tmp_path), before, timeout=0.5, poll_interval=0.05) is None
+
+
+class FakeChrome:
+    def __init__(self, options):
+        self.options = options
+        self.cdp = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append(cmd)
+
+
+@pytest.mark.parametrize("lean", [True, False])
+@pytest.mark.parametrize("headless", [True, False])
+def test_browser_pool_honours_headless(monkeypatch, lean, headless):
+    monkeypatch.setattr(scraper_base.webdriver, "Chrome", FakeChrome)
+    pool = BrowserPool.__new__(BrowserPool)
+    pool.lean, pool.headless = lean, headless
+
+    driver = pool._new_driver()
+
+    assert ("--headless=new" in driver.options.arguments) == headless
+    assert bool(driver.cdp) == lean
+
+
+@pytest.mark.parametrize("module, cls", [(scraper_hospital, "HospitalScraper"), (scraper_clinic, "ClinicScraper")])
+@pytest.mark.parametrize("lean", [True, False])
+@pytest.mark.parametrize("headless", [True, False])
+def test_scraper_driver_honours_headless(monkeypatch, module, cls, lean, headless):
+    monkeypatch.setattr(module.webdriver, "Chrome", FakeChrome)
+    scraper = getattr(module, cls).__new__(getattr(module, cls))
+    scraper.browser_pool, scraper.download_dir = None, "/tmp"
+    scraper.lean, scraper.headless = lean, headless
+
+    driver = scraper._init_driver()
+
+    assert ("--headless=new" in driver.options.arguments) == headless
+    assert bool(driver.cdp) == lean
+
+
+class StubDriver:
+    """Driver double: alive until killed; the search panel 'opens' while alive."""
+
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+        self.download_dirs = []
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise scraper_base.WebDriverException("chrome not reachable")
+        return True
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.download_dirs.append(params["downloadPath"])
+
+    def quit(self):
+        self.quit_called = True
+        self.alive = False
+
+
+class StubPool(BrowserPool):
+    def _new_driver(self):
+        driver = StubDriver()
+        with self._lock:
+            self.created.append(driver)
+        return driver
+
+    def __init__(self, *args, **kwargs):
+        self.created = []
+        super().__init__(*args, **kwargs)
+
+    def live(self):
+        return [d for d in self.created if not d.quit_called]
+
+
+def stub_open_search_panel(driver, url, timeout=10, reload=True):
+    if not driver.alive:
+        raise scraper_base.WebDriverException("chrome not reachable")
+
+
+@pytest.fixture
+def stub_pool(monkeypatch):
+    monkeypatch.setattr(scraper_base, "open_search_panel", stub_open_search_panel)
+    pools = []
+
+    def make(**kwargs):
+        pools.append(StubPool("http://hira.test", **kwargs))
+        return pools[-1]
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+def test_pool_reuses_released_drivers(stub_pool):
+    pool = stub_pool(size=1)
+
+    first = pool.acquire(download_dir="/tmp/a", timeout=5)
+    pool.release(first)
+    second = pool.acquire(download_dir="/tmp/b", timeout=5)
+
+    assert second is first and len(pool.created) == 1
+    assert first.download_dirs == ["/tmp/a", "/tmp/b"]
+
+
+def test_recover_replaces_a_dead_driver(stub_pool):
+    pool = stub_pool(size=1)
+    driver = pool.acquire(timeout=5)
+
+    assert pool.recover(driver) is driver  # responsive: only reloaded
+
+    driver.alive = False
+    replacement = pool.recover(driver, download_dir="/tmp/c")
+
+    assert replacement is not driver and driver.quit_called
+    assert replacement.alive and replacement.download_dirs == ["/tmp/c"]
+
+
+def test_unhealthy_idle_driver_is_skipped(stub_pool):
+    pool = stub_pool(size=1)
+    driver = pool.acquire(timeout=5)
+    pool.release(driver)
+    driver.alive = False  # crashed while parked
+
+    fresh = pool.acquire(timeout=5)
+
+    assert fresh is not driver and driver.quit_called
+
+
+def test_pool_never_exceeds_its_size(stub_pool):
+    pool = stub_pool(size=2, max_uses=3)
+
+    for round_ in range(10):
+        drivers = [pool.acquire(timeout=5) for _ in range(2)]
+        if round_ % 3 == 0:
+            drivers[0].alive = False
+            drivers[0] = pool.recover(drivers[0])
+        for driver in drivers:
+            pool.release(driver)
+        assert len(pool.live()) <= 2
+
+    assert len(pool.created) > 2  # worn-out and dead drivers were recycled
+
+    # Releasing a driver twice (or one the pool never made) does not start extra drivers
+    driver = pool.acquire(timeout=5)
+    pool.release(driver)
+    pool.release(driver)
+    pool.release(StubDriver())
+    held = [pool.acquire(timeout=5) for _ in range(2)]
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.2)
+    assert len(pool.live()) == len(held) == 2
+
+
+def test_shared_pools_are_closed_at_exit(tmp_path):
+    # Run in a fresh interpreter so the atexit hook actually fires
+    script = tmp_path / "exit_check.py"
+    script.write_text(
+        "import sys\n"
+        f"sys.path.append({os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))!r})\n"
+        "from utils import scraper_base\n"
+        "class Driver:\n"
+        "    def execute_script(self, script): return True\n"
+        "    def quit(self): print('driver quit')\n"
+        "scraper_base.open_search_panel = lambda *args, **kwargs: None\n"
+        "scraper_base.BrowserPool._new_driver = lambda self: Driver()\n"
+        "pool = scraper_base.get_browser_pool('http://hira.test', size=2)\n"
+        "assert scraper_base.get_browser_pool('http://hira.test') is pool\n"
+        "pool.release(pool.acquire(timeout=5))\n",
+        encoding="utf-8",
+    )
+
+    result = subprocess.run([sys.executable, str(script)], capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.count("driver quit") == 2
+    assert result.stdout.rstrip().endswith("🧹 Browser pool closed")
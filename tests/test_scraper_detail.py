@@ -0,0 +1,112 @@
+# tests/test_scraper_detail.py
+
+import os
+import time
+
+from utils.checkpoint import CheckpointJournal
+from utils.scraper_detail import HospitalDetailScraper, COLLECT_RESULTS_JS, COUNT_RESULTS_JS
+
+
+class FakeResultDriver:
+    """Result list that renders rows at scripted times after the search."""
+
+    def __init__(self, appear_after):
+        self.start = time.monotonic()
+        self.rows = [(f"병원{i}", f"Y{i}", delay) for i, delay in enumerate(appear_after)]
+
+    def _visible(self):
+        elapsed = time.monotonic() - self.start
+        return [(name, ykiho) for name, ykiho, delay in self.rows if delay <= elapsed]
+
+    def execute_script(self, script, *args):
+        if script == COLLECT_RESULTS_JS:
+            return self._visible()[args[0]:]
+        if script == COUNT_RESULTS_JS:
+            return len(self._visible())
+        raise AssertionError("unexpected script")
+
+
+class FakeFetcher:
+    def __init__(self, failing=()):
+        self.consumed_at = []
+        self.failing = set(failing)
+
+    def fetch_all(self, ykihos, on_result=None):
+        results = []
+        for pos, ykiho in enumerate(ykihos):
+            self.consumed_at.append(time.monotonic())
+            if ykiho in self.failing:
+                results.append({"doctor_info": "Request failed: 503", "specialties": []})
+            else:
+                results.append({"doctor_info": f"총 인원 {ykiho}", "specialties": []})
+            if on_result is not None:
+                on_result(pos, results[-1])
+        return results
+
+
+def make_scraper(driver):
+    # Skip __init__ (no Chrome): only the attributes the tested methods use
+    scraper = HospitalDetailScraper.__new__(HospitalDetailScraper)
+    scraper.driver = driver
+    scraper.journal = None
+    scraper.fetcher = FakeFetcher()
+    scraper.failed_categories = []
+    return scraper
+
+
+def test_slow_first_render_is_not_an_empty_result():
+    # Nothing renders for 1 s, longer than the per-scroll wait
+    scraper = make_scraper(FakeResultDriver([1.0, 1.0, 1.2]))
+
+    hospitals = list(scraper.iter_hospitals(wait_timeout=0.3, first_wait_timeout=5))
+    assert [h["ykiho"] for h in hospitals] == ["Y0", "Y1", "Y2"]
+    assert [h["index"] for h in hospitals] == [1, 2, 3]
+
+
+def test_stream_ends_after_wait_timeout_once_results_exist():
+    scraper = make_scraper(FakeResultDriver([0, 0, 5.0]))
+
+    start = time.monotonic()
+    hospitals = list(scraper.iter_hospitals(wait_timeout=0.3, first_wait_timeout=5))
+    assert [h["ykiho"] for h in hospitals] == ["Y0", "Y1"]
+    assert time.monotonic() - start < 2
+
+
+def test_first_wait_timeout_bounds_an_empty_search():
+    scraper = make_scraper(FakeResultDriver([]))
+
+    start = time.monotonic()
+    assert list(scraper.iter_hospitals(wait_timeout=0.1, first_wait_timeout=0.5)) == []
+    assert time.monotonic() - start < 2
+
+
+def test_detail_fetch_starts_while_scrolling():
+    driver = FakeResultDriver([0, 0, 0.5, 0.5])
+    scraper = make_scraper(driver)
+
+    hospitals = scraper.fetch_detail_info(scraper.iter_hospitals(wait_timeout=1, first_wait_timeout=5))
+    assert [h["doctor_info"] for h in hospitals] == [f"총 인원 Y{i}" for i in range(4)]
+    # The first rows were handed to the fetcher before the later rows rendered
+    assert scraper.fetcher.consumed_at[0] - driver.start < 0.5
+
+
+def test_failed_pages_keep_the_checkpoint_for_a_rerun(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    scraper = make_scraper(FakeResultDriver([0, 0, 0]))
+    scraper.journal = CheckpointJournal(path)
+    scraper.fetcher = FakeFetcher(failing={"Y1"})
+
+    scraper.fetch_detail_info(scraper.iter_hospitals(wait_timeout=0.2, first_wait_timeout=1))
+    assert scraper.failed_ykihos == ["Y1"]
+    scraper.failed_categories.append(("종합병원", len(scraper.failed_ykihos)))
+    scraper.finish_checkpoint()
+
+    # The rerun restores Y0/Y2 from the journal and only fetches the failed page
+    rerun = make_scraper(FakeResultDriver([0, 0, 0]))
+    rerun.journal = CheckpointJournal(path)
+    hospitals = rerun.fetch_detail_info(rerun.iter_hospitals(wait_timeout=0.2, first_wait_timeout=1))
+    assert [h["doctor_info"] for h in hospitals] == ["총 인원 Y0", "총 인원 Y1", "총 인원 Y2"]
+    assert len(rerun.fetcher.consumed_at) == 1
+
+    rerun.finish_checkpoint()
+    assert not os.path.exists(path)
@@ -0,0 +1,127 @@
+# tests/test_scraper_pool.py
+
+import os
+import glob
+import json
+import threading
+from datetime import datetime
+
+from utils.checkpoint import CheckpointJournal
+from utils.scraper_base import resume_downloads
+from utils.scraper_hospital import HospitalScraper
+from utils.scraper_pool import ScraperPool
+
+TARGETS = [(f"cat{i}", name) for i, name in enumerate(["상급종합병원", "종합병원", "병원", "요양병원", "치과병원"])]
+
+
+class FakeScraper(HospitalScraper):
+    """HospitalScraper without Chrome: 'downloads' write a file, rename/log/checkpoint are the real ones."""
+
+    crash_on = set()  # target names whose worker raises mid-shard
+    instances = []
+    lock = threading.Lock()
+
+    def __init__(self, url, download_dir, log_dir, headless, checkpoint_path=None, file_naming_rule=None):
+        self.url = url
+        self.download_dir = download_dir
+        self.log_dir = log_dir
+        self.file_naming_rule = file_naming_rule
+        self.date_info = datetime.now().strftime("%Y%m%d_%H%M")
+        self.downloaded_file_paths, self.renamed_file_paths = [], []
+        self.failed_ids, self.download_latencies = [], []
+        self.downloaded = []
+        self.checkpoint_path = checkpoint_path
+        os.makedirs(download_dir, exist_ok=True)
+        os.makedirs(log_dir, exist_ok=True)
+        self.journal = CheckpointJournal(checkpoint_path) if checkpoint_path else None
+        if self.journal is not None:
+            self.date_info = self.journal.resume_run_id(self.date_info)
+        with FakeScraper.lock:
+            FakeScraper.instances.append(self)
+
+    def get_targets(self):
+        return list(TARGETS)
+
+    def download_all(self, targets=None):
+        shard = [(cid, name) for cid, name in TARGETS if name in targets]
+        shard = resume_downloads(self.journal, shard, self.downloaded_file_paths, self.renamed_file_paths)
+        for category_id, name in shard:
+            if name in self.crash_on:
+                raise RuntimeError("chrome died")
+            path = os.path.join(self.download_dir, f"{category_id}.xlsx")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(name)
+            self.downloaded.append(name)
+            self.downloaded_file_paths.append((path, name))
+            self._checkpoint("downloaded", name, path)
+            self.download_latencies.append((name, 0.1))
+
+    def close_driver(self):
+        pass
+
+
+def make_pool(tmp_path, num_workers=2, crash_on=()):
+    FakeScraper.crash_on = set(crash_on)
+    FakeScraper.instances = []
+    return ScraperPool(
+        FakeScraper, url="http://hira.test", download_dir=str(tmp_path / "hco"), log_dir=str(tmp_path / "log"),
+        num_workers=num_workers, file_naming_rule="{category}_auto_{timestamp}{ext}",
+        checkpoint_path=str(tmp_path / "log" / "checkpoint.jsonl")
+    )
+
+
+def read_manifest(tmp_path):
+    [path] = glob.glob(str(tmp_path / "log" / "download_manifest_*.json"))
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_shard_round_robin(tmp_path):
+    pool = make_pool(tmp_path, num_workers=3)
+    assert pool.shard(TARGETS) == [[TARGETS[0], TARGETS[3]], [TARGETS[1], TARGETS[4]], [TARGETS[2]]]
+    assert make_pool(tmp_path, num_workers=8).shard(TARGETS[:2]) == [[TARGETS[0]], [TARGETS[1]]]
+
+
+def test_run_merges_worker_folders_and_writes_manifest(tmp_path):
+    pool = make_pool(tmp_path)
+    pool.run()
+
+    files = sorted(os.listdir(tmp_path / "hco"))
+    date_info = pool.coordinator.date_info
+    assert files == sorted(f"{name}_auto_{date_info}.xlsx" for _, name in TARGETS)  # worker_N dirs removed
+
+    manifest = read_manifest(tmp_path)
+    assert [m["name"] for m in manifest] == [name for _, name in TARGETS]
+    assert {m["status"] for m in manifest} == {"ok"}
+    assert [m["worker"] for m in manifest] == [0, 1, 0, 1, 0]
+
+    # Each worker journaled to its own file; all of them are gone after a clean run
+    workers = FakeScraper.instances[1:]
+    assert sorted(w.checkpoint_path for w in workers) == [
+        str(tmp_path / "log" / "checkpoint.jsonl.worker_0"), str(tmp_path / "log" / "checkpoint.jsonl.worker_1")]
+    assert glob.glob(str(tmp_path / "log" / "checkpoint.jsonl*")) == []
+
+
+def test_worker_failure_is_reported_and_resumed(tmp_path):
+    pool = make_pool(tmp_path, crash_on={"종합병원"})  # worker 1 dies on its first target
+    pool.run()
+
+    manifest = {m["name"]: m for m in read_manifest(tmp_path)}
+    assert manifest["종합병원"]["status"] == manifest["요양병원"]["status"] == "failed"
+    assert manifest["종합병원"]["reason"] == "Worker crashed: chrome died"
+    assert manifest["병원"]["status"] == "ok"
+
+    # Checkpoint kept (merged into the main journal) for the retry
+    journal_path = str(tmp_path / "log" / "checkpoint.jsonl")
+    assert glob.glob(journal_path + ".worker_*") == []
+    journal = CheckpointJournal(journal_path)
+    assert journal.is_done("renamed", "병원") and not journal.is_done("downloaded", "종합병원")
+    journal.close()
+
+    rerun = make_pool(tmp_path)
+    rerun.run()
+    downloaded = sorted(name for w in FakeScraper.instances[1:] for name in w.downloaded)
+    assert downloaded == ["요양병원", "종합병원"]
+    assert len(os.listdir(tmp_path / "hco")) == len(TARGETS)
+    assert {m["status"] for m in read_manifest(tmp_path)} == {"ok"}  # same run id: manifest replaced
+    assert not os.path.exists(journal_path)
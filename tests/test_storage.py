@@ -0,0 +1,45 @@
+# tests/test_storage.py
+
+import pandas as pd
+import pytest
+
+from utils.storage import ingest_file, load_dataset
+
+
+def write_csv(path, rows):
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def two_crawls(tmp_path):
+    # The later crawl adds a column ("홈페이지") the earlier one does not have
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    old = write_csv(raw / "병원_auto_20250101_0900.csv",
+                    [{"병원/약국명": "가병원", "소재지주소": "서울특별시 강남구"}])
+    new = write_csv(raw / "병원_auto_20250201_0900.csv",
+                    [{"병원/약국명": "가병원", "소재지주소": "서울특별시 강남구", "홈페이지": "http://a.kr"},
+                     {"병원/약국명": "나병원", "소재지주소": "부산광역시 중구", "홈페이지": None}])
+    dataset_dir = str(tmp_path / "parquet")
+    for path in (old, new):
+        ingest_file(path, dataset_dir)
+    return dataset_dir
+
+
+def test_columns_from_later_crawls_are_kept(two_crawls):
+    df = load_dataset(two_crawls, optimize_dtypes=False)
+
+    assert len(df) == 3
+    assert "homepage_address" in df.columns
+    by_crawl = df.groupby("crawl_ts")["homepage_address"].apply(lambda s: s.notna().sum())
+    assert by_crawl.to_dict() == {"20250101_0900": 0, "20250201_0900": 1}
+
+
+def test_projection_and_partition_filter(two_crawls):
+    df = load_dataset(two_crawls, columns=["hospital_name", "homepage_address", "crawl_ts"],
+                      filters=[("crawl_ts", "=", "20250101_0900")], optimize_dtypes=False)
+
+    assert list(df.columns) == ["hospital_name", "homepage_address", "crawl_ts"]
+    assert df["hospital_name"].tolist() == ["가병원"]
+    assert df["homepage_address"].isna().all()
@@ -0,0 +1,66 @@
+# tests/test_streaming_etl.py
+
+import importlib.util
+
+import pandas as pd
+import pytest
+
+from utils.streaming_etl import OUTPUT_COLUMNS, department_from_filename, iter_file_batches, run_streaming_etl
+
+
+def write_registry_csv(path, rows):
+    pd.DataFrame(rows, columns=["병원/약국명", "병원/약국구분", "전화번호", "우편번호", "소재지주소"]).to_csv(
+        path, index=False
+    )
+
+
+def test_csv_output_is_header_only_when_no_rows_pass(tmp_path):
+    source = tmp_path / "hco_empty.csv"
+    write_registry_csv(source, [])
+    output = tmp_path / "out" / "registry.csv"
+
+    stats = run_streaming_etl([str(source)], str(output))
+
+    assert stats["rows_out"] == 0
+    result = pd.read_csv(output, encoding="utf-8-sig")
+    assert list(result.columns) == OUTPUT_COLUMNS
+    assert result.empty
+
+
+def test_csv_output_appends_batches(tmp_path):
+    source = tmp_path / "hco.csv"
+    write_registry_csv(source, [
+        ["가나병원", "병원", "02-111-1111", "3151", "서울특별시 종로구 율곡로 1"],
+        ["다라의원", "의원", "051-222-2222", "48058", "부산광역시 해운대구 중동 1"],
+        ["가나병원", "병원", "02-111-1111", "3151", "서울특별시 종로구 율곡로 1"],
+    ])
+    output = tmp_path / "registry.csv"
+
+    stats = run_streaming_etl([str(source)], str(output), batch_size=1)
+
+    result = pd.read_csv(output, encoding="utf-8-sig", dtype=str)
+    assert stats["duplicates"] == 1
+    assert result["hospital_name"].tolist() == ["가나병원", "다라의원"]
+    assert result["postal_code"].tolist() == ["03151", "48058"]
+
+
+@pytest.mark.skipif(importlib.util.find_spec("xlrd") is not None, reason="xlrd installed")
+def test_legacy_xls_without_xlrd_raises_clear_error(tmp_path):
+    source = tmp_path / "hco_legacy.xls"
+    source.write_bytes(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\x00" * 504)
+
+    with pytest.raises(ImportError, match="xlrd"):
+        next(iter_file_batches(str(source)))
+
+
+@pytest.mark.parametrize("file_name", [
+    "의원_auto_내과_20250516_1945.xlsx",
+    "data/clinic/clinic_내과_auto_20250516_1945.xlsx",
+    "clinic_내과_20250516_1945.xls",
+])
+def test_department_from_filename(file_name):
+    assert department_from_filename(file_name) == "내과"
+
+
+def test_department_from_filename_without_department():
+    assert department_from_filename("hco_20250516_1945.xlsx") is None
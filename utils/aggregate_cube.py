@@ -0,0 +1,183 @@
+# utils/aggregate_cube.py
+
+import os
+import json
+
+import pandas as pd
+
+from config.mapping_info import category_mapping, province_mapping
+
+DEFAULT_DIMS = ["province", "city", "category"]
+COUNT_COL = "count"
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
+
+class AggregateCube:
+    """
+    Pre-aggregated province × city × category cube with per-measure sums and counts.
+
+    Each cell keeps the row count plus '<measure>__sum' and '<measure>__cnt' (non-null
+    count), so any rollup recovers exact counts, sums and means from the cells alone.
+    Multi-valued columns such as clinic 'departments' become indicator measures
+    ('dept:<name>'), which count each clinic once per department without
+    double-counting it in the other rollups.
+    Optional top-K rows per cell answer top-N queries (N ≤ K) for any rollup exactly.
+    """
+
+    def __init__(self, cells, dims, measures, ranked_rows=None, top_by=None):
+        self.cells = cells
+        self.dims = list(dims)
+        self.measures = list(measures)
+        self.ranked_rows = ranked_rows
+        self.top_by = top_by
+
+    @classmethod
+    def build(
+        cls,
+        df,
+        dims=DEFAULT_DIMS,
+        measures=None,
+        multi_value_col=None,
+        top_k=0,
+        top_by="total_medical_staff",
+        label_cols=("hospital_name",)
+    ):
+        """
+        Build the cube from a row-level table (once per pipeline run).
+
+        Parameters:
+        - df (pd.DataFrame): row-level table (e.g., hco_all or hco_detail_merged)
+        - dims (list): dimension columns (missing ones are skipped)
+        - measures (list or None): numeric columns to aggregate (all numeric columns if None)
+        - multi_value_col (str or None): ', '-joined column turned into 'dept:<name>' indicators
+        - top_k (int): rows kept per cell for top-N queries (0 = none)
+        - top_by (str): measure ranking the kept rows
+        - label_cols (tuple): row columns kept alongside top rows
+
+        Returns:
+        - AggregateCube
+        """
+        dims = [d for d in dims if d in df.columns]
+        if measures is None:
+            measures = [c for c in df.select_dtypes("number").columns if c not in dims]
+
+        base = df[dims].astype(object).where(df[dims].notna(), "unknown")
+        values = df[measures].apply(pd.to_numeric, errors="coerce").astype("float64")
+
+        if multi_value_col and multi_value_col in df.columns:
+            indicators = df[multi_value_col].fillna("").str.get_dummies(sep=", ")
+            indicators = indicators.drop(columns="", errors="ignore")  # empty lists are not a department
+            indicators.columns = [f"dept:{c}" for c in indicators.columns]
+            values = pd.concat([values, indicators.astype("float64")], axis=1)
+            measures = measures + indicators.columns.tolist()
+
+        frame = pd.concat([base, values], axis=1)
+        grouped = frame.groupby(dims, sort=True) if dims else frame.groupby(lambda _: 0)
+        sums = grouped[measures].sum(min_count=1).add_suffix("__sum")
+        counts = grouped[measures].count().add_suffix("__cnt")
+        cells = pd.concat([grouped.size().rename(COUNT_COL), sums, counts], axis=1).reset_index()
+
+        top_rows = None
+        if top_k and top_by in df.columns:
+            keep = [c for c in label_cols if c in df.columns]
+            ranked = pd.concat([base, df[keep], values], axis=1)
+            top_rows = (
+                ranked.sort_values(top_by, ascending=False, kind="stable")
+                .groupby(dims, sort=False).head(top_k)
+                .reset_index(drop=True)
+            )
+        return cls(cells, dims, measures, top_rows, top_by if top_rows is not None else None)
+
+    def _filtered(self, table, filters):
+        for col, value in (filters or {}).items():
+            values = _as_list(value)
+            table = table[table[col].isin(values)]
+        return table
+
+    def rollup(self, by=(), measures=None, stat="mean", filters=None):
+        """
+        Aggregate the cube to the given dimensions.
+
+        Parameters:
+        - by (list): dimensions to keep (e.g., ['province'] or ['category'])
+        - measures (list or None): measures to return (all if None)
+        - stat (str): 'mean', 'sum' or 'cnt' (non-null count)
+        - filters (dict): dimension → value or list of values
+
+        Returns:
+        - pd.DataFrame with by columns, 'count' and one column per measure
+        """
+        by = _as_list(by)
+        measures = self.measures if measures is None else _as_list(measures)
+        cells = self._filtered(self.cells, filters)
+
+        cols = [COUNT_COL] + [f"{m}__sum" for m in measures] + [f"{m}__cnt" for m in measures]
+        grouped = cells.groupby(by, sort=True)[cols].sum() if by else cells[cols].sum().to_frame().T
+
+        result = grouped[[COUNT_COL]].copy()
+        for m in measures:
+            if stat == "sum":
+                result[m] = grouped[f"{m}__sum"]
+            elif stat == "cnt":
+                result[m] = grouped[f"{m}__cnt"]
+            else:
+                result[m] = grouped[f"{m}__sum"] / grouped[f"{m}__cnt"].where(grouped[f"{m}__cnt"] > 0)
+        return result.reset_index() if by else result.reset_index(drop=True)
+
+    def share(self, by, filters=None):
+        """Row count and share (%) per group, like the notebook's category/province tables."""
+        by = _as_list(by)
+        result = self.rollup(by, measures=[], filters=filters)
+        result["rate(%)"] = (result[COUNT_COL] / result[COUNT_COL].sum() * 100).round(2)
+        if "category" in by:
+            result["category_en"] = result["category"].map(category_mapping)
+        if "province" in by:
+            result["province_en"] = result["province"].map(province_mapping)
+        return result.sort_values(COUNT_COL, ascending=False, ignore_index=True)
+
+    def top_groups(self, by, measure, n=10, stat="sum", filters=None):
+        """Top-n groups of a rollup by one measure (e.g., provinces with most internal_medicine staff)."""
+        result = self.rollup(by, measures=[measure], stat=stat, filters=filters)
+        return result.nlargest(n, measure).reset_index(drop=True)
+
+    def top_rows(self, n=10, filters=None, by=None):
+        """
+        Top-n rows by the ranking measure within the filtered cells (exact for n ≤ top_k).
+
+        e.g., cube.top_rows(10, filters={"category": "상급종합병원"}) replaces
+        get_top_hospitals_by_staff(df, "상급종합병원", 10).
+        Only top_by ranks exactly: the kept rows were chosen by it, so another measure raises ValueError.
+        """
+        if self.ranked_rows is None:
+            raise ValueError("Cube was built without top_k rows.")
+        by = by or self.top_by
+        if by != self.top_by:
+            raise ValueError(f"Top rows were kept by '{self.top_by}'; rank by '{by}' on the base table instead.")
+        rows = self._filtered(self.ranked_rows, filters)
+        return rows.nlargest(n, by, keep="first").reset_index(drop=True)
+
+    def save(self, cube_dir):
+        """Persist cells (and top rows) as Parquet with a small JSON descriptor."""
+        os.makedirs(cube_dir, exist_ok=True)
+        self.cells.to_parquet(os.path.join(cube_dir, "cells.parquet"), index=False, compression="zstd")
+        if self.ranked_rows is not None:
+            self.ranked_rows.to_parquet(os.path.join(cube_dir, "top_rows.parquet"), index=False, compression="zstd")
+        with open(os.path.join(cube_dir, "cube.json"), "w", encoding="utf-8") as f:
+            json.dump({"dims": self.dims, "measures": self.measures, "top_by": self.top_by},
+                      f, ensure_ascii=False, indent=2)
+        return cube_dir
+
+    @classmethod
+    def load(cls, cube_dir):
+        """Load a cube saved with save()."""
+        with open(os.path.join(cube_dir, "cube.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        cells = pd.read_parquet(os.path.join(cube_dir, "cells.parquet"))
+        top_path = os.path.join(cube_dir, "top_rows.parquet")
+        top_rows = pd.read_parquet(top_path) if os.path.exists(top_path) else None
+        return cls(cells, meta["dims"], meta["measures"], top_rows, meta["top_by"])
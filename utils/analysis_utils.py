@@ -1,18 +1,59 @@
 import os
+import hashlib
 from datetime import datetime
 import pandas as pd
 import re
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pyarrow as pa
 
-import boto3
 from botocore.exceptions import NoCredentialsError
 
+from config.mapping_info import department_mapping_snake_case, province_mapping, province_alias_mapping
+from utils.schema import apply_schema
+from utils.s3_uploader import get_s3_client
+
+# Read one file and tag it with its source name (top-level so process pools can pickle it)
+def _read_one_file(file, file_type):
+    try:
+        if file_type == "xlsx":
+            df = pd.read_excel(file)
+        else:
+            df = pd.read_csv(file)
+        df["source_file"] = os.path.basename(file)
+        return df, None
+    except Exception as e:
+        return None, {"file": os.path.basename(file), "error_type": type(e).__name__, "message": str(e)}
+
+# Cast columns whose dtype differs across frames to one common dtype before concat
+def _unify_dtypes(df_list):
+    dtypes = defaultdict(set)
+    for df in df_list:
+        for col, dtype in df.dtypes.items():
+            dtypes[col].add(dtype)
+
+    target = {}
+    for col, kinds in dtypes.items():
+        if len(kinds) > 1:
+            numeric = all(pd.api.types.is_numeric_dtype(k) and not pd.api.types.is_bool_dtype(k) for k in kinds)
+            target[col] = "float64" if numeric else "object"
+
+    if not target:
+        return df_list
+    return [df.astype({c: t for c, t in target.items() if c in df.columns}) for df in df_list]
+
 # Load and combine multiple files from a folder
 def load_and_merge_files(
     folder_path,
     file_type="xlsx",
     max_files=None,
-    sort_by_time=False
+    sort_by_time=False,
+    workers=None,
+    return_errors=False,
+    optimize_dtypes=True
 ):
     """
     Load and merge multiple xlsx or csv files from a folder.
@@ -22,20 +63,27 @@ def load_and_merge_files(
     - file_type (str): 'xlsx' or 'csv'
     - max_files (int or None): number of recent files to load, or all if None
     - sort_by_time (bool): if True, load recent files based on modified time
+    - workers (int or None): parse files in a process pool of this size (sequential if None or 1)
+    - return_errors (bool): if True, also return the list of per-file errors
+    - optimize_dtypes (bool): cast known columns with the declared schema
+      (config/schema_info.py) to category/small-int/compact-string dtypes
+      (default True, like storage.load_dataset; False keeps the raw dtypes);
+      phone is reduced to digits and postal_code zero-padded (see apply_schema)
 
     Returns:
-    - pd.DataFrame or None
+    - pd.DataFrame or None (rows keep the file listing order)
+    - (pd.DataFrame or None, list of error dicts) if return_errors is True
     """
 
     if file_type not in ("xlsx", "csv"):
         raise ValueError("Only 'xlsx' and 'csv' file types are supported.")
 
-    # 1. List matching files
-    all_files = [
+    # 1. List matching files (sorted by name unless sort_by_time, for a deterministic order)
+    all_files = sorted(
         os.path.join(folder_path, f)
         for f in os.listdir(folder_path)
         if f.endswith(f".{file_type}")
-    ]
+    )
 
     if sort_by_time:
         all_files = sorted(all_files, key=os.path.getmtime, reverse=True)
@@ -48,45 +96,138 @@ def load_and_merge_files(
     for f in all_files:
         print(" -", os.path.basename(f))
 
-    # 2. Read files
-    df_list = []
-    for file in all_files:
-        try:
-            if file_type == "xlsx":
-                df = pd.read_excel(file)
-            else:
-                df = pd.read_csv(file)
-
-            df["source_file"] = os.path.basename(file)
-            df_list.append(df)
-        except Exception as e:
-            print(f"❌ Failed to read {file}: {e}")
-
-    # 3. Merge
+    # 2. Read files (in a process pool if requested; map keeps input order)
+    if workers and workers > 1 and len(all_files) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(all_files))) as executor:
+            results = list(executor.map(_read_one_file, all_files, [file_type] * len(all_files)))
+    else:
+        results = [_read_one_file(f, file_type) for f in all_files]
+
+    df_list = [df for df, _ in results if df is not None]
+    errors = [err for _, err in results if err is not None]
+    if errors:
+        print(f"⚠️ {len(errors)} file(s) failed to load.")
+
+    # 3. Merge in one pass with unified dtypes
     if df_list:
-        merged_df = pd.concat(df_list, ignore_index=True)
+        merged_df = pd.concat(_unify_dtypes(df_list), ignore_index=True)
+        if optimize_dtypes:
+            merged_df = apply_schema(merged_df, inplace=True)
         print(f"✅ Merged shape: {merged_df.shape}")
-        return merged_df
     else:
         print("❌ No files were merged.")
-        return None
+        merged_df = None
+
+    return (merged_df, errors) if return_errors else merged_df
+
+# Staff count tokens; "의사"/"한의사" must not be preceded by another Hangul syllable
+# (so "치과의사 : 7" is never read as a doctor count)
+DOCTOR_TOKEN = r"(?<![가-힣])의사\s*:\s*(\d+)"
+DENTIST_TOKEN = r"(?<![가-힣])치과의사\s*:\s*(\d+)"
+KOREAN_MED_TOKEN = r"(?<![가-힣])한의사\s*:\s*(\d+)"
+
+# One pattern with a named group per staff type, each in an optional lookahead
+# so the three counts are found in any order with a single scan per row
+DOCTOR_COUNTS_PATTERN = re.compile(
+    r"^(?=(?:.*?(?<![가-힣])의사\s*:\s*(?P<num_doctors>\d+))?)"
+    r"(?=(?:.*?(?<![가-힣])치과의사\s*:\s*(?P<num_dentists>\d+))?)"
+    r"(?=(?:.*?(?<![가-힣])한의사\s*:\s*(?P<num_korean_med>\d+))?)",
+    re.DOTALL
+)
 
 # Extract numeric doctor data from text fields
 def extract_doctor_counts(text):
     try:
-        doctor = int(re.search(r"의사\s*:\s*(\d+)", text).group(1))
+        doctor = int(re.search(DOCTOR_TOKEN, text).group(1))
     except:
         doctor = None
     try:
-        dentist = int(re.search(r"치과의사\s*:\s*(\d+)", text).group(1))
+        dentist = int(re.search(DENTIST_TOKEN, text).group(1))
     except:
         dentist = None
     try:
-        korean_med = int(re.search(r"한의사\s*:\s*(\d+)", text).group(1))
+        korean_med = int(re.search(KOREAN_MED_TOKEN, text).group(1))
     except:
         korean_med = None
     return pd.Series([doctor, dentist, korean_med])
 
+# Vectorized doctor count extraction for a whole column
+def extract_doctor_counts_vectorized(series):
+    """
+    Parse doctor/dentist/Korean-medicine counts from doctor_info text in one pass.
+
+    Parameters:
+    - series (pd.Series): doctor_info text (e.g., "총 인원 : 203명 (의사 : 196, 치과의사 : 7, 한의사 : 0)")
+
+    Returns:
+    - pd.DataFrame with nullable Int32 columns num_doctors, num_dentists,
+      num_korean_med and total_medical_staff (NA when no count was found)
+    """
+    # Parse each distinct text once, then broadcast back to the rows
+    codes, uniques = pd.factorize(series.astype("string"))
+    parsed = pd.Series(uniques, dtype="string").str.extract(DOCTOR_COUNTS_PATTERN).astype("Int32")
+
+    counts = parsed.reindex(codes)  # code -1 (missing text) becomes an all-NA row
+    counts.index = series.index
+    counts["total_medical_staff"] = counts.sum(axis=1, min_count=1).astype("Int32")
+    return counts
+
+# "내과 (23), 신경과 (2), ..." → (department, count) tokens
+SPECIALTY_PATTERN = re.compile(r"\s*([^,()]+?)\s*\((\d+)\)")
+
+# Turn specialty text into one column per department
+def pivot_specialties(df, column="specialties", output="wide", department_mapping=None):
+    """
+    Parse specialty text (e.g., "내과 (23), 신경과 (2)") into per-department counts in one pass.
+
+    Parameters:
+    - df (pd.DataFrame): frame holding the specialty text column
+    - column (str): name of the specialty text column
+    - output (str): 'wide' (dense int16 matrix), 'sparse' (int16 SparseDtype columns)
+      or 'long' (one row per hospital/department with columns row, department, count)
+    - department_mapping (dict or None): Korean → column name mapping
+      (defaults to department_mapping_snake_case; unmapped names are kept)
+
+    Returns:
+    - pd.DataFrame aligned to df.index ('wide'/'sparse') or a long-format frame
+      whose 'row' column holds the df index label
+    """
+    if output not in ("wide", "sparse", "long"):
+        raise ValueError("output must be 'wide', 'sparse' or 'long'.")
+    if department_mapping is None:
+        department_mapping = department_mapping_snake_case
+
+    # 1. Parse each distinct text once
+    text_codes, texts = pd.factorize(df[column])
+    parsed = [SPECIALTY_PATTERN.findall(t) if isinstance(t, str) else [] for t in list(texts)]
+
+    # 2. Explode matches into flat arrays (row position, department code, count)
+    per_row = [parsed[c] if c >= 0 else [] for c in text_codes]
+    lengths = np.fromiter(map(len, per_row), dtype=np.int64, count=len(per_row))
+    rows = np.repeat(np.arange(len(per_row)), lengths)
+    pairs = list(chain.from_iterable(per_row))
+    dept_codes, departments = pd.factorize(np.array([name for name, _ in pairs], dtype=object), sort=True)
+    counts = np.array([count for _, count in pairs], dtype=np.int64).astype(np.int16)
+    departments = [department_mapping.get(d, d) for d in departments]
+
+    if output == "long":
+        return pd.DataFrame({
+            "row": df.index.to_numpy()[rows],
+            "department": np.array(departments, dtype=object)[dept_codes],
+            "count": counts,
+        })
+
+    # 3. Scatter into a wide int16 matrix (duplicate departments in one row are summed)
+    matrix = np.zeros((len(df), len(departments)), dtype=np.int16)
+    np.add.at(matrix, (rows, dept_codes), counts)
+
+    if output == "sparse":
+        return pd.DataFrame(
+            {dept: pd.arrays.SparseArray(matrix[:, i], fill_value=0) for i, dept in enumerate(departments)},
+            index=df.index,
+        )
+    return pd.DataFrame(matrix, columns=list(departments), index=df.index)
+
 # Extract metadata (e.g., dept) from filename
 def seperate_data(dataframe, column_name_new, column_name_raw, num):
     dataframe[column_name_new] = dataframe[column_name_raw].apply(
@@ -102,15 +243,125 @@ def extract_region_info(address):
         province, city = None, None
     return pd.Series([province, city])
 
+# Canonical province lookup: every canonical name maps to itself, aliases to their canonical name
+PROVINCE_LOOKUP = {**{name: name for name in province_mapping}, **province_alias_mapping}
+
+# Vectorized province/city extraction for a whole address column
+def extract_region_info_vectorized(address):
+    """
+    Split addresses into canonical province, city and English province name in one step.
+
+    Parameters:
+    - address (pd.Series): full address strings (e.g., "강원도 춘천시 ...")
+
+    Returns:
+    - pd.DataFrame with categorical columns province, city and province_en
+      (legacy/abbreviated province names are canonicalized, e.g. 강원도 → 강원특별자치도)
+    """
+    parts = address.astype("string").str.split(n=2, expand=True).reindex(columns=[0, 1])
+
+    # Hash lookup of the alias table; unknown first tokens are kept as they are
+    province = parts[0].map(PROVINCE_LOOKUP).fillna(parts[0]).astype("category")
+
+    return pd.DataFrame({
+        "province": province,
+        "city": parts[1].astype("category"),
+        "province_en": province.map(province_mapping).astype("category"),
+    }, index=address.index)
+
+# Content hash of the columns a ranking depends on (index included, so row changes count)
+# Hashes the Arrow buffers directly (zero-copy for numeric and pandas string columns)
+def _frame_fingerprint(df, columns):
+    digest = hashlib.sha1()
+    index = df.index
+    if isinstance(index, pd.RangeIndex):
+        digest.update(f"range|{index.start}|{index.stop}|{index.step}".encode())
+        arrays = [df[col] for col in columns]
+    else:
+        arrays = [index] + [df[col] for col in columns]
+    for values in arrays:
+        array = pa.array(values, from_pandas=True)
+        for chunk in getattr(array, "chunks", [array]):
+            _hash_arrow_array(digest, chunk)
+    return digest.hexdigest()
+
+
+def _hash_arrow_array(digest, array):
+    digest.update(f"{array.type}|{array.offset}|{len(array)}".encode())
+    for buffer in array.buffers():
+        if buffer is not None:
+            digest.update(buffer)
+    # buffers() of a categorical only covers the codes; the categories live in the dictionary
+    if isinstance(array, pa.DictionaryArray):
+        _hash_arrow_array(digest, array.dictionary)
+
+
+class TopNIndex:
+    """
+    Per-group ranking of one measure, built once so any top-N is a slice.
+
+    Rows are ordered by (group, value descending, original position) in one lexsort;
+    top(group, n) then returns the first n positions of that group's block in O(n).
+    Ties keep the original row order and missing values rank last, like a stable
+    sort_values(ascending=False).
+    """
+
+    def __init__(self, df, group_col="category", value_col="total_medical_staff"):
+        self.group_col = group_col
+        self.value_col = value_col
+
+        values = pd.to_numeric(df[value_col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        codes, self.groups = pd.factorize(df[group_col], sort=True)
+        descending = np.where(np.isnan(values), np.inf, -values)
+
+        self.order = np.lexsort((np.arange(len(df)), descending, codes))
+        sorted_codes = codes[self.order]
+        self.starts = np.searchsorted(sorted_codes, np.arange(len(self.groups)), side="left")
+        self.ends = np.searchsorted(sorted_codes, np.arange(len(self.groups)), side="right")
+        self._code_of = {group: code for code, group in enumerate(self.groups)}
+
+    def positions(self, group, top_n):
+        """Row positions of the top_n rows of one group (empty if the group is unknown)."""
+        code = self._code_of.get(group)
+        if code is None:
+            return self.order[:0]
+        start, end = self.starts[code], self.ends[code]
+        return self.order[start:min(start + top_n, end)]
+
+    def top(self, df, group, top_n):
+        return df.iloc[self.positions(group, top_n)]
+
+
+_top_n_indexes = OrderedDict()
+_TOP_N_CACHE_SIZE = 16
+
+
+# Cached TopNIndex for this frame's content; a changed frame gets a new index automatically
+def get_top_n_index(df, group_col="category", value_col="total_medical_staff"):
+    try:
+        key = (_frame_fingerprint(df, [group_col, value_col]), group_col, value_col)
+    except (pa.ArrowException, TypeError, ValueError):
+        # Columns Arrow cannot convert (e.g., mixed-type object columns) are ranked uncached
+        return TopNIndex(df, group_col, value_col)
+    index = _top_n_indexes.get(key)
+    if index is None:
+        index = TopNIndex(df, group_col, value_col)
+        _top_n_indexes[key] = index
+        if len(_top_n_indexes) > _TOP_N_CACHE_SIZE:
+            _top_n_indexes.popitem(last=False)
+    else:
+        _top_n_indexes.move_to_end(key)
+    return index
+
+
 # Analyze top hospitals by medical staff size
-def get_top_hospitals_by_staff(df, category, top_n):
-    filtered_df = df[df['category'] == category]
-    filtered_df = filtered_df.sort_values(by='total_medical_staff', ascending=False)
-    return filtered_df.head(top_n)
+# (any group/value column works, e.g. group_col='province', value_col='internal_medicine')
+def get_top_hospitals_by_staff(df, category, top_n, group_col="category", value_col="total_medical_staff"):
+    return get_top_n_index(df, group_col, value_col).top(df, category, top_n)
 
-# Load final_dataset to S3
+# Load final_dataset to S3 (whole folders: utils.s3_uploader.S3BulkUploader)
 def upload_to_s3(file_path, bucket_name, s3_path):
-    s3 = boto3.client('s3')  # Assumes local AWS credentials are set
+    s3 = get_s3_client()  # Pooled client shared by every call; assumes local AWS credentials are set
     try:
         s3.upload_file(file_path, bucket_name, s3_path)
         print(f"✅ Upload successful: s3://{bucket_name}/{s3_path}")
@@ -0,0 +1,89 @@
+# utils/checkpoint.py
+
+import os
+import json
+import threading
+from datetime import datetime
+
+
+class CheckpointJournal:
+    """
+    Append-only JSONL journal of completed work items (categories, departments, ykihos).
+
+    Every completed item is written and fsynced immediately, so a run that crashes
+    can be restarted with the same journal and skip everything already done.
+    """
+
+    def __init__(self, path: str):
+        """
+        Parameters:
+            path (str): journal file (created if missing, replayed if present)
+        """
+        self.path = path
+        self.records = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._replay()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _replay(self):
+        """Load completed items; a torn last line from a crash is cut off before appending."""
+        if not os.path.exists(self.path):
+            return
+        valid_bytes = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("torn line")
+                    record = json.loads(line.decode("utf-8"))
+                except ValueError:  # JSONDecodeError and UnicodeDecodeError included
+                    break
+                self.records[(record["kind"], record["key"])] = record.get("value", {})
+                valid_bytes += len(line)
+        # Otherwise the next record would be appended to the torn line and be lost too
+        if valid_bytes < os.path.getsize(self.path):
+            os.truncate(self.path, valid_bytes)
+        if self.records:
+            print(f"♻️ Resuming from checkpoint: {len(self.records)} completed item(s) in {self.path}")
+
+    def is_done(self, kind: str, key: str):
+        return (kind, key) in self.records
+
+    def get(self, kind: str, key: str, default=None):
+        return self.records.get((kind, key), default)
+
+    def mark_done(self, kind: str, key: str, **value):
+        """Durably record one completed item (thread-safe)."""
+        record = {
+            "kind": kind,
+            "key": key,
+            "value": value,
+            "at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.records[(kind, key)] = value
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def resume_run_id(self, run_id: str):
+        """Return the run id (e.g., date_info) of the interrupted run, or record this one."""
+        previous = self.get("run", "run_id")
+        if previous:
+            return previous["run_id"]
+        self.mark_done("run", "run_id", run_id=run_id)
+        return run_id
+
+    def close(self):
+        """Close the journal and keep it for the next (resumed) run."""
+        if not self._file.closed:
+            self._file.close()
+
+    def finish(self):
+        """Close and delete the journal once the whole run has completed."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,223 @@
+# utils/detail_fetcher.py
+
+import time
+import random
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+
+DETAIL_URL = "https://www.hira.or.kr/ra/hosp/hospInfoAjax.do"
+
+# HTTP status codes worth retrying (throttling and transient server errors)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+# Parse staff count and specialty list from a hospInfoAjax.do HTML response
+def parse_detail_html(html):
+    soup = BeautifulSoup(html, "html.parser")
+
+    td = soup.find("td", string=lambda t: t and "총 인원" in t)
+    doctor_info = td.text.strip() if td else "N/A"
+
+    ul_lists = soup.select("ul.pop_list_style")
+    specialties = [li.text.strip() for li in ul_lists[0].select("li")] if ul_lists else []
+    return doctor_info, specialties
+
+
+# Sanity check before caching: error/blocked pages (often served with 200) lack both markers
+def is_detail_page(html):
+    return bool(html) and ("총 인원" in html or "pop_list_style" in html)
+
+
+class HostRateLimiter:
+    """
+    Thread-safe limiter that spaces requests to the same host by a fixed interval.
+    """
+
+    def __init__(self, requests_per_second: float = 5.0):
+        """
+        Parameters:
+            requests_per_second (float): max request rate per host (0 or None disables limiting)
+        """
+        self.min_interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, host: str):
+        """Block until the next request slot for the host is available."""
+        if not self.min_interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class DetailFetcher:
+    """
+    Concurrent fetch engine for hospInfoAjax.do detail pages.
+
+    Uses one keep-alive session shared by a bounded thread pool, a per-host
+    rate limiter and retries with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        detail_url: str = DETAIL_URL,
+        referer: str = None,
+        max_workers: int = 8,
+        requests_per_second: float = 5.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        timeout: int = 10,
+        cache=None
+    ):
+        """
+        Initialize the detail fetcher.
+
+        Parameters:
+            detail_url (str): detail endpoint URL
+            referer (str): Referer header sent with each request
+            max_workers (int): number of concurrent requests
+            requests_per_second (float): per-host rate limit
+            max_retries (int): retries per ykiho after the first attempt
+            backoff_base (float): base delay (seconds) for exponential backoff
+            timeout (int): request timeout in seconds
+            cache (ResponseCache): optional persistent cache keyed by ykiho
+        """
+        self.detail_url = detail_url
+        self.referer = referer
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.timeout = timeout
+        self.cache = cache
+
+        self.host = urlparse(detail_url).netloc
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.session = self._init_session()
+
+    def _init_session(self):
+        """Create a keep-alive session with a connection pool sized to the worker count."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"User-Agent": "Mozilla/5.0"})
+        if self.referer:
+            session.headers["Referer"] = self.referer
+        return session
+
+    def _backoff(self, attempt: int):
+        """Full-jitter exponential backoff delay for the given attempt."""
+        return random.uniform(0, self.backoff_base * (2 ** attempt))
+
+    def _get(self, ykiho: str, headers: dict = None):
+        """GET the detail page for one ykiho, retrying transient failures."""
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait(self.host)
+            try:
+                res = self.session.get(
+                    self.detail_url, params={"ykiho": ykiho}, headers=headers, timeout=self.timeout)
+                if res.status_code in RETRY_STATUS:
+                    raise requests.HTTPError(f"HTTP {res.status_code}", response=res)
+                res.raise_for_status()
+                res.encoding = "utf-8"
+                return res
+
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                retryable = not isinstance(e, requests.HTTPError) or e.response.status_code in RETRY_STATUS
+                if not retryable or attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+
+    def _load(self, ykiho: str):
+        """Return the detail HTML, serving fresh cache entries and revalidating stale ones."""
+        if self.cache is None:
+            return self._get(ykiho).text
+
+        cached = self.cache.get(ykiho)
+        if cached and cached["fresh"]:
+            self.cache.record("hit")
+            return cached["body"]
+
+        headers = {}
+        if cached and cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        res = self._get(ykiho, headers=headers or None)
+        if res.status_code == 304 and cached:
+            self.cache.touch(ykiho)
+            self.cache.record("revalidated")
+            return cached["body"]
+
+        # Only real detail pages are kept for the TTL; anything else is refetched next time
+        if 200 <= res.status_code < 300 and is_detail_page(res.text):
+            self.cache.put(ykiho, res.text, res.headers.get("ETag"), res.headers.get("Last-Modified"))
+        self.cache.record("miss")
+        return res.text
+
+    def fetch_one(self, ykiho: str):
+        """
+        Fetch and parse one detail page.
+
+        Returns:
+            dict with 'doctor_info' and 'specialties'
+        """
+        if not ykiho:
+            return {"doctor_info": "N/A", "specialties": []}
+
+        try:
+            doctor_info, specialties = parse_detail_html(self._load(ykiho))
+            return {"doctor_info": doctor_info, "specialties": specialties}
+        except Exception as e:
+            return {"doctor_info": f"Request failed: {e}", "specialties": []}
+
+    def fetch_all(self, ykihos, on_result=None):
+        """
+        Fetch detail pages concurrently.
+
+        Parameters:
+            ykihos (iterable): ykiho values to fetch; a generator is consumed lazily, so
+                requests start while it is still producing (e.g., while scrolling results)
+            on_result (callable): called as on_result(position, result) as each page
+                completes (e.g., to checkpoint partial results)
+
+        Returns:
+            List of result dicts in the same order as the input ykiho list.
+        """
+        results = {}
+        running = {}
+
+        def collect(timeout):
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                pos = running.pop(future)
+                results[pos] = future.result()
+                if on_result is not None:
+                    on_result(pos, results[pos])
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Submit while the input is still producing and hand finished pages to
+            # on_result right away, so a crash mid-stream keeps what was fetched
+            for pos, ykiho in enumerate(ykihos):
+                running[executor.submit(self.fetch_one, ykiho)] = pos
+                collect(timeout=0)
+            while running:
+                collect(timeout=None)
+        return [results[pos] for pos in range(len(results))]
+
+    def close(self):
+        """Close the shared HTTP session."""
+        self.session.close()
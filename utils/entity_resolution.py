@@ -0,0 +1,224 @@
+# utils/entity_resolution.py
+
+import re
+import hashlib
+from collections import defaultdict
+
+import pandas as pd
+
+from config.mapping_info import category_mapping
+
+# Legal-entity prefixes/suffixes that vary between sources (e.g., "의료법인 ○○의료재단 ○○병원")
+NAME_NOISE_PATTERN = re.compile(
+    r"\(.*?\)|（.*?）|의료법인|학교법인|사회복지법인|재단법인|사단법인|\(재\)|\(의\)|\(학\)|\(사\)|[^\w가-힣]"
+)
+
+# Rule weights: each matching signal adds its points, highest total wins
+SCORE_EXACT_NAME = 50
+SCORE_NAME_SIMILARITY = 30  # scaled by name bigram Jaccard similarity
+# Detail rows scraped from hospInfoAjax carry no phone/postal code: the name is then the
+# main evidence, so similarity is weighted like an exact name (Jaccard ≥ 0.6 + category passes)
+SCORE_NAME_ONLY_SIMILARITY = 50
+SCORE_PHONE = 30
+SCORE_POSTAL_CODE = 15
+SCORE_CATEGORY = 10
+
+
+# Normalize a hospital name for comparison ("(재)서울 성모병원" → "서울성모병원")
+def normalize_name(name):
+    if not isinstance(name, str):
+        return ""
+    return NAME_NOISE_PATTERN.sub("", name).lower()
+
+
+# Character bigrams of a normalized name
+def name_bigrams(norm_name):
+    if len(norm_name) < 2:
+        return {norm_name} if norm_name else set()
+    return {norm_name[i:i + 2] for i in range(len(norm_name) - 1)}
+
+
+def _digits(value):
+    return re.sub(r"\D", "", value) if isinstance(value, str) else ""
+
+
+def _category(value):
+    return category_mapping.get(value, value) if isinstance(value, str) else None
+
+
+def _postal(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    code = re.sub(r"\.0$", "", str(value)).strip()
+    return code.zfill(5) if code.isdigit() else code
+
+
+def build_hco_id(registry_df):
+    """
+    Stable registry id from normalized name, phone digits and postal code.
+
+    Returns:
+    - pd.Series of ids like 'HCO3f1a9c0b2e7d' aligned to registry_df.index
+    """
+    def column(name):
+        return registry_df[name].tolist() if name in registry_df.columns else [None] * len(registry_df)
+
+    keys = (
+        f"{normalize_name(name)}|{_digits(phone)}|{_postal(postal)}"
+        for name, phone, postal in zip(column("hospital_name"), column("phone"), column("postal_code"))
+    )
+    ids = ["HCO" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:12] for key in keys]
+    return pd.Series(ids, index=registry_df.index, dtype=object)
+
+
+class EntityResolver:
+    """
+    Blocking-index matcher from detail rows to registry rows.
+
+    Registry rows are indexed by normalized name, phone, postal code and rare name
+    bigrams; each detail row is only scored against rows sharing a block, so the
+    cost stays near-linear in the registry size.
+    """
+
+    def __init__(self, registry_df, max_block_size: int = 200, min_score: float = 40):
+        """
+        Parameters:
+            registry_df (pd.DataFrame): registry with hospital_name, phone, postal_code, category
+            max_block_size (int): bigrams shared by more rows than this are not used for blocking
+            min_score (float): minimum score to accept a match
+        """
+        self.registry = registry_df
+        self.max_block_size = max_block_size
+        self.min_score = min_score
+        self.hco_ids = build_hco_id(registry_df).to_numpy()
+        self._build_indexes()
+
+    def _column(self, df, name):
+        return df[name].tolist() if name in df.columns else [None] * len(df)
+
+    def _build_indexes(self):
+        """Build name/phone/postal/bigram blocking indexes over registry positions."""
+        self.names = [normalize_name(n) for n in self._column(self.registry, "hospital_name")]
+        self.bigrams = [name_bigrams(n) for n in self.names]
+        self.phones = [_digits(p) for p in self._column(self.registry, "phone")]
+        self.postals = [_postal(p) for p in self._column(self.registry, "postal_code")]
+        self.categories = [_category(c) for c in self._column(self.registry, "category")]
+
+        self.by_name = defaultdict(list)
+        self.by_phone = defaultdict(list)
+        self.by_postal = defaultdict(list)
+        self.by_bigram = defaultdict(list)
+        for pos, (name, phone, postal, grams) in enumerate(zip(self.names, self.phones, self.postals, self.bigrams)):
+            if name:
+                self.by_name[name].append(pos)
+            if phone:
+                self.by_phone[phone].append(pos)
+            if postal:
+                self.by_postal[postal].append(pos)
+            for gram in grams:
+                self.by_bigram[gram].append(pos)
+
+    def _candidates(self, name, grams, phone, postal):
+        """Registry positions sharing at least one block with the detail row."""
+        candidates = set(self.by_name.get(name, ()))
+        if phone:
+            candidates.update(self.by_phone.get(phone, ()))
+        if postal and len(self.by_postal.get(postal, ())) <= self.max_block_size:
+            candidates.update(self.by_postal.get(postal, ()))
+        if not candidates:
+            for gram in grams:
+                block = self.by_bigram.get(gram, ())
+                if len(block) <= self.max_block_size:
+                    candidates.update(block)
+        return candidates
+
+    def _score(self, pos, name, grams, phone, postal, category, name_weight=SCORE_NAME_SIMILARITY):
+        """Score one candidate; returns (score, rule labels)."""
+        score, rules = 0.0, []
+        if name and name == self.names[pos]:
+            score += SCORE_EXACT_NAME
+            rules.append("name")
+        elif grams and self.bigrams[pos]:
+            jaccard = len(grams & self.bigrams[pos]) / len(grams | self.bigrams[pos])
+            if jaccard > 0:
+                score += name_weight * jaccard
+                rules.append(f"name~{jaccard:.2f}")
+        if phone and phone == self.phones[pos]:
+            score += SCORE_PHONE
+            rules.append("phone")
+        if postal and postal == self.postals[pos]:
+            score += SCORE_POSTAL_CODE
+            rules.append("postal")
+        if category is not None and category == self.categories[pos]:
+            score += SCORE_CATEGORY
+            rules.append("category")
+        return score, rules
+
+    def match(self, detail_df):
+        """
+        Match each detail row to at most one registry row.
+
+        Rows without phone and postal code are scored with a higher name-similarity
+        weight (SCORE_NAME_ONLY_SIMILARITY), so slightly different names can still match.
+        When the best score is shared by registry rows of different entities (e.g.,
+        several "명지병원" of the same category), the row is left unmatched as 'ambiguous'
+        instead of picking one arbitrarily.
+
+        Returns:
+        - pd.DataFrame crosswalk aligned to detail_df.index with columns
+          registry_index, registry_pos, hco_id, score, match_rule
+        """
+        names = [normalize_name(n) for n in self._column(detail_df, "hospital_name")]
+        phones = [_digits(p) for p in self._column(detail_df, "phone")]
+        postals = [_postal(p) for p in self._column(detail_df, "postal_code")]
+        categories = [_category(c) for c in self._column(detail_df, "category")]
+
+        records = []
+        for name, phone, postal, category in zip(names, phones, postals, categories):
+            grams = name_bigrams(name)
+            name_weight = SCORE_NAME_SIMILARITY if (phone or postal) else SCORE_NAME_ONLY_SIMILARITY
+            best_score, best = 0.0, []
+            for pos in sorted(self._candidates(name, grams, phone, postal)):
+                score, rules = self._score(pos, name, grams, phone, postal, category, name_weight)
+                if score > best_score + 1e-9:
+                    best_score, best = score, [(pos, rules)]
+                elif best and abs(score - best_score) <= 1e-9:
+                    best.append((pos, rules))
+
+            if not best or best_score < self.min_score:
+                records.append((None, None, None, round(best_score, 2), "unmatched"))
+            elif len({self.hco_ids[pos] for pos, _ in best}) > 1:
+                records.append((None, None, None, round(best_score, 2), f"ambiguous({len(best)})"))
+            else:
+                # Tied rows with the same hco_id are duplicates of one entity
+                pos, rules = best[0]
+                records.append((self.registry.index[pos], pos, self.hco_ids[pos],
+                                round(best_score, 2), "+".join(rules)))
+
+        crosswalk = pd.DataFrame(
+            records, columns=["registry_index", "registry_pos", "hco_id", "score", "match_rule"],
+            index=detail_df.index
+        )
+        crosswalk["registry_pos"] = crosswalk["registry_pos"].astype("Int64")
+        return crosswalk
+
+
+def attach_registry_columns(detail_df, registry_df, crosswalk, columns=("province", "city")):
+    """
+    Add hco_id and registry columns (e.g., province/city) to detail rows via the crosswalk.
+
+    Unlike a merge on hospital_name this never duplicates detail rows. Registry rows are
+    looked up by position (registry_pos), so a non-unique registry index is fine.
+
+    Returns:
+    - pd.DataFrame with the same rows as detail_df
+    """
+    result = detail_df.copy()
+    result["hco_id"] = crosswalk["hco_id"].to_numpy()
+    matched = crosswalk["registry_pos"].notna().to_numpy()
+    positions = crosswalk["registry_pos"].to_numpy()[matched].astype(int)
+    for col in columns:
+        values = pd.Series(pd.NA, index=detail_df.index, dtype=object)
+        values[matched] = registry_df[col].iloc[positions].to_numpy()
+        result[col] = values
+    return result
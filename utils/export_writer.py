@@ -0,0 +1,162 @@
+# utils/export_writer.py
+
+import os
+import json
+import shutil
+import hashlib
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+MANIFEST_NAME = "_manifest.json"
+MISSING_PARTITION = "unknown"
+
+
+# sha256 of a file (streamed)
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Partition directory value: '/' and '=' would break the hive path
+def _partition_value(value):
+    if value is None or pd.isna(value) or str(value).strip() == "":
+        return MISSING_PARTITION
+    return str(value).replace("/", "_").replace("=", "_")
+
+
+# Original values behind one partition directory (the mapping above is lossy: NaN → 'unknown', '/' → '_')
+def _original_values(series):
+    values = sorted(series.dropna().unique().tolist(), key=str)
+    return values + [None] if series.isna().any() else values
+
+
+def write_partitioned_export(
+    df,
+    output_dir,
+    name,
+    partition_cols=("province", "category"),
+    write_csv_gz=False,
+    compression="zstd",
+    compression_level=9
+):
+    """
+    Write a final dataset as zstd Parquet partitioned by province and category.
+
+    The dataset folder is rebuilt in a temporary folder and swapped in, so every
+    run replaces the previous export instead of adding another full copy.
+    Unchanged partitions produce byte-identical files (same checksum), so the S3
+    uploader skips them.
+
+    Parameters:
+    - df (pd.DataFrame): dataset to export
+    - output_dir (str): parent folder (e.g., data/final_dataset)
+    - name (str): dataset name, used as the folder name (e.g., 'hco_detail_merged')
+    - partition_cols (tuple): hive partition columns (missing values → 'unknown'; the
+      original values of each partition are kept in the manifest's 'partition_values')
+    - write_csv_gz (bool): also write '<output_dir>/<name>.csv.gz' for legacy consumers
+    - compression (str): Parquet codec
+    - compression_level (int): codec level
+
+    Returns:
+    - dict manifest (also written to <name>/_manifest.json)
+    """
+    dataset_dir = os.path.join(output_dir, name)
+    tmp_dir = dataset_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    partition_cols = [c for c in partition_cols if c in df.columns]
+    data_cols = [c for c in df.columns if c not in partition_cols]
+    keys = [df[c].map(_partition_value) for c in partition_cols]
+
+    files = []
+    groups = df.groupby(keys, sort=True, observed=True) if keys else [((), df)]
+    for values, part in groups:
+        values = values if isinstance(values, tuple) else (values,)
+        rel_dir = os.path.join(*[f"{c}={v}" for c, v in zip(partition_cols, values)]) if partition_cols else ""
+        os.makedirs(os.path.join(tmp_dir, rel_dir), exist_ok=True)
+        rel_path = os.path.join(rel_dir, "part-0.parquet")
+
+        table = pa.Table.from_pandas(part[data_cols], preserve_index=False)
+        pq.write_table(table, os.path.join(tmp_dir, rel_path),
+                       compression=compression, compression_level=compression_level)
+        files.append({
+            "path": rel_path.replace(os.sep, "/"),
+            "rows": len(part),
+            "partition_values": {c: _original_values(part[c]) for c in partition_cols},
+        })
+
+    for entry in files:
+        full_path = os.path.join(tmp_dir, entry["path"])
+        entry["bytes"] = os.path.getsize(full_path)
+        entry["sha256"] = file_sha256(full_path)
+
+    manifest = {
+        "name": name,
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "format": f"parquet/{compression}",
+        "partition_cols": partition_cols,
+        "columns": {c: str(t) for c, t in df.dtypes.items()},
+        "rows": len(df),
+        "bytes": sum(f["bytes"] for f in files),
+        "files": files,
+    }
+
+    if write_csv_gz:
+        # Next to (not inside) the dataset folder so Parquet readers never see it
+        csv_path = os.path.join(output_dir, f"{name}.csv.gz")
+        # mtime=0 keeps the gzip header stable so identical data gives identical bytes
+        df.to_csv(csv_path + ".tmp", index=False, encoding="utf-8-sig",
+                  compression={"method": "gzip", "mtime": 0})
+        os.replace(csv_path + ".tmp", csv_path)
+        manifest["csv_gz"] = {
+            "path": f"../{name}.csv.gz",
+            "rows": len(df),
+            "bytes": os.path.getsize(csv_path),
+            "sha256": file_sha256(csv_path),
+        }
+
+    with open(os.path.join(tmp_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    # Swap the new export in: move the previous one aside first, so dataset_dir is only
+    # ever missing between two renames, and put it back if the second rename fails
+    old_dir = dataset_dir + ".old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(dataset_dir):
+        os.replace(dataset_dir, old_dir)
+    try:
+        os.replace(tmp_dir, dataset_dir)
+    except OSError:
+        if os.path.exists(old_dir):
+            os.replace(old_dir, dataset_dir)
+        raise
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    print(f"📦 Exported {name}: {manifest['rows']} rows in {len(files)} partition(s), "
+          f"{manifest['bytes'] / 1024 ** 2:.1f} MB Parquet")
+    return manifest
+
+
+def verify_export(dataset_dir):
+    """
+    Check every file listed in a dataset's manifest against its checksum.
+
+    Returns:
+    - list of relative paths that are missing or do not match (empty if intact)
+    """
+    with open(os.path.join(dataset_dir, MANIFEST_NAME), encoding="utf-8") as f:
+        manifest = json.load(f)
+    entries = manifest["files"] + ([manifest["csv_gz"]] if "csv_gz" in manifest else [])
+    bad = []
+    for entry in entries:
+        path = os.path.join(dataset_dir, entry["path"])
+        if not os.path.exists(path) or file_sha256(path) != entry["sha256"]:
+            bad.append(entry["path"])
+    return bad
@@ -0,0 +1,210 @@
+# utils/incremental.py
+
+import os
+import json
+import hashlib
+from datetime import datetime
+
+import pandas as pd
+
+from config.mapping_info import column_mapping
+from utils.storage import parse_snapshot_name
+
+# Stable identity of a registry row when no ykiho is available
+KEY_COLUMNS = ["hospital_name", "phone", "postal_code"]
+
+# Columns that change between downloads without the entity changing
+IGNORE_COLUMNS = ["NO", "source_file"]
+
+
+# Load one downloaded snapshot with English column names
+def load_snapshot(file_path):
+    if file_path.endswith(".csv"):
+        df = pd.read_csv(file_path)
+    elif file_path.endswith(".parquet"):
+        df = pd.read_parquet(file_path)
+    else:
+        df = pd.read_excel(file_path)
+    return df.rename(columns=column_mapping)
+
+
+# Build a stable record key: ykiho where known, otherwise a hash of name+phone+postal_code
+def build_record_key(df, key_cols=KEY_COLUMNS):
+    composite = df[key_cols].astype("string").fillna("").agg("|".join, axis=1)
+    key = composite.map(lambda s: hashlib.sha1(s.encode("utf-8")).hexdigest()[:20])
+
+    if "ykiho" in df.columns:
+        ykiho = df["ykiho"].astype("string")
+        key = ykiho.where(ykiho.notna() & (ykiho != ""), key)
+    return key.astype(str)
+
+
+def _row_hash(df, value_cols):
+    return pd.util.hash_pandas_object(df[value_cols].astype("string"), index=False)
+
+
+def diff_snapshots(prev_df, curr_df, ignore_cols=IGNORE_COLUMNS):
+    """
+    Diff two snapshots of the same category by record key.
+
+    Parameters:
+    - prev_df (pd.DataFrame or None): previous snapshot (None means everything is new)
+    - curr_df (pd.DataFrame): new snapshot
+    - ignore_cols (list): columns excluded from change detection
+
+    Returns:
+    - pd.DataFrame changeset with '_key' and '_op' ('insert', 'update', 'delete');
+      inserts/updates carry the new values, deletes the last known values
+    """
+    curr = curr_df.copy()
+    curr["_key"] = build_record_key(curr)
+    curr = curr.drop_duplicates(subset="_key", keep="first")
+
+    if prev_df is None or prev_df.empty:
+        return curr.assign(_op="insert").reset_index(drop=True)
+
+    prev = prev_df.copy()
+    if "_key" not in prev.columns:
+        prev["_key"] = build_record_key(prev)
+    prev = prev.drop_duplicates(subset="_key", keep="first")
+
+    value_cols = [
+        c for c in curr.columns
+        if c in prev.columns and c != "_key" and c not in ignore_cols and not c.startswith("_")
+    ]
+    prev_hash = pd.Series(_row_hash(prev, value_cols).values, index=prev["_key"].values)
+    curr_hash = pd.Series(_row_hash(curr, value_cols).values, index=curr["_key"].values)
+
+    is_new = ~curr["_key"].isin(prev_hash.index)
+    common = curr["_key"][~is_new]
+    changed_keys = common[curr_hash[common].values != prev_hash[common].values]
+
+    inserted = curr[is_new].assign(_op="insert")
+    updated = curr[curr["_key"].isin(changed_keys)].assign(_op="update")
+    deleted = prev[~prev["_key"].isin(curr_hash.index)].assign(_op="delete")
+
+    return pd.concat([inserted, updated, deleted], ignore_index=True)
+
+
+def apply_changeset(master_df, changeset, group_col="_group"):
+    """
+    Apply a changeset to the master table.
+
+    Rows are matched on (group, key) so the same entity may appear in several
+    snapshots (e.g., a clinic listed under multiple departments).
+
+    Returns:
+    - pd.DataFrame updated master table
+    """
+    if changeset.empty:
+        return master_df
+    if master_df is None or master_df.empty:
+        return changeset[changeset["_op"] != "delete"].drop(columns="_op").reset_index(drop=True)
+
+    touched = pd.MultiIndex.from_frame(changeset[[group_col, "_key"]])
+    current = pd.MultiIndex.from_frame(master_df[[group_col, "_key"]])
+    kept = master_df[~current.isin(touched)]
+
+    upserts = changeset[changeset["_op"] != "delete"].drop(columns="_op")
+    return pd.concat([kept, upserts], ignore_index=True)
+
+
+class IncrementalStore:
+    """
+    Maintains per-group previous snapshots, Parquet changesets and a master table.
+
+    Layout under state_dir:
+        snapshots/{group}.parquet      last applied snapshot per category/department
+        changesets/{group}_{ts}.parquet inserted/updated/deleted rows per crawl
+        master.parquet                 current registry across all groups
+        applied.json                   last applied crawl_ts per group
+
+    Snapshots are applied in crawl order: one that is not newer than the last
+    applied crawl of its group is skipped, so reruns over a folder holding several
+    crawls never roll the master table back.
+    """
+
+    def __init__(self, state_dir: str):
+        """
+        Parameters:
+            state_dir (str): folder holding snapshots, changesets and the master table
+        """
+        self.state_dir = state_dir
+        self.snapshot_dir = os.path.join(state_dir, "snapshots")
+        self.changeset_dir = os.path.join(state_dir, "changesets")
+        self.master_path = os.path.join(state_dir, "master.parquet")
+        self.applied_path = os.path.join(state_dir, "applied.json")
+        self.date_info = datetime.now().strftime("%Y%m%d_%H%M")
+
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        os.makedirs(self.changeset_dir, exist_ok=True)
+        self.applied = self._load_applied()
+
+    def _load_applied(self):
+        if os.path.exists(self.applied_path):
+            with open(self.applied_path, encoding="utf-8") as f:
+                return json.load(f)
+        return {}
+
+    def _save_applied(self):
+        tmp_path = self.applied_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.applied, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.applied_path)
+
+    def _read(self, path):
+        return pd.read_parquet(path) if os.path.exists(path) else None
+
+    def load_master(self):
+        """Return the current master table (None before the first crawl)."""
+        return self._read(self.master_path)
+
+    def ingest(self, file_path: str, group: str, crawl_ts: str = None):
+        """
+        Diff a new snapshot against the previous one for the group, persist the
+        changeset and apply it to the master table.
+
+        Parameters:
+        - file_path (str): downloaded snapshot
+        - group (str): category/department the snapshot belongs to
+        - crawl_ts (str or None): crawl timestamp (parsed from the file name if None)
+
+        Returns:
+        - (pd.DataFrame changeset, str changeset path or None if nothing changed);
+          snapshots already applied or older than the last applied one return an
+          empty changeset and change nothing
+        """
+        if crawl_ts is None:
+            _, crawl_ts = parse_snapshot_name(file_path)
+        if crawl_ts == "unknown":
+            crawl_ts = self.date_info  # no timestamp in the name: treat it as crawled now
+
+        last_applied = self.applied.get(group)
+        if last_applied is not None and crawl_ts <= last_applied:
+            print(f"⏭️ {group}: {crawl_ts} already applied (last {last_applied})")
+            return pd.DataFrame(columns=["_key", "_op", "_group"]), None
+
+        snapshot_path = os.path.join(self.snapshot_dir, f"{group}.parquet")
+        curr = load_snapshot(file_path).astype("string")
+        changeset = diff_snapshots(self._read(snapshot_path), curr)
+        changeset["_group"] = group
+
+        counts = changeset["_op"].value_counts()
+        print(
+            f"🔁 {group}: +{counts.get('insert', 0)} ~{counts.get('update', 0)} "
+            f"-{counts.get('delete', 0)}"
+        )
+
+        changeset_path = None
+        if not changeset.empty:
+            changeset_path = os.path.join(self.changeset_dir, f"{group}_{crawl_ts}.parquet")
+            changeset.to_parquet(changeset_path, index=False)
+
+            master = apply_changeset(self.load_master(), changeset)
+            master.to_parquet(self.master_path, index=False)
+
+        curr["_key"] = build_record_key(curr)
+        curr.to_parquet(snapshot_path, index=False)
+        self.applied[group] = crawl_ts
+        self._save_applied()
+        return changeset, changeset_path
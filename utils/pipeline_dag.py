@@ -0,0 +1,196 @@
+# utils/pipeline_dag.py
+
+import os
+import glob
+import json
+import hashlib
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+# Expand file paths, globs and directories into a sorted list of files
+def expand_paths(patterns):
+    files = set()
+    for pattern in patterns:
+        for path in glob.glob(pattern) or []:
+            if os.path.isdir(path):
+                for root, _, names in os.walk(path):
+                    files.update(os.path.join(root, n) for n in names)
+            else:
+                files.add(path)
+    return sorted(files)
+
+
+# Content hash of a file (streamed in chunks)
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Stage:
+    """
+    One pipeline step with declared inputs/outputs and upstream dependencies.
+    """
+
+    def __init__(self, name, func, inputs=(), outputs=(), deps=()):
+        """
+        Parameters:
+            name (str): unique stage name
+            func (callable): function run with no arguments
+            inputs (list): files, globs or directories whose content decides re-runs
+            outputs (list): files, globs or directories the stage produces
+            deps (list): names of stages that must finish first
+        """
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.deps = list(deps)
+
+
+class PipelineDAG:
+    """
+    Small DAG runner with content-hash skipping, parallel execution and resume.
+
+    A stage is skipped when the fingerprint of its inputs (plus its upstream stages'
+    fingerprints) matches the last successful run and its outputs still exist.
+    State is saved after every successful stage, so a crashed run resumes from there.
+    """
+
+    def __init__(self, state_path: str, max_workers: int = 3):
+        """
+        Parameters:
+            state_path (str): JSON file holding the last successful fingerprint per stage
+            max_workers (int): max number of stages running at the same time
+        """
+        self.state_path = state_path
+        self.max_workers = max(1, max_workers)
+        self.stages = {}
+        self.state = self._load_state()
+
+    def _load_state(self):
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        return {}
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def add_stage(self, name, func, inputs=(), outputs=(), deps=()):
+        """Register a stage (see Stage for parameters)."""
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage name: {name}")
+        self.stages[name] = Stage(name, func, inputs, outputs, deps)
+        return self.stages[name]
+
+    def _validate(self):
+        """Check dependencies exist and the graph has no cycle; return a topological order."""
+        order, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle detected at stage: {name}")
+            if name not in self.stages:
+                raise ValueError(f"Unknown dependency: {name}")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def fingerprint(self, name, upstream):
+        """Hash of the stage's input file contents and its upstream stages' fingerprints."""
+        stage = self.stages[name]
+        digest = hashlib.sha256(name.encode("utf-8"))
+        for path in expand_paths(stage.inputs):
+            digest.update(path.encode("utf-8"))
+            digest.update(file_digest(path).encode("utf-8"))
+        for dep in sorted(stage.deps):
+            digest.update(f"{dep}:{upstream.get(dep, '')}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _outputs_exist(self, stage):
+        return all(glob.glob(pattern) for pattern in stage.outputs)
+
+    def _should_skip(self, stage, fingerprint, force):
+        if force:
+            return False
+        previous = self.state.get(stage.name, {})
+        return previous.get("fingerprint") == fingerprint and self._outputs_exist(stage)
+
+    def run(self, force=()):
+        """
+        Run all stages, skipping unchanged ones and running independent ones in parallel.
+
+        Parameters:
+            force (list): stage names to run regardless of their fingerprint
+
+        Returns:
+            dict of stage name → 'skipped', 'done', 'failed' or 'blocked'
+        """
+        self._validate()
+        force = set(force)
+        status, fingerprints = {}, {}
+        pending = set(self.stages)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                # Stages whose dependencies failed can never run
+                for name in sorted(pending):
+                    if any(status.get(dep) in ("failed", "blocked") for dep in self.stages[name].deps):
+                        status[name] = "blocked"
+                        pending.discard(name)
+                        print(f"⛔ Blocked: {name}")
+
+                ready = sorted(
+                    name for name in pending
+                    if all(status.get(dep) in ("done", "skipped") for dep in self.stages[name].deps)
+                )
+                for name in ready:
+                    pending.discard(name)
+                    stage = self.stages[name]
+                    fingerprints[name] = self.fingerprint(name, fingerprints)
+                    if self._should_skip(stage, fingerprints[name], name in force):
+                        status[name] = "skipped"
+                        print(f"⏭️ Skipped (unchanged): {name}")
+                        continue
+                    print(f"▶ Running: {name}")
+                    running[executor.submit(stage.func)] = name
+
+                if not running:
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        status[name] = "failed"
+                        print(f"❌ Failed: {name} ({e})")
+                        continue
+                    status[name] = "done"
+                    self.state[name] = {
+                        "fingerprint": fingerprints[name],
+                        "finished_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    }
+                    self._save_state()
+                    print(f"✅ Done: {name}")
+
+        return status
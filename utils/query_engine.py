@@ -0,0 +1,354 @@
+# utils/query_engine.py
+
+import os
+import glob
+import time
+
+import duckdb
+
+from config.mapping_info import category_mapping, province_mapping, department_mapping_snake_case
+from config.schema_info import category_columns, string_columns, count_columns, phone_columns, postal_code_columns
+from utils.export_writer import MISSING_PARTITION
+from utils.storage import ingest_folder
+
+# Specialty columns in one fixed order, so every crawl exposes the same detail schema
+SPECIALTY_COLUMNS = list(dict.fromkeys(department_mapping_snake_case.values()))
+
+# Leading columns of each view (missing ones become NULL, extra ones follow in source order)
+VIEW_COLUMNS = {
+    "hco_all": [
+        "hospital_name", "category", "category_en", "province", "province_en", "city",
+        "address", "postal_code", "phone", "homepage_address", "departments", "source_file",
+    ],
+    "hco_detail_merged": [
+        "hco_id", "ykiho", "hospital_name", "category", "category_en", "province", "city",
+        "num_doctors", "num_dentists", "num_korean_med", "total_medical_staff",
+    ] + SPECIALTY_COLUMNS,
+    "raw_hco": ["group", "crawl_ts", "hospital_name", "address", "postal_code", "phone"],
+    "raw_clinic": ["group", "crawl_ts", "hospital_name", "address", "postal_code", "phone"],
+    "raw_hco_detail": ["group", "crawl_ts", "hospital_name", "ykiho", "doctor_info", "specialties"],
+}
+
+
+# DuckDB type of a column from the declared schema (config/schema_info.py)
+def _column_type(name):
+    if name in count_columns:
+        return "INTEGER"
+    if name in category_columns + string_columns + phone_columns + postal_code_columns:
+        return "VARCHAR"
+    return None
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _parquet_files(path):
+    return glob.glob(os.path.join(path, "**", "*.parquet"), recursive=True) if os.path.isdir(path) else []
+
+
+# Hive partition keys of an export, e.g. ["province", "category"] from ".../province=서울특별시/category=병원/part-0.parquet"
+def _partition_keys(dataset_dir, parquet_file):
+    rel_dir = os.path.dirname(os.path.relpath(parquet_file, dataset_dir))
+    return [part.split("=", 1)[0] for part in rel_dir.split(os.sep) if "=" in part]
+
+
+# Latest notebook output, e.g. "hco_detail_merged_20250519_1244.csv"
+def _latest_csv(folder, prefix):
+    files = sorted(glob.glob(os.path.join(folder, f"{prefix}_*.csv")))
+    return files[-1] if files else None
+
+
+class HCOQueryEngine:
+    """
+    Embedded DuckDB query layer over the pipeline outputs and raw snapshots.
+
+    Every dataset is registered as a view over its files (nothing is loaded up front):
+    - hco_all, hco_detail_merged: final exports (partitioned Parquet), falling back to
+      the pipeline work files or the latest notebook CSV in data/final_dataset
+    - raw_hco, raw_clinic, raw_hco_detail: every crawl snapshot (group, crawl_ts columns)
+      plus *_latest views keeping only the newest crawl per group
+    - dim_category, dim_province: Korean → English names from config/mapping_info.py
+
+    Views put the declared columns first with fixed types, so queries keep working
+    when a crawl adds, drops or re-types a column. Queries stream from the files and
+    spill to temp_dir beyond memory_limit.
+    """
+
+    def __init__(
+        self,
+        data_dir: str,
+        database: str = ":memory:",
+        memory_limit: str = "2GB",
+        threads: int = None,
+        temp_dir: str = None,
+        ingest_raw: bool = False
+    ):
+        """
+        Parameters:
+            data_dir (str): project data folder (final_dataset, pipeline, parquet, hco, clinic, hco_detail)
+            database (str): DuckDB file to persist the views in (":memory:" = per session)
+            memory_limit (str): DuckDB memory cap; larger intermediates spill to temp_dir
+            threads (int): worker threads (all cores if None)
+            temp_dir (str): spill folder (default: data/pipeline/duckdb_tmp)
+            ingest_raw (bool): convert new xlsx/csv downloads to Parquet before registering raw views
+                (off by default so opening the engine never writes to data_dir)
+        """
+        self.data_dir = data_dir
+        self.con = duckdb.connect(database)
+        self.con.execute(f"SET memory_limit = {_literal(memory_limit)}")
+        self.con.execute(f"SET temp_directory = {_literal(temp_dir or os.path.join(data_dir, 'pipeline', 'duckdb_tmp'))}")
+        self.con.execute("SET preserve_insertion_order = false")
+        if threads:
+            self.con.execute(f"SET threads = {int(threads)}")
+
+        self.sources = {}
+        self.register_dimensions()
+        self.register_outputs()
+        self.register_raw_snapshots(ingest=ingest_raw)
+
+    # ---------- registration ----------
+
+    def _source_columns(self, source_sql):
+        return [row[0] for row in self.con.execute(f"DESCRIBE SELECT * FROM {source_sql}").fetchall()]
+
+    def register_view(self, name, source_sql, columns=None):
+        """
+        Create (or replace) a view with the leading columns in a fixed order and type.
+
+        Parameters:
+            name (str): view name
+            source_sql (str): table function or subquery, e.g. "read_parquet('...')"
+            columns (list): leading columns (default: VIEW_COLUMNS[name])
+        """
+        columns = VIEW_COLUMNS.get(name, []) if columns is None else columns
+        available = self._source_columns(source_sql)
+
+        select = []
+        for col in columns:
+            col_type = _column_type(col)
+            if col in available:
+                select.append(f"CAST({_quote(col)} AS {col_type}) AS {_quote(col)}" if col_type else _quote(col))
+            elif col in SPECIALTY_COLUMNS:
+                # A specialty no hospital reported in this crawl: 0 doctors, as in pivot_specialties
+                select.append(f"0::INTEGER AS {_quote(col)}")
+            else:
+                select.append(f"NULL::{col_type or 'VARCHAR'} AS {_quote(col)}")
+        select += [_quote(col) for col in available if col not in columns]
+
+        self.con.execute(f"CREATE OR REPLACE VIEW {_quote(name)} AS SELECT {', '.join(select)} FROM {source_sql}")
+        self.sources[name] = source_sql
+        return name
+
+    def register_dimensions(self):
+        """Register dim_category and dim_province from the mapping config."""
+        for name, key, mapping in (("dim_category", "category", category_mapping),
+                                   ("dim_province", "province", province_mapping)):
+            values = ", ".join(f"({_literal(k)}, {_literal(v)})" for k, v in mapping.items())
+            self.con.execute(f"CREATE OR REPLACE TABLE {name} AS "
+                             f"SELECT * FROM (VALUES {values}) AS t({key}, {key}_en)")
+
+    def _output_source(self, name, fallback_files):
+        """First available source: partitioned export → pipeline Parquet → latest notebook CSV."""
+        export_dir = os.path.join(self.data_dir, "final_dataset", name)
+        export_files = _parquet_files(export_dir)
+        if export_files:
+            pattern = os.path.join(export_dir, "**", "*.parquet")
+            source_sql = (f"read_parquet({_literal(pattern)}, hive_partitioning = true, "
+                          f"hive_types_autocast = false, union_by_name = true)")
+            # Rows with a missing province/category were written under '<key>=unknown': read them back as NULL
+            keys = _partition_keys(export_dir, export_files[0])
+            if not keys:
+                return source_sql
+            restored = ", ".join(f"NULLIF({_quote(k)}, {_literal(MISSING_PARTITION)}) AS {_quote(k)}" for k in keys)
+            return f"(SELECT * REPLACE ({restored}) FROM {source_sql})"
+
+        work_files = [p for p in fallback_files if os.path.exists(p)]
+        if work_files:
+            return f"read_parquet([{', '.join(map(_literal, work_files))}], union_by_name = true)"
+
+        csv_prefix = "hco_all_df" if name == "hco_all" else name
+        csv_path = _latest_csv(os.path.join(self.data_dir, "final_dataset"), csv_prefix)
+        if csv_path:
+            return f"read_csv({_literal(csv_path)}, header = true, all_varchar = true)"
+        return None
+
+    def register_outputs(self):
+        """Register hco_all and hco_detail_merged from the newest available outputs."""
+        work_dir = os.path.join(self.data_dir, "pipeline")
+        fallbacks = {
+            "hco_all": [os.path.join(work_dir, "registry_clean.parquet"), os.path.join(work_dir, "clinic_clean.parquet")],
+            "hco_detail_merged": [os.path.join(work_dir, "hco_detail_merged.parquet")],
+        }
+        for name, fallback_files in fallbacks.items():
+            source_sql = self._output_source(name, fallback_files)
+            if source_sql is None:
+                print(f"⚠️ No files for view '{name}' under {self.data_dir}")
+                continue
+            self.register_view(name, source_sql)
+
+    def register_raw_snapshots(self, ingest=False):
+        """Register raw_<name> (all crawls) and raw_<name>_latest views over data/parquet/<name>."""
+        parquet_root = os.path.join(self.data_dir, "parquet")
+        for name in ("hco", "clinic", "hco_detail"):
+            dataset_dir = os.path.join(parquet_root, name)
+            raw_dir = os.path.join(self.data_dir, name)
+            if ingest and os.path.isdir(raw_dir):
+                # Already converted files are skipped, so this only touches new downloads
+                ingest_folder(raw_dir, dataset_dir)
+            if not _parquet_files(dataset_dir):
+                continue
+
+            pattern = os.path.join(dataset_dir, "**", "*.parquet")
+            view = self.register_view(
+                f"raw_{name}",
+                f"read_parquet({_literal(pattern)}, hive_partitioning = true, "
+                f"hive_types_autocast = false, union_by_name = true)"
+            )
+            self.con.execute(
+                f"CREATE OR REPLACE VIEW {view}_latest AS SELECT * FROM {view} "
+                f"QUALIFY crawl_ts = max(crawl_ts) OVER (PARTITION BY \"group\")"
+            )
+
+    # ---------- queries ----------
+
+    def views(self):
+        """Registered views and tables."""
+        return self.query("SELECT table_name AS name, table_type AS type FROM information_schema.tables "
+                          "ORDER BY table_name")
+
+    def describe(self, name):
+        """Column names and types of a view."""
+        return self.query(f"DESCRIBE {_quote(name)}")
+
+    def query(self, sql, params=None):
+        """
+        Run SQL and return the result as a DataFrame.
+
+        Parameters:
+            sql (str): query over the registered views (named parameters as $name)
+            params (dict): parameter values
+
+        Returns:
+            pd.DataFrame
+        """
+        return self.con.execute(sql, params or {}).df()
+
+    def missing_views(self, summary):
+        """Views a summary query reads that are not registered (no outputs found under data_dir)."""
+        return [view for view in SUMMARY_VIEWS[summary] if view not in self.sources]
+
+    def summary(self, name, **params):
+        """Run one of SUMMARY_QUERIES, e.g. summary("top_hospitals_by_staff", category="종합병원", n=10)."""
+        if name not in SUMMARY_QUERIES:
+            raise KeyError(f"Unknown summary '{name}'. Available: {', '.join(SUMMARY_QUERIES)}")
+        missing = self.missing_views(name)
+        if missing:
+            raise LookupError(f"Summary '{name}' needs view(s) {', '.join(missing)}, "
+                              f"but no matching outputs were found under {self.data_dir}")
+        params = {**SUMMARY_PARAMS.get(name, {}), **params}
+        return self.query(SUMMARY_QUERIES[name], params or None)
+
+    def copy_to(self, sql, output_path, params=None):
+        """
+        Write a query result straight to Parquet or CSV without materializing it in pandas.
+
+        Returns:
+            str output_path
+        """
+        fmt = "PARQUET, COMPRESSION zstd" if output_path.endswith(".parquet") else "CSV, HEADER"
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        start = time.time()
+        self.con.execute(f"COPY ({sql}) TO {_literal(output_path)} (FORMAT {fmt})", params or {})
+        print(f"💾 Saved {output_path} ({time.time() - start:.2f}s)")
+        return output_path
+
+    def close(self):
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# === Notebook summary tables as SQL (hco_data_pipeline.ipynb) ===
+# ROUND_EVEN rounds half to even like pandas .round(), so values match the notebook exactly
+_specialty_avgs = ",\n    ".join(f"ROUND_EVEN(AVG({_quote(c)}), 2) AS {_quote(c)}" for c in SPECIALTY_COLUMNS)
+
+SUMMARY_QUERIES = {
+    # HCO count and share per category
+    "category_share": """
+SELECT d.category_en, h.category AS category_ko, COUNT(*) AS count,
+       ROUND_EVEN(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 2) AS "rate(%)"
+FROM hco_all h LEFT JOIN dim_category d USING (category)
+GROUP BY ALL
+ORDER BY "rate(%)" DESC, count DESC
+""",
+    # HCO count and share per province
+    "province_share": """
+SELECT d.province_en, h.province AS province_ko, COUNT(*) AS count,
+       ROUND_EVEN(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 2) AS "rate(%)"
+FROM hco_all h LEFT JOIN dim_province d USING (province)
+WHERE h.province IS NOT NULL
+GROUP BY ALL
+ORDER BY count DESC
+""",
+    # Clinic count per department (one clinic counts once per department it lists)
+    "clinic_departments": """
+SELECT TRIM(dept) AS department, COUNT(*) AS count
+FROM (SELECT UNNEST(string_split(departments, ',')) AS dept FROM hco_all WHERE departments IS NOT NULL)
+GROUP BY ALL
+ORDER BY count DESC
+""",
+    # Hospital count and mean staff per category
+    "staff_by_category": """
+SELECT d.category_en, COUNT(*) AS num_hospitals,
+       ROUND_EVEN(AVG(num_dentists), 2) AS num_dentists,
+       ROUND_EVEN(AVG(num_doctors), 2) AS num_doctors,
+       ROUND_EVEN(AVG(num_korean_med), 2) AS num_korean_med,
+       ROUND_EVEN(AVG(total_medical_staff), 2) AS total_medical_staff
+FROM hco_detail_merged h LEFT JOIN dim_category d USING (category)
+GROUP BY ALL
+ORDER BY num_hospitals DESC
+""",
+    # Top-n hospitals of one category by total staff
+    "top_hospitals_by_staff": """
+SELECT hospital_name, num_doctors, num_dentists, num_korean_med, total_medical_staff, category
+FROM hco_detail_merged
+WHERE category = $category
+ORDER BY total_medical_staff DESC NULLS LAST, hospital_name
+LIMIT $n
+""",
+    # Tertiary/general hospital counts and mean specialty staff per province
+    "region_specialty": f"""
+SELECT d.province_en, h.province AS province_ko,
+    COUNT(*) FILTER (WHERE category = '종합병원') AS num_general_hospital,
+    COUNT(*) FILTER (WHERE category = '상급종합병원') AS num_tertiary_hospital,
+    {_specialty_avgs}
+FROM hco_detail_merged h LEFT JOIN dim_province d USING (province)
+WHERE h.province IS NOT NULL
+GROUP BY ALL
+HAVING num_general_hospital > 0
+ORDER BY num_general_hospital DESC
+""",
+}
+
+SUMMARY_PARAMS = {
+    "top_hospitals_by_staff": {"category": "상급종합병원", "n": 10},
+}
+
+# Output views each summary reads (registered only when their files exist)
+SUMMARY_VIEWS = {
+    "category_share": ["hco_all"],
+    "province_share": ["hco_all"],
+    "clinic_departments": ["hco_all"],
+    "staff_by_category": ["hco_detail_merged"],
+    "top_hospitals_by_staff": ["hco_detail_merged"],
+    "region_specialty": ["hco_detail_merged"],
+}
@@ -0,0 +1,142 @@
+# utils/response_cache.py
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+
+
+class ResponseCache:
+    """
+    Persistent SQLite cache for HTTP response bodies keyed by an id (e.g., ykiho).
+
+    Bodies are stored content-addressed (sha256), so identical pages share one row.
+    Entries expire after a TTL, keep ETag/Last-Modified for conditional revalidation,
+    and the least recently used entries are evicted once max_entries is exceeded.
+    """
+
+    def __init__(self, path: str, ttl: int = 7 * 24 * 3600, max_entries: int = 10000):
+        """
+        Initialize the cache.
+
+        Parameters:
+            path (str): SQLite database file
+            ttl (int): seconds an entry is served without revalidation
+            max_entries (int): max number of keys kept (LRU eviction beyond this)
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {"hit": 0, "miss": 0, "revalidated": 0, "evicted": 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS bodies (
+                digest TEXT PRIMARY KEY,
+                body TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at);
+        """)
+        self._conn.commit()
+
+    def record(self, stat: str):
+        """Increment a hit/miss/revalidated counter."""
+        with self._lock:
+            self.stats[stat] += 1
+
+    def get(self, key: str):
+        """
+        Look up a cached response.
+
+        Returns:
+            dict with body, etag, last_modified and fresh (bool), or None if absent.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT b.body, e.etag, e.last_modified, e.fetched_at "
+                "FROM entries e JOIN bodies b ON b.digest = e.digest WHERE e.key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+        body, etag, last_modified, fetched_at = row
+        return {
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": now - fetched_at < self.ttl
+        }
+
+    def put(self, key: str, body: str, etag: str = None, last_modified: str = None):
+        """Store a response body and its validators, then evict if over capacity."""
+        now = time.time()
+        digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+        with self._lock:
+            old = self._conn.execute("SELECT digest FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute("INSERT OR IGNORE INTO bodies (digest, body) VALUES (?, ?)", (digest, body))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, digest, etag, last_modified, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, digest, etag, last_modified, now, now)
+            )
+            # Drop the previous body if the page changed and nothing else references it
+            if old and old[0] != digest:
+                self._conn.execute(
+                    "DELETE FROM bodies WHERE digest = ? AND NOT EXISTS "
+                    "(SELECT 1 FROM entries WHERE digest = ?)",
+                    (old[0], old[0])
+                )
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, key: str):
+        """Mark an entry as freshly validated (e.g., after HTTP 304)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries beyond max_entries and unreferenced bodies."""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+
+        self._conn.execute(
+            "DELETE FROM entries WHERE key IN "
+            "(SELECT key FROM entries ORDER BY accessed_at ASC LIMIT ?)",
+            (overflow,)
+        )
+        self._conn.execute("DELETE FROM bodies WHERE digest NOT IN (SELECT digest FROM entries)")
+        self.stats["evicted"] += overflow
+
+    def report(self):
+        """Print hit/miss counters for the current run."""
+        total = self.stats["hit"] + self.stats["miss"] + self.stats["revalidated"]
+        rate = (self.stats["hit"] + self.stats["revalidated"]) / total * 100 if total else 0
+        print(
+            f"🗃️ Cache: {self.stats['hit']} hit, {self.stats['revalidated']} revalidated, "
+            f"{self.stats['miss']} miss, {self.stats['evicted']} evicted ({rate:.1f}% served from cache)"
+        )
+
+    def close(self):
+        """Close the SQLite connection."""
+        with self._lock:
+            self._conn.close()
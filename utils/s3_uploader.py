@@ -0,0 +1,175 @@
+# utils/s3_uploader.py
+
+import os
+import json
+import time
+import glob
+import hashlib
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+MB = 1024 ** 2
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+# One pooled S3 client per endpoint for the whole process (boto3 clients are thread-safe)
+# endpoint_url points at a local S3 stand-in (moto server, MinIO); AWS_ENDPOINT_URL also works
+def get_s3_client(endpoint_url=None, max_pool_connections=32):
+    with _clients_lock:
+        if endpoint_url not in _clients:
+            _clients[endpoint_url] = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url,
+                config=Config(max_pool_connections=max_pool_connections, retries={"mode": "adaptive"}),
+            )
+        return _clients[endpoint_url]
+
+
+def local_etag(path, multipart_threshold=16 * MB, multipart_chunksize=16 * MB):
+    """
+    ETag S3 will report for this file when uploaded with the given transfer settings.
+
+    Single-part uploads get the plain MD5; multipart uploads get the MD5 of the
+    concatenated part MD5s followed by '-<part count>'.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        if size < multipart_threshold:
+            digest = hashlib.md5()
+            for chunk in iter(lambda: f.read(MB), b""):
+                digest.update(chunk)
+            return digest.hexdigest()
+
+        part_digests = [hashlib.md5(part).digest() for part in iter(lambda: f.read(multipart_chunksize), b"")]
+    return f"{hashlib.md5(b''.join(part_digests)).hexdigest()}-{len(part_digests)}"
+
+
+class S3BulkUploader:
+    """
+    Concurrent, checksummed uploader for pipeline outputs.
+
+    Files run in parallel on one pooled client; large files are split into tuned
+    multipart chunks, and objects whose ETag already matches the local file are skipped.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        max_workers: int = 8,
+        multipart_threshold: int = 16 * MB,
+        multipart_chunksize: int = 16 * MB,
+        part_concurrency: int = 4,
+        endpoint_url: str = None
+    ):
+        """
+        Parameters:
+            bucket (str): target bucket
+            prefix (str): key prefix (e.g., 'final_dataset')
+            max_workers (int): files uploaded at the same time
+            multipart_threshold (int): files at least this large use multipart upload
+            multipart_chunksize (int): multipart part size in bytes
+            part_concurrency (int): parts uploaded in parallel per file
+            endpoint_url (str): custom S3 endpoint (moto server / MinIO for offline runs)
+        """
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.max_workers = max(1, max_workers)
+        self.multipart_threshold = multipart_threshold
+        self.multipart_chunksize = multipart_chunksize
+        self.client = get_s3_client(endpoint_url, max_pool_connections=self.max_workers * part_concurrency)
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunksize,
+            max_concurrency=part_concurrency,
+            use_threads=True,
+        )
+
+    def object_key(self, relative_path):
+        key = relative_path.replace(os.sep, "/")
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def remote_etag(self, key):
+        """ETag of an existing object, or None if it does not exist."""
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)["ETag"].strip('"')
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def upload_file(self, path, key, skip_unchanged=True):
+        """
+        Upload one file unless an identical object already exists.
+
+        Returns:
+            dict with file, key, bytes, status ('uploaded', 'skipped', 'failed'), etag, seconds, error
+        """
+        record = {"file": path, "key": key, "bytes": os.path.getsize(path), "status": None,
+                  "etag": None, "seconds": 0.0, "error": None}
+        start = time.time()
+        try:
+            etag = local_etag(path, self.multipart_threshold, self.multipart_chunksize)
+            record["etag"] = etag
+            if skip_unchanged and self.remote_etag(key) == etag:
+                record["status"] = "skipped"
+            else:
+                self.client.upload_file(path, self.bucket, key, Config=self.transfer_config)
+                record["status"] = "uploaded"
+        except Exception as e:
+            record["status"] = "failed"
+            record["error"] = f"{type(e).__name__}: {e}"
+        record["seconds"] = round(time.time() - start, 3)
+        return record
+
+    def upload_directory(self, local_dir, pattern="**/*", skip_unchanged=True, manifest_path=None):
+        """
+        Upload every file under local_dir concurrently.
+
+        Parameters:
+            local_dir (str): folder to upload (e.g., data/final_dataset)
+            pattern (str): glob relative to local_dir
+            skip_unchanged (bool): skip files whose ETag matches the existing object
+            manifest_path (str): also write the manifest as JSON here
+
+        Returns:
+            dict manifest with per-file records and totals (bytes, seconds, throughput)
+        """
+        paths = sorted(p for p in glob.glob(os.path.join(local_dir, pattern), recursive=True) if os.path.isfile(p))
+        jobs = [(p, self.object_key(os.path.relpath(p, local_dir))) for p in paths]
+        print(f"☁️ Uploading {len(jobs)} file(s) to s3://{self.bucket}/{self.prefix}")
+
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            files = list(executor.map(lambda job: self.upload_file(*job, skip_unchanged=skip_unchanged), jobs))
+        seconds = round(time.time() - start, 3)
+
+        uploaded_bytes = sum(f["bytes"] for f in files if f["status"] == "uploaded")
+        manifest = {
+            "bucket": self.bucket,
+            "prefix": self.prefix,
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "uploaded": sum(f["status"] == "uploaded" for f in files),
+            "skipped": sum(f["status"] == "skipped" for f in files),
+            "failed": sum(f["status"] == "failed" for f in files),
+            "bytes_uploaded": uploaded_bytes,
+            "seconds": seconds,
+            "throughput_mb_s": round(uploaded_bytes / MB / seconds, 2) if seconds else None,
+            "files": files,
+        }
+        print(f"✅ {manifest['uploaded']} uploaded, {manifest['skipped']} unchanged, {manifest['failed']} failed"
+              f" ({uploaded_bytes / MB:.1f} MB in {seconds:.1f}s)")
+
+        if manifest_path:
+            os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+            with open(manifest_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+        return manifest
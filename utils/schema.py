@@ -0,0 +1,113 @@
+# utils/schema.py
+
+import numpy as np
+import pandas as pd
+
+from config.mapping_info import column_mapping
+from config.schema_info import (
+    category_columns,
+    string_columns,
+    count_columns,
+    phone_columns,
+    postal_code_columns,
+)
+
+try:
+    import pyarrow  # noqa: F401
+    COMPACT_STRING = "string[pyarrow]"
+except ImportError:
+    COMPACT_STRING = "string"
+
+
+# Smallest integer dtype for a count column (nullable when it has missing values)
+def _downcast_counts(series):
+    values = pd.to_numeric(series, errors="coerce")
+    has_na = values.isna().any()
+    if not has_na and (values % 1 == 0).all():
+        return pd.to_numeric(values, downcast="unsigned" if (values >= 0).all() else "integer")
+
+    if ((values.dropna() % 1) != 0).any():
+        return pd.to_numeric(values, downcast="float")
+
+    low, high = values.min(), values.max()
+    for dtype, info in (("Int8", np.iinfo(np.int8)), ("Int16", np.iinfo(np.int16)), ("Int32", np.iinfo(np.int32))):
+        if pd.isna(low) or (low >= info.min and high <= info.max):
+            return values.astype(dtype)
+    return values.astype("Int64")
+
+
+# Keep digits only (e.g., "051-760-0600" → "0517600600")
+def _normalize_phone(series):
+    return series.astype(COMPACT_STRING).str.replace(r"\D", "", regex=True).replace("", pd.NA)
+
+
+# Zero-padded 5-digit postal code (e.g., 6000 / "6000.0" → "06000")
+def _normalize_postal_code(series):
+    codes = series.astype(COMPACT_STRING).str.replace(r"\.0$", "", regex=True).str.strip()
+    return codes.where(~codes.str.fullmatch(r"\d{1,5}").fillna(False), codes.str.zfill(5))
+
+
+def apply_schema(df, inplace=False):
+    """
+    Cast known columns to compact dtypes declared in config/schema_info.py.
+
+    Columns are matched by English name or by their raw Korean name via column_mapping;
+    unknown columns are left unchanged.
+
+    Identifier columns are normalized, not only cast, so the same number compares
+    equal across files: phone keeps digits only ("051-760-0600" → "0517600600") and
+    postal_code becomes a zero-padded 5-digit string (6000 / "6000.0" → "06000").
+    Pass optimize_dtypes=False to the loaders to keep the values as downloaded.
+
+    Parameters:
+    - df (pd.DataFrame): table to convert
+    - inplace (bool): modify df instead of a copy
+
+    Returns:
+    - pd.DataFrame with category/int/compact-string dtypes
+    """
+    if not inplace:
+        df = df.copy()
+
+    for col in df.columns:
+        name = column_mapping.get(col, col)
+        if name in category_columns:
+            df[col] = df[col].astype("category")
+        elif name in count_columns:
+            df[col] = _downcast_counts(df[col])
+        elif name in phone_columns:
+            df[col] = _normalize_phone(df[col])
+        elif name in postal_code_columns:
+            df[col] = _normalize_postal_code(df[col])
+        elif name in string_columns:
+            df[col] = df[col].astype(COMPACT_STRING)
+    return df
+
+
+def memory_usage_report(df, baseline=None):
+    """
+    Per-column memory usage (deep), optionally compared with a baseline frame.
+
+    Parameters:
+    - df (pd.DataFrame): table to measure
+    - baseline (pd.DataFrame or None): e.g., the same table before apply_schema
+
+    Returns:
+    - pd.DataFrame with dtype and MB per column (plus baseline MB and ratio if given)
+    """
+    report = pd.DataFrame({
+        "dtype": df.dtypes.astype(str),
+        "mb": df.memory_usage(deep=True, index=False) / 1024 ** 2,
+    })
+    if baseline is not None:
+        report["baseline_dtype"] = baseline.dtypes.astype(str).reindex(report.index)
+        report["baseline_mb"] = (baseline.memory_usage(deep=True, index=False) / 1024 ** 2).reindex(report.index)
+        report["ratio"] = report["baseline_mb"] / report["mb"]
+
+    total = report["mb"].sum()
+    if baseline is not None:
+        base_total = report["baseline_mb"].sum()
+        print(f"🧮 Memory: {base_total:.1f} MB → {total:.1f} MB ({base_total / total:.1f}x smaller)")
+    else:
+        print(f"🧮 Memory: {total:.1f} MB")
+    return report.round(3)
@@ -1,14 +1,29 @@
 import os
 import time
 import glob
+import queue
+import atexit
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoAlertPresentException, TimeoutException
+from selenium.common.exceptions import NoAlertPresentException, TimeoutException, WebDriverException
+
+try:
+    import psutil
+except ImportError:  # memory is then read from /proc (Linux only)
+    psutil = None
+
+# Requests the search form and export link never need: images (incl. map tiles) and web fonts
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+]
 
 # Navigate to the URL and click the hospital search tab (left panel second menu)
 def open_url_and_prepare(driver, url):
@@ -17,6 +32,14 @@ def open_url_and_prepare(driver, url):
     check_and_click(driver, '//a[@id="viewTab2"]')  # Clicks the 'Hospital/Pharmacy Search' tab
     time.sleep(1)
 
+# Open the search panel (left panel second menu) and wait until the category list is rendered
+def open_search_panel(driver, url, timeout=10, reload=True):
+    if reload:
+        driver.get(url)
+    if not check_and_click(driver, '//a[@id="viewTab2"]', timeout=timeout):
+        raise TimeoutException("Search panel tab (viewTab2) not clickable")
+    WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.ID, "hospType")))
+
 # Click an element using XPath if it's clickable, within a given timeout
 def check_and_click(driver, xpath, timeout=10):
     try:
@@ -33,3 +56,378 @@ def wait_for_download(download_dir, timeout=30):
             return True
         time.sleep(1)
     return False
+
+
+# Snapshot of the download folder taken right before a download is requested
+# (finished .xls* files and any .crdownload partials, incl. stale ones from earlier runs)
+def snapshot_downloads(download_dir):
+    return set(glob.glob(os.path.join(download_dir, "*.xls*"))) | set(glob.glob(os.path.join(download_dir, "*.crdownload")))
+
+
+# Wait for a new, fully written Excel file to appear in the download folder
+def wait_for_new_download(download_dir, before_files, timeout=60, poll_interval=0.2, max_interval=2.0):
+    """
+    Poll the download folder (with backoff) until a new .xls* file is complete.
+
+    A file counts as complete when no .crdownload partial created after the snapshot
+    is pending and its size is non-zero and unchanged between two consecutive polls.
+    Partials already in before_files (e.g., left over from a crashed run) are ignored.
+
+    Parameters:
+        download_dir (str): folder Chrome downloads into
+        before_files (set): paths present before the download was requested (snapshot_downloads())
+        timeout (float): max seconds to wait
+        poll_interval (float): initial polling interval in seconds
+        max_interval (float): upper bound for the polling interval
+
+    Returns:
+        Path of the new file, or None on timeout.
+    """
+    deadline = time.monotonic() + timeout
+    before_files = set(before_files)
+    last_sizes = {}
+
+    while time.monotonic() < deadline:
+        partials = set(glob.glob(os.path.join(download_dir, "*.crdownload"))) - before_files
+        # "*.xls*" also matches "report.xlsx.crdownload"
+        new_files = {
+            p for p in glob.glob(os.path.join(download_dir, "*.xls*"))
+            if not p.endswith(".crdownload")
+        } - before_files
+
+        if new_files and not partials:
+            sizes = {}
+            for path in new_files:
+                try:
+                    sizes[path] = os.path.getsize(path)
+                except OSError:
+                    continue
+            stable = [p for p, size in sizes.items() if size > 0 and last_sizes.get(p) == size]
+            if stable:
+                return max(stable, key=os.path.getctime)
+            last_sizes = sizes
+
+        time.sleep(poll_interval)
+        poll_interval = min(poll_interval * 1.5, max_interval)
+
+    return None
+
+
+# Print per-item download latency measured from click to completed file
+def report_latency(download_latencies):
+    if not download_latencies:
+        return
+    print("\n⏱️ Download latency per item:")
+    for name, elapsed in download_latencies:
+        print(f" - {name}: {elapsed:.1f}s")
+    total = sum(elapsed for _, elapsed in download_latencies)
+    print(f"⏱️ Total wait: {total:.1f}s (avg {total / len(download_latencies):.1f}s)")
+
+
+# Split download targets into (remaining, restored) using a checkpoint journal
+def resume_downloads(journal, targets, downloaded_file_paths, renamed_file_paths):
+    """
+    Skip targets whose file was already downloaded (or renamed) in an interrupted run.
+
+    Restored files are appended to downloaded_file_paths / renamed_file_paths so the
+    rename and log steps treat them like fresh downloads.
+
+    Returns:
+        List of (id, name) targets that still need downloading.
+    """
+    if journal is None:
+        return list(targets)
+
+    remaining = []
+    for target_id, target_name in targets:
+        renamed = journal.get("renamed", target_name)
+        downloaded = journal.get("downloaded", target_name)
+        if renamed and os.path.exists(renamed["file"]):
+            renamed_file_paths.append((renamed["file"], target_name))
+            print(f"⏭️ Already done: {target_name}")
+        elif downloaded and os.path.exists(downloaded["file"]):
+            downloaded_file_paths.append((downloaded["file"], target_name))
+            print(f"⏭️ Already downloaded: {target_name}")
+        else:
+            remaining.append((target_id, target_name))
+    return remaining
+
+
+# Add the lean profile to Chrome options: new headless mode, small window, no GPU/images
+def lean_chrome_options(options, headless=True):
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--window-size=1280,800")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--mute-audio")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    return options
+
+
+# Block images, map tiles and fonts for this driver through CDP request interception
+def enable_resource_blocking(driver, patterns=BLOCKED_URL_PATTERNS):
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+
+
+def _process_tree_rss_mb(pid):
+    """RSS of a process and all its children in MB (None if it cannot be read)."""
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            procs = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in procs) / 1024 ** 2
+        except psutil.Error:
+            return None
+
+    if not os.path.isdir("/proc"):
+        return None
+    children = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+                children.setdefault(ppid, []).append(int(entry))
+            except (OSError, IndexError, ValueError):
+                continue
+    total_kb, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, []))
+        try:
+            with open(f"/proc/{current}/status") as f:
+                total_kb += next((int(line.split()[1]) for line in f if line.startswith("VmRSS:")), 0)
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+# Memory of one driver: chromedriver plus every Chrome process it started
+def driver_memory_mb(driver):
+    try:
+        return _process_tree_rss_mb(driver.service.process.pid)
+    except AttributeError:
+        return None
+
+
+def profile_driver(driver, url, timeout=15):
+    """
+    Open the search panel and measure page-ready time and driver memory.
+
+    Returns:
+        dict with page_ready_s and memory_mb (None if memory cannot be read)
+    """
+    start = time.monotonic()
+    open_search_panel(driver, url, timeout=timeout)
+    profile = {
+        "page_ready_s": round(time.monotonic() - start, 2),
+        "memory_mb": driver_memory_mb(driver),
+    }
+    memory = f"{profile['memory_mb']:.0f} MB" if profile["memory_mb"] is not None else "n/a"
+    print(f"🪶 Search panel ready in {profile['page_ready_s']:.2f}s (driver memory: {memory})")
+    return profile
+
+
+class BrowserPool:
+    """
+    Process-wide pool of pre-warmed Chrome drivers parked on the search panel.
+
+    Drivers are started (and warmed) in the background, health-checked when handed
+    out and recycled after max_uses or when broken, so startup and page-load cost is
+    paid once per driver instead of once per scraper or retry.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        size: int = 2,
+        headless: bool = True,
+        max_uses: int = 50,
+        timeout: int = 15,
+        lean: bool = True
+    ):
+        """
+        Parameters:
+            url (str): HIRA map URL the drivers are warmed on
+            size (int): number of drivers kept warm
+            headless (bool): start drivers with --headless=new
+            max_uses (int): recycle a driver after this many acquisitions
+            timeout (int): seconds to wait for the search panel while warming
+            lean (bool): start drivers with the lean profile and resource blocking
+        """
+        self.url = url
+        self.size = max(1, size)
+        self.headless = headless
+        self.max_uses = max_uses
+        self.timeout = timeout
+        self.lean = lean
+        self.profiles = []
+
+        self._idle = queue.Queue()
+        self._uses = {}
+        self._checked_out = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.size)
+        for _ in range(self.size):
+            self._executor.submit(self._spawn)
+
+    def _new_driver(self):
+        options = Options()
+        options.add_experimental_option("prefs", {
+            "download.prompt_for_download": False,
+            "download.directory_upgrade": True,
+            "profile.default_content_setting_values.automatic_downloads": 1,
+        })
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        if self.lean:
+            options = lean_chrome_options(options, headless=self.headless)
+        else:
+            options.add_argument("--window-size=1600,1000")
+            if self.headless:
+                options.add_argument("--headless=new")
+        driver = webdriver.Chrome(options=options)
+        if self.lean:
+            enable_resource_blocking(driver)
+        return driver
+
+    def _spawn(self):
+        """Start one driver, warm it on the search panel and park it as idle."""
+        try:
+            driver = self._new_driver()
+            profile = profile_driver(driver, self.url, timeout=self.timeout)
+        except Exception as e:
+            print(f"⚠️ Browser warm-up failed: {e}")
+            return
+        with self._lock:
+            self._uses[id(driver)] = 0
+            self.profiles.append(profile)
+        self._idle.put(driver)
+
+    def is_healthy(self, driver):
+        """True if the browser responds and the search panel is loaded."""
+        try:
+            return bool(driver.execute_script(
+                'return document.readyState === "complete" && !!document.getElementById("hospType");'))
+        except WebDriverException:
+            return False
+
+    def _discard(self, driver):
+        """Quit a driver and start a replacement in the background."""
+        with self._lock:
+            tracked = self._uses.pop(id(driver), None) is not None
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+        if not tracked:  # already replaced (or not ours): keep the pool at its size
+            return
+        try:
+            self._executor.submit(self._spawn)
+        except RuntimeError:  # pool already closed
+            pass
+
+    def acquire(self, download_dir: str = None, timeout: float = 120):
+        """
+        Hand out a warm, healthy driver (waits for one to finish warming if needed).
+
+        Parameters:
+            download_dir (str): folder Chrome should save downloads into
+            timeout (float): max seconds to wait for a warm driver
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("No warm browser available")
+            try:
+                driver = self._idle.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError("No warm browser available")
+            if not self.is_healthy(driver):
+                self._discard(driver)
+                continue
+            with self._lock:
+                self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+                self._checked_out.add(id(driver))
+            if download_dir:
+                driver.execute_cdp_cmd("Page.setDownloadBehavior", {"behavior": "allow", "downloadPath": download_dir})
+            return driver
+
+    def recover(self, driver, download_dir: str = None):
+        """
+        Bring a driver back to the search panel after a failure.
+
+        A responsive driver is only reloaded (no fixed sleeps); a dead one is
+        replaced with a warm driver from the pool.
+        """
+        try:
+            open_search_panel(driver, self.url, timeout=self.timeout)
+            return driver
+        except Exception:
+            with self._lock:
+                self._checked_out.discard(id(driver))
+            self._discard(driver)
+            return self.acquire(download_dir)
+
+    def release(self, driver):
+        """Return a driver to the pool (recycled if worn out or unhealthy)."""
+        with self._lock:
+            if id(driver) not in self._checked_out:  # released twice or not handed out by this pool
+                return
+            self._checked_out.discard(id(driver))
+            uses = self._uses.get(id(driver), self.max_uses)
+        if uses >= self.max_uses:
+            self._discard(driver)
+            return
+        try:
+            open_search_panel(driver, self.url, timeout=self.timeout)
+        except Exception:
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    def report(self):
+        """Print average page-ready time and memory of the drivers warmed so far."""
+        if not self.profiles:
+            return
+        ready = [p["page_ready_s"] for p in self.profiles]
+        memory = [p["memory_mb"] for p in self.profiles if p["memory_mb"] is not None]
+        print(f"🪶 {len(self.profiles)} driver(s) warmed: avg page-ready {sum(ready) / len(ready):.2f}s"
+              + (f", avg memory {sum(memory) / len(memory):.0f} MB" if memory else ""))
+
+    def close(self):
+        """Quit every idle driver and stop warming new ones."""
+        self._executor.shutdown(wait=True)
+        while not self._idle.empty():
+            try:
+                self._idle.get_nowait().quit()
+            except WebDriverException:
+                pass
+        self.report()
+        print("🧹 Browser pool closed")
+
+
+_shared_pools = {}
+_shared_pools_lock = threading.Lock()
+
+
+# One BrowserPool per (url, headless) for the whole process
+def get_browser_pool(url, size=2, headless=True, **kwargs):
+    with _shared_pools_lock:
+        key = (url, headless)
+        if key not in _shared_pools:
+            _shared_pools[key] = BrowserPool(url, size=size, headless=headless, **kwargs)
+        return _shared_pools[key]
+
+
+# Close every shared pool (registered to run at interpreter exit)
+@atexit.register
+def close_browser_pools():
+    with _shared_pools_lock:
+        pools = list(_shared_pools.values())
+        _shared_pools.clear()
+    for pool in pools:
+        pool.close()
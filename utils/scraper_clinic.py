@@ -2,7 +2,6 @@
 
 import os
 import time
-import glob
 from datetime import datetime
 
 from selenium import webdriver
@@ -12,7 +11,11 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoAlertPresentException, TimeoutException
 
-from utils.scraper_base import open_url_and_prepare, check_and_click
+from utils.scraper_base import (
+    open_url_and_prepare, check_and_click, wait_for_new_download, resume_downloads, open_search_panel,
+    lean_chrome_options, enable_resource_blocking, profile_driver, snapshot_downloads, report_latency
+)
+from utils.checkpoint import CheckpointJournal
 
 class ClinicScraper:
     """
@@ -24,7 +27,12 @@ class ClinicScraper:
         url: str,
         download_dir: str,
         log_dir: str,
-        file_naming_rule: str = "clinic_{dept}_auto_{timestamp}{ext}"
+        file_naming_rule: str = "clinic_{dept}_auto_{timestamp}{ext}",
+        download_timeout: int = 60,
+        headless: bool = False,
+        checkpoint_path: str = None,
+        browser_pool=None,
+        lean: bool = False
     ):
         """
         Initialize the clinic scraper.
@@ -34,15 +42,34 @@ class ClinicScraper:
             download_dir (str): Directory to save downloaded files
             log_dir (str): Directory to save logs
             file_naming_rule (str): Pattern to rename downloaded files
+            download_timeout (int): Max seconds to wait for each Excel download
+            headless (bool): Run Chrome without a visible window
+            checkpoint_path (str): JSONL journal of finished downloads; an interrupted run
+                restarted with the same journal skips them (no checkpointing if None)
+            browser_pool (BrowserPool): Shared pool of warm drivers to borrow from
+                instead of starting a new Chrome (see utils/scraper_base.py)
+            lean (bool): Lean profile (small window, no GPU) with images, map
+                tiles and fonts blocked; reports page-ready time and driver memory
         """
         self.url = url
         self.download_dir = download_dir
         self.log_dir = log_dir
         self.file_naming_rule = file_naming_rule
+        self.download_timeout = download_timeout
+        self.headless = headless
+        self.browser_pool = browser_pool
+        self.lean = lean
+        self.driver_profile = None
 
         self.date_info = datetime.now().strftime("%Y%m%d_%H%M")
         self.failed_ids = []
         self.downloaded_file_paths = []
+        self.download_latencies = []
+        self.renamed_file_paths = []
+
+        self.journal = CheckpointJournal(checkpoint_path) if checkpoint_path else None
+        if self.journal is not None:
+            self.date_info = self.journal.resume_run_id(self.date_info)
 
         os.makedirs(self.download_dir, exist_ok=True)
         os.makedirs(self.log_dir, exist_ok=True)
@@ -51,6 +78,8 @@ class ClinicScraper:
 
     def _init_driver(self):
         """Initialize Selenium Chrome WebDriver."""
+        if self.browser_pool is not None:
+            return self.browser_pool.acquire(download_dir=self.download_dir)
         options = Options()
         prefs = {
             "download.default_directory": self.download_dir,
@@ -61,18 +90,31 @@ class ClinicScraper:
             "profile.default_content_settings.popups": 0,
         }
         options.add_experimental_option("prefs", prefs)
-        options.add_argument("--start-maximized")
+        if self.lean:
+            options = lean_chrome_options(options, headless=self.headless)
+        else:
+            options.add_argument("--start-maximized")
+            if self.headless:
+                options.add_argument("--headless=new")
         options.add_argument("--disable-blink-features=AutomationControlled")
-        return webdriver.Chrome(options=options)
+        driver = webdriver.Chrome(options=options)
+        if self.lean:
+            enable_resource_blocking(driver)
+        return driver
 
     def get_departments(self):
         """Fetch all department ids and names for clinics."""
-        self.driver.get(self.url)
-        WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.ID, "hospType")))
+        if self.browser_pool is not None:
+            open_search_panel(self.driver, self.url, reload=False)  # pooled drivers are already warm
+        elif self.lean:
+            self.driver_profile = profile_driver(self.driver, self.url)
+        else:
+            self.driver.get(self.url)
+            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.ID, "hospType")))
 
-        tab_button = self.driver.find_element(By.ID, "viewTab2")
-        tab_button.click()
-        time.sleep(1)
+            tab_button = self.driver.find_element(By.ID, "viewTab2")
+            tab_button.click()
+            time.sleep(1)
 
         clinic_label = self.driver.find_element(By.XPATH, '//label[text()="건강의원"]')
         clinic_id = clinic_label.get_attribute("for")
@@ -89,9 +131,23 @@ class ClinicScraper:
             if label.text.strip() and label.text.strip() != "전체선택"
         ]
 
-    def download_all(self):
-        """Download clinic files by department."""
+    def get_targets(self):
+        """Return the (id, name) download targets; used by ScraperPool to shard work."""
+        return self.get_departments()
+
+    def download_all(self, targets: list = None):
+        """
+        Download clinic files by department.
+
+        Parameters:
+            targets (list): department names to download (all departments if None)
+        """
         departments = self.get_departments()
+        if targets is not None:
+            departments = [(did, dname) for did, dname in departments if dname in targets]
+
+        departments = resume_downloads(
+            self.journal, departments, self.downloaded_file_paths, self.renamed_file_paths)
 
         for idx, (dept_id, dept_name) in enumerate(departments):
             retry_attempted = False
@@ -123,21 +179,22 @@ class ClinicScraper:
                     except NoAlertPresentException:
                         pass
 
-                    before_files = set(glob.glob(os.path.join(self.download_dir, "*.xls*")))
+                    before_files = snapshot_downloads(self.download_dir)
                     download_button = self.driver.find_element(By.XPATH, '//a[contains(@class,"excelDown")]')
                     self.driver.execute_script("arguments[0].click();", download_button)
                     print(f"🚀 Download requested: 의원 - {dept_name}")
-                    time.sleep(35)
+                    requested_at = time.time()
 
-                    after_files = set(glob.glob(os.path.join(self.download_dir, "*.xls*")))
-                    new_files = after_files - before_files
+                    new_file = wait_for_new_download(self.download_dir, before_files, timeout=self.download_timeout)
+                    elapsed = time.time() - requested_at
 
-                    if new_files:
-                        new_file = max(new_files, key=os.path.getctime)
+                    if new_file:
                         self.downloaded_file_paths.append((new_file, dept_name))
-                        print(f"✅ Downloaded: 의원 - {dept_name}")
+                        self._checkpoint("downloaded", dept_name, new_file)
+                        self.download_latencies.append((dept_name, round(elapsed, 1)))
+                        print(f"✅ Downloaded: 의원 - {dept_name} ({elapsed:.1f}s)")
                     else:
-                        raise Exception("No new file detected")
+                        raise Exception(f"No new file detected within {self.download_timeout}s")
 
                     break
 
@@ -145,8 +202,7 @@ class ClinicScraper:
                     reason = f"Exception: {str(e)}"
                     if not retry_attempted:
                         print(f"🔄 Retry: {reason}")
-                        self.driver.get(self.url)
-                        WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.ID, "hospType")))
+                        self._recover()
                         retry_attempted = True
                     else:
                         print(f"❌ Failed: 의원 - {dept_name}")
@@ -163,10 +219,42 @@ class ClinicScraper:
 
             try:
                 os.rename(file_path, new_path)
+                self.renamed_file_paths.append((new_path, dept_name))
+                self._checkpoint("renamed", dept_name, new_path)
                 print(f"✅ Renamed: {os.path.basename(file_path)} → {new_name}")
             except Exception as e:
                 self.failed_ids.append(("", dept_name, f"Rename failed: {str(e)}"))
 
+    def _recover(self):
+        """Bring the browser back to the search panel after a failed attempt."""
+        if self.browser_pool is not None:
+            self.driver = self.browser_pool.recover(self.driver, self.download_dir)
+        else:
+            self.driver.get(self.url)
+            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.ID, "hospType")))
+
+    def close_driver(self):
+        """Quit the browser, or hand it back to the shared browser pool."""
+        if self.browser_pool is not None:
+            self.browser_pool.release(self.driver)
+        else:
+            self.driver.quit()
+
+    def _checkpoint(self, kind, name, file_path):
+        """Record a finished download/rename in the checkpoint journal (if enabled)."""
+        if self.journal is not None:
+            self.journal.mark_done(kind, name, file=file_path)
+
+    def finish_checkpoint(self):
+        """Delete the journal after a clean run; keep it when items failed so a rerun retries them."""
+        if self.journal is None:
+            return
+        if self.failed_ids:
+            self.journal.close()
+            print(f"♻️ Checkpoint kept for retry: {self.journal.path}")
+        else:
+            self.journal.finish()
+
     def save_log(self):
         """Save log of failed downloads."""
         if self.failed_ids:
@@ -184,5 +272,7 @@ class ClinicScraper:
         """Run the full clinic scraping workflow."""
         self.download_all()
         self.rename_files()
+        report_latency(self.download_latencies)
         self.save_log()
-        self.driver.quit()
+        self.finish_checkpoint()
+        self.close_driver()
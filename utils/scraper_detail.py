@@ -4,19 +4,37 @@ import os
 import time
 import re
 import glob
-import requests
 import pandas as pd
 from datetime import datetime
-from bs4 import BeautifulSoup
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoAlertPresentException
+from selenium.common.exceptions import NoAlertPresentException, TimeoutException
+
+from utils.scraper_base import (
+    check_and_click, open_search_panel, lean_chrome_options, enable_resource_blocking, profile_driver
+)
+from utils.detail_fetcher import DetailFetcher
+from utils.response_cache import ResponseCache
+from utils.checkpoint import CheckpointJournal
+
+# Scroll the last result into view and return (name, ykiho) for results from index arguments[0] on
+COLLECT_RESULTS_JS = """
+const tags = document.querySelectorAll("ul.mapResult li a.tit");
+if (tags.length) tags[tags.length - 1].scrollIntoView(true);
+const out = [];
+for (let i = arguments[0]; i < tags.length; i++) {
+    const match = (tags[i].getAttribute("onclick") || "").match(/"(JDQ4[^"]+)"/);
+    out.push([tags[i].textContent.trim(), match ? match[1] : null]);
+}
+return out;
+"""
+
+COUNT_RESULTS_JS = 'return document.querySelectorAll("ul.mapResult li a.tit").length;'
 
-from utils.scraper_base import check_and_click
 
 class HospitalDetailScraper:
     """
@@ -28,7 +46,14 @@ class HospitalDetailScraper:
         url: str,
         save_dir: str,
         target_categories: list = None,
-        file_naming_rule: str = "hco_info_{category}_{timestamp}.csv"
+        file_naming_rule: str = "hco_info_{category}_{timestamp}.csv",
+        max_workers: int = 8,
+        requests_per_second: float = 5.0,
+        cache_path: str = None,
+        cache_ttl: int = 7 * 24 * 3600,
+        checkpoint_path: str = None,
+        browser_pool=None,
+        lean: bool = False
     ):
         """
         Initialize the hospital detail scraper.
@@ -38,34 +63,109 @@ class HospitalDetailScraper:
             save_dir (str): Directory to save the CSV output
             target_categories (list): Hospital categories to include (e.g., ["상급종합병원", "종합병원"])
             file_naming_rule (str): Naming format for output CSV
+            max_workers (int): Number of concurrent detail requests
+            requests_per_second (float): Rate limit for detail requests to the HIRA host
+            cache_path (str): SQLite file for the detail response cache (no caching if None)
+            cache_ttl (int): Seconds before a cached detail page is revalidated
+            checkpoint_path (str): JSONL journal of fetched ykihos and saved categories; an
+                interrupted run restarted with the same journal skips them (none if None)
+            browser_pool (BrowserPool): Shared pool of warm drivers to borrow from
+                instead of starting a new Chrome (see utils/scraper_base.py)
+            lean (bool): Lean headless profile (small window, no GPU) with images, map
+                tiles and fonts blocked; reports page-ready time and driver memory
         """
         self.url = url
         self.save_dir = save_dir
         self.target_categories = target_categories or ["상급종합병원", "종합병원"]
         self.file_naming_rule = file_naming_rule
+        self.browser_pool = browser_pool
+        self.lean = lean
+        self.driver_profile = None
 
         self.date_info = datetime.now().strftime("%Y%m%d_%H%M")
         os.makedirs(self.save_dir, exist_ok=True)
 
+        self.failed_categories = []
+        self.journal = CheckpointJournal(checkpoint_path) if checkpoint_path else None
+        if self.journal is not None:
+            self.date_info = self.journal.resume_run_id(self.date_info)
+
+        self.cache = ResponseCache(cache_path, ttl=cache_ttl) if cache_path else None
+        self.fetcher = DetailFetcher(
+            referer=self.url,
+            max_workers=max_workers,
+            requests_per_second=requests_per_second,
+            cache=self.cache
+        )
         self.driver = self._init_driver()
 
     def _init_driver(self):
         """Initialize Selenium Chrome WebDriver."""
+        if self.browser_pool is not None:
+            return self.browser_pool.acquire()
         options = Options()
-        options.add_argument("--start-maximized")
-        return webdriver.Chrome(options=options)
+        if self.lean:
+            options = lean_chrome_options(options)
+        else:
+            options.add_argument("--start-maximized")
+        driver = webdriver.Chrome(options=options)
+        if self.lean:
+            enable_resource_blocking(driver)
+        return driver
 
-    def get_hospital_categories(self):
-        """Fetch category (id, name) from the HIRA website."""
+    def _open_search_panel(self, reload=True):
+        """Load the map page and open the search panel (waits on the panel when pooled/lean)."""
+        if self.browser_pool is not None or self.lean:
+            open_search_panel(self.driver, self.url, reload=reload)
+            return
         self.driver.get(self.url)
         check_and_click(self.driver, '//a[@id="viewTab2"]')
         time.sleep(1)
+
+    def get_hospital_categories(self):
+        """Fetch category (id, name) from the HIRA website."""
+        if self.lean and self.browser_pool is None:
+            self.driver_profile = profile_driver(self.driver, self.url)
+        else:
+            self._open_search_panel(reload=self.browser_pool is None)  # pooled drivers are already warm
         labels = self.driver.find_elements(By.XPATH, '//ul[@id="hospType"]/li/label')
         return [
             (label.get_attribute("for"), label.text.strip())
             for label in labels if label.text.strip() in self.target_categories
         ]
 
+    def iter_hospitals(self, max_rounds: int = 100, wait_timeout: float = 3, first_wait_timeout: float = 100):
+        """
+        Stream hospital entries from the search result as the list lazily loads.
+
+        Each round runs one script that scrolls to the last result and returns only
+        the entries not seen yet, then waits until more results appear (or times out).
+        Until the first results render, it keeps waiting up to first_wait_timeout,
+        so a slow search does not end the stream with zero hospitals.
+
+        Parameters:
+            max_rounds (int): max number of scroll rounds
+            wait_timeout (float): seconds to wait for new results after each scroll
+            first_wait_timeout (float): seconds to wait for the first results after the search
+
+        Yields:
+            Dictionaries with index, hospital name and ykiho.
+        """
+        collected = 0
+        first_deadline = time.monotonic() + first_wait_timeout
+        for _ in range(max_rounds):
+            batch = self.driver.execute_script(COLLECT_RESULTS_JS, collected)
+            for name, ykiho in batch:
+                collected += 1
+                yield {"index": collected, "name": name, "ykiho": ykiho}
+
+            timeout = wait_timeout if collected else max(first_deadline - time.monotonic(), 0)
+            try:
+                WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(
+                    lambda d: d.execute_script(COUNT_RESULTS_JS) > collected)
+            except TimeoutException:
+                break
+
     def scroll_and_collect_hospitals(self):
         """
         Scroll through the search result and collect all hospital entries with ykiho.
@@ -73,59 +173,49 @@ class HospitalDetailScraper:
         Returns:
             List of dictionaries with hospital name and ykiho info.
         """
-        prev_len = 0
-        for i in range(100):
-            a_tags = self.driver.find_elements(By.CSS_SELECTOR, "ul.mapResult li a.tit")
-            if not a_tags:
-                time.sleep(1)
-                continue
-            self.driver.execute_script("arguments[0].scrollIntoView(true);", a_tags[-1])
-            time.sleep(1.2)
-            new_tags = self.driver.find_elements(By.CSS_SELECTOR, "ul.mapResult li a.tit")
-            if len(new_tags) == prev_len:
-                break
-            prev_len = len(new_tags)
-
-        result_list = []
-        for idx, tag in enumerate(new_tags, 1):
-            name = tag.text.strip()
-            onclick = tag.get_attribute("onclick")
-            match = re.search(r'"(JDQ4[^"]+)"', onclick)
-            ykiho = match.group(1) if match else None
-            result_list.append({"index": idx, "name": name, "ykiho": ykiho})
-        return result_list
-
-    def fetch_detail_info(self, hospitals: list):
+        return list(self.iter_hospitals())
+
+    def fetch_detail_info(self, hospitals):
         """
         Use hospital ykiho to request additional info (staff count, specialties).
-        """
-        detail_url = "https://www.hira.or.kr/ra/hosp/hospInfoAjax.do"
-        headers = {
-            "User-Agent": "Mozilla/5.0",
-            "Referer": self.url
-        }
-
-        for item in hospitals:
-            ykiho = item.get("ykiho")
-            if not ykiho:
-                item["doctor_info"] = "N/A"
-                item["specialties"] = []
-                continue
+        Requests run concurrently; results are written back in input order.
+        hospitals may be a stream (iter_hospitals()): requests then start while the
+        result list is still scrolling.
+        With a checkpoint journal, pages fetched by an interrupted run are reused
+        and every new page is journaled as soon as it arrives. Failed pages are
+        not journaled (a rerun fetches them again) and are listed in self.failed_ykihos.
 
-            try:
-                res = requests.get(detail_url, params={"ykiho": ykiho}, headers=headers, timeout=10)
-                res.encoding = "utf-8"
-                soup = BeautifulSoup(res.text, "html.parser")
+        Returns:
+            List of hospital dictionaries with 'doctor_info' and 'specialties' added.
+        """
+        start = time.time()
+        collected = []
+        pending = []
+        self.failed_ykihos = []
 
-                td = soup.find("td", string=lambda t: t and "총 인원" in t)
-                item["doctor_info"] = td.text.strip() if td else "N/A"
+        def pending_ykihos():
+            for item in hospitals:
+                collected.append(item)
+                saved = self.journal.get("detail", item.get("ykiho")) if self.journal and item.get("ykiho") else None
+                if saved:
+                    item.update(saved)
+                else:
+                    pending.append(item)
+                    yield item.get("ykiho")
 
-                ul_lists = soup.select("ul.pop_list_style")
-                item["specialties"] = [li.text.strip() for li in ul_lists[0].select("li")] if ul_lists else []
+        def checkpoint(pos, result):
+            ykiho = pending[pos].get("ykiho")
+            if result["doctor_info"].startswith("Request failed"):
+                self.failed_ykihos.append(ykiho)
+            elif self.journal is not None and ykiho:
+                self.journal.mark_done("detail", ykiho, **result)
 
-            except Exception as e:
-                item["doctor_info"] = f"Request failed: {e}"
-                item["specialties"] = []
+        results = self.fetcher.fetch_all(pending_ykihos(), on_result=checkpoint)
+        for item, result in zip(pending, results):
+            item.update(result)
+        print(f"⏱️ Fetched {len(pending)} detail pages in {time.time() - start:.1f}s"
+              f" ({len(collected) - len(pending)} restored from checkpoint)")
+        return collected
 
     def save_to_csv(self, hospitals: list, category_name: str):
         """Save hospital detail data to CSV file."""
@@ -136,6 +226,17 @@ class HospitalDetailScraper:
         save_path = os.path.join(self.save_dir, filename)
         df.to_csv(save_path, index=False, encoding="utf-8-sig")
         print(f"✅ Saved: {save_path}")
+        return save_path
+
+    def finish_checkpoint(self):
+        """Delete the journal after a clean run; keep it when pages failed so a rerun retries them."""
+        if self.journal is None:
+            return
+        if self.failed_categories:
+            self.journal.close()
+            print(f"♻️ Checkpoint kept for retry: {self.journal.path}")
+        else:
+            self.journal.finish()
 
     def run(self):
         """
@@ -143,10 +244,12 @@ class HospitalDetailScraper:
         """
         categories = self.get_hospital_categories()
         for category_id, category_name in categories:
+            if self.journal is not None and self.journal.is_done("category", category_name):
+                print(f"\n⏭️ Already saved: {category_name}")
+                continue
+
             print(f"\n🔍 Category: {category_name} ({category_id})")
-            self.driver.get(self.url)
-            check_and_click(self.driver, '//a[@id="viewTab2"]')
-            time.sleep(1)
+            self._open_search_panel()
 
             checkbox = self.driver.find_element(By.ID, category_id)
             self.driver.execute_script("arguments[0].click();", checkbox)
@@ -164,10 +267,25 @@ class HospitalDetailScraper:
             self.driver.execute_script("arguments[0].click();", search_button)
             time.sleep(3)
 
-            hospitals = self.scroll_and_collect_hospitals()
+            # Detail requests start while the result list is still scrolling
+            hospitals = self.fetch_detail_info(self.iter_hospitals())
             print(f"📦 Loaded hospitals: {len(hospitals)}")
 
-            self.fetch_detail_info(hospitals)
-            self.save_to_csv(hospitals, category_name)
+            save_path = self.save_to_csv(hospitals, category_name)
+            if self.failed_ykihos:
+                # Not marked done: a rerun re-enters the category and refetches only the failures
+                self.failed_categories.append((category_name, len(self.failed_ykihos)))
+                print(f"⚠️ {len(self.failed_ykihos)} detail page(s) failed: {category_name}")
+            elif self.journal is not None:
+                self.journal.mark_done("category", category_name, file=save_path)
+
+        self.finish_checkpoint()
 
-        self.driver.quit()
+        if self.cache:
+            self.cache.report()
+            self.cache.close()
+        self.fetcher.close()
+        if self.browser_pool is not None:
+            self.browser_pool.release(self.driver)
+        else:
+            self.driver.quit()
@@ -1,7 +1,6 @@
 # utils/scraper_hospital.py
 import os
 import time
-import glob
 from datetime import datetime
 
 from selenium import webdriver
@@ -11,7 +10,11 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoAlertPresentException
 
-from utils.scraper_base import open_url_and_prepare, check_and_click
+from utils.scraper_base import (
+    open_url_and_prepare, check_and_click, wait_for_new_download, resume_downloads, open_search_panel,
+    lean_chrome_options, enable_resource_blocking, profile_driver, snapshot_downloads, report_latency
+)
+from utils.checkpoint import CheckpointJournal
 
 
 class HospitalScraper:
@@ -25,7 +28,12 @@ class HospitalScraper:
         download_dir: str,
         log_dir: str,
         exclude_categories: list = None,
-        file_naming_rule: str = "{category}_auto_{timestamp}{ext}"
+        file_naming_rule: str = "{category}_auto_{timestamp}{ext}",
+        download_timeout: int = 60,
+        headless: bool = False,
+        checkpoint_path: str = None,
+        browser_pool=None,
+        lean: bool = False
     ):
         """
         Initialize scraper with config.
@@ -36,16 +44,35 @@ class HospitalScraper:
             log_dir (str): path to store failed logs
             exclude_categories (list): names of categories to skip (e.g., ['의원'])
             file_naming_rule (str): pattern for renaming files
+            download_timeout (int): max seconds to wait for each Excel download
+            headless (bool): run Chrome without a visible window
+            checkpoint_path (str): JSONL journal of finished downloads; an interrupted run
+                restarted with the same journal skips them (no checkpointing if None)
+            browser_pool (BrowserPool): shared pool of warm drivers to borrow from
+                instead of starting a new Chrome (see utils/scraper_base.py)
+            lean (bool): lean profile (small window, no GPU) with images, map
+                tiles and fonts blocked; reports page-ready time and driver memory
         """
         self.url = url
         self.download_dir = download_dir
         self.log_dir = log_dir
         self.exclude_categories = exclude_categories or []
         self.file_naming_rule = file_naming_rule
+        self.download_timeout = download_timeout
+        self.headless = headless
+        self.browser_pool = browser_pool
+        self.lean = lean
+        self.driver_profile = None
 
         self.date_info = datetime.now().strftime("%Y%m%d_%H%M")
         self.failed_ids = []
         self.downloaded_file_paths = []
+        self.download_latencies = []
+        self.renamed_file_paths = []
+
+        self.journal = CheckpointJournal(checkpoint_path) if checkpoint_path else None
+        if self.journal is not None:
+            self.date_info = self.journal.resume_run_id(self.date_info)
 
         os.makedirs(self.download_dir, exist_ok=True)
         os.makedirs(self.log_dir, exist_ok=True)
@@ -54,6 +81,8 @@ class HospitalScraper:
 
     def _init_driver(self):
         """Set up Chrome WebDriver for automated download."""
+        if self.browser_pool is not None:
+            return self.browser_pool.acquire(download_dir=self.download_dir)
         options = Options()
         prefs = {
             "download.default_directory": self.download_dir,
@@ -63,12 +92,25 @@ class HospitalScraper:
             "profile.default_content_setting_values.automatic_downloads": 1
         }
         options.add_experimental_option("prefs", prefs)
-        options.add_argument("--start-maximized")
-        return webdriver.Chrome(options=options)
+        if self.lean:
+            options = lean_chrome_options(options, headless=self.headless)
+        else:
+            options.add_argument("--start-maximized")
+            if self.headless:
+                options.add_argument("--headless=new")
+        driver = webdriver.Chrome(options=options)
+        if self.lean:
+            enable_resource_blocking(driver)
+        return driver
 
     def get_category_info(self):
         """Get hospital category (id, name) list from HIRA map."""
-        open_url_and_prepare(self.driver, self.url)
+        if self.browser_pool is not None:
+            open_search_panel(self.driver, self.url, reload=False)  # pooled drivers are already warm
+        elif self.lean:
+            self.driver_profile = profile_driver(self.driver, self.url)
+        else:
+            open_url_and_prepare(self.driver, self.url)
         labels = self.driver.find_elements(By.XPATH, '//ul[@id="hospType"]/li/label')
         return [
             (label.get_attribute("for"), label.text.strip())
@@ -76,9 +118,23 @@ class HospitalScraper:
             if label.text.strip() not in self.exclude_categories
         ]
 
-    def download_all(self):
-        """Iterate all categories and download Excel files."""
+    def get_targets(self):
+        """Return the (id, name) download targets; used by ScraperPool to shard work."""
+        return self.get_category_info()
+
+    def download_all(self, targets: list = None):
+        """
+        Iterate all categories and download Excel files.
+
+        Parameters:
+            targets (list): category names to download (all categories if None)
+        """
         category_info = self.get_category_info()
+        if targets is not None:
+            category_info = [(cid, cname) for cid, cname in category_info if cname in targets]
+
+        category_info = resume_downloads(
+            self.journal, category_info, self.downloaded_file_paths, self.renamed_file_paths)
 
         for idx, (category_id, category_name) in enumerate(category_info):
             retry_attempted = False
@@ -123,22 +179,23 @@ class HospitalScraper:
                     except NoAlertPresentException:
                         pass
 
-                    before_files = set(glob.glob(os.path.join(self.download_dir, "*.xls*")))
+                    before_files = snapshot_downloads(self.download_dir)
 
                     download_button = self.driver.find_element(By.XPATH, '//a[contains(@class,"excelDown")]')
                     self.driver.execute_script("arguments[0].click();", download_button)
                     print(f"🚀 Download requested: {category_name}")
-                    time.sleep(35)
+                    requested_at = time.time()
 
-                    after_files = set(glob.glob(os.path.join(self.download_dir, "*.xls*")))
-                    new_files = after_files - before_files
+                    new_file = wait_for_new_download(self.download_dir, before_files, timeout=self.download_timeout)
+                    elapsed = time.time() - requested_at
 
-                    if new_files:
-                        new_file = max(new_files, key=os.path.getctime)
+                    if new_file:
                         self.downloaded_file_paths.append((new_file, category_name))
-                        print(f"✅ Downloaded: {category_name}")
+                        self._checkpoint("downloaded", category_name, new_file)
+                        self.download_latencies.append((category_name, round(elapsed, 1)))
+                        print(f"✅ Downloaded: {category_name} ({elapsed:.1f}s)")
                     else:
-                        raise Exception("No new file detected")
+                        raise Exception(f"No new file detected within {self.download_timeout}s")
 
                     check_and_click(self.driver, '//button[contains(text(), "초기화")]', timeout=5)
                     time.sleep(2)
@@ -148,7 +205,7 @@ class HospitalScraper:
                     reason = f"Exception: {str(e)}"
                     if not retry_attempted:
                         print(f"🔄 Retry: {reason}")
-                        open_url_and_prepare(self.driver, self.url)
+                        self._recover()
                         retry_attempted = True
                     else:
                         print(f"❌ Failed: {category_name}")
@@ -169,10 +226,41 @@ class HospitalScraper:
 
             try:
                 os.rename(file_path, new_path)
+                self.renamed_file_paths.append((new_path, category_name))
+                self._checkpoint("renamed", category_name, new_path)
                 print(f"✅ Renamed: {os.path.basename(file_path)} → {new_name}")
             except Exception as e:
                 self.failed_ids.append(("", category_name, f"Rename failed: {str(e)}"))
 
+    def _recover(self):
+        """Bring the browser back to the search panel after a failed attempt."""
+        if self.browser_pool is not None:
+            self.driver = self.browser_pool.recover(self.driver, self.download_dir)
+        else:
+            open_url_and_prepare(self.driver, self.url)
+
+    def close_driver(self):
+        """Quit the browser, or hand it back to the shared browser pool."""
+        if self.browser_pool is not None:
+            self.browser_pool.release(self.driver)
+        else:
+            self.driver.quit()
+
+    def _checkpoint(self, kind, name, file_path):
+        """Record a finished download/rename in the checkpoint journal (if enabled)."""
+        if self.journal is not None:
+            self.journal.mark_done(kind, name, file=file_path)
+
+    def finish_checkpoint(self):
+        """Delete the journal after a clean run; keep it when items failed so a rerun retries them."""
+        if self.journal is None:
+            return
+        if self.failed_ids:
+            self.journal.close()
+            print(f"♻️ Checkpoint kept for retry: {self.journal.path}")
+        else:
+            self.journal.finish()
+
     def save_log(self):
         """Save failure logs to text file in log_dir."""
         if self.failed_ids:
@@ -190,5 +278,7 @@ class HospitalScraper:
         """Execute full scraping process."""
         self.download_all()
         self.rename_files()
+        report_latency(self.download_latencies)
         self.save_log()
-        self.driver.quit()
+        self.finish_checkpoint()
+        self.close_driver()
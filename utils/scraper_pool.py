@@ -0,0 +1,196 @@
+# utils/scraper_pool.py
+
+import os
+import glob
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.checkpoint import CheckpointJournal
+from utils.scraper_base import report_latency, resume_downloads
+
+
+class ScraperPool:
+    """
+    Worker pool that shards download targets across several headless Chrome workers.
+
+    Works with any scraper exposing get_targets(), download_all(targets=...),
+    rename_files(), save_log(), finish_checkpoint(), close_driver()
+    and a download_latencies list
+    (HospitalScraper, ClinicScraper).
+
+    With a checkpoint_path, every worker journals to its own '<path>.worker_N' file
+    (no two threads append to one JSONL file); the coordinator folds those into
+    '<path>' after the workers finish, and before sharding on a resumed run.
+    """
+
+    def __init__(
+        self,
+        scraper_cls,
+        url: str,
+        download_dir: str,
+        log_dir: str,
+        num_workers: int = 4,
+        headless: bool = True,
+        **scraper_kwargs
+    ):
+        """
+        Initialize the worker pool.
+
+        Parameters:
+            scraper_cls (type): scraper class to run in each worker
+            url (str): HIRA map URL
+            download_dir (str): final folder for renamed files
+            log_dir (str): folder for failure logs and the merged manifest
+            num_workers (int): number of concurrent Chrome workers
+            headless (bool): run worker browsers headless
+            **scraper_kwargs: extra arguments passed to every scraper instance
+                (checkpoint_path is split per worker, see above)
+        """
+        self.scraper_cls = scraper_cls
+        self.url = url
+        self.download_dir = download_dir
+        self.log_dir = log_dir
+        self.num_workers = max(1, num_workers)
+        self.headless = headless
+        self.checkpoint_path = scraper_kwargs.pop("checkpoint_path", None)
+        self.scraper_kwargs = scraper_kwargs
+
+        self.coordinator = None
+        self.workers = []
+
+    def _new_scraper(self, download_dir, checkpoint_path=None):
+        return self.scraper_cls(
+            url=self.url,
+            download_dir=download_dir,
+            log_dir=self.log_dir,
+            headless=self.headless,
+            checkpoint_path=checkpoint_path,
+            **self.scraper_kwargs
+        )
+
+    def _worker_checkpoint_path(self, worker_idx):
+        return f"{self.checkpoint_path}.worker_{worker_idx}" if self.checkpoint_path else None
+
+    def _merge_worker_journals(self):
+        """Fold every '<checkpoint_path>.worker_N' journal into the coordinator's, then delete it."""
+        journal = self.coordinator.journal
+        if journal is None:
+            return
+        for path in sorted(glob.glob(glob.escape(self.checkpoint_path) + ".worker_*")):
+            worker_journal = CheckpointJournal(path)
+            for (kind, key), value in worker_journal.records.items():
+                if kind != "run":  # the coordinator's run id names the files
+                    journal.mark_done(kind, key, **value)
+            worker_journal.finish()
+
+    def shard(self, targets: list):
+        """Split targets round-robin into at most num_workers shards."""
+        shards = [targets[i::self.num_workers] for i in range(self.num_workers)]
+        return [s for s in shards if s]
+
+    def _run_worker(self, worker_idx, shard):
+        """Download one shard in its own browser and download folder."""
+        worker_dir = os.path.join(self.download_dir, f"worker_{worker_idx}")
+        try:
+            scraper = self._new_scraper(worker_dir, self._worker_checkpoint_path(worker_idx))
+        except Exception as e:
+            print(f"❌ Worker {worker_idx} failed to start: {e}")
+            return worker_idx, shard, None, f"Worker start failed: {e}"
+
+        try:
+            scraper.download_all(targets=[name for _, name in shard])
+            return worker_idx, shard, scraper, None
+        except Exception as e:
+            print(f"❌ Worker {worker_idx} crashed: {e}")
+            return worker_idx, shard, scraper, f"Worker crashed: {e}"
+        finally:
+            if scraper.journal is not None:
+                scraper.journal.close()
+            scraper.close_driver()
+
+    def download_all(self):
+        """Discover targets once, then download all shards in parallel."""
+        self.coordinator = self._new_scraper(self.download_dir, self.checkpoint_path)
+        try:
+            targets = self.coordinator.get_targets()
+        finally:
+            self.coordinator.close_driver()
+
+        # Worker journals left by an interrupted run, then skip what is already done
+        self._merge_worker_journals()
+        remaining = resume_downloads(self.coordinator.journal, targets,
+                                     self.coordinator.downloaded_file_paths, self.coordinator.renamed_file_paths)
+
+        shards = self.shard(remaining)
+        print(f"🧩 {len(remaining)} of {len(targets)} targets across {len(shards)} worker(s)")
+
+        with ThreadPoolExecutor(max_workers=len(shards) or 1) as executor:
+            self.workers = list(executor.map(self._run_worker, range(len(shards)), shards))
+        self._merge_worker_journals()
+
+        # Merge worker results into the coordinator so rename/log steps run once
+        for worker_idx, shard, scraper, error in self.workers:
+            done = set()
+            if scraper is not None:
+                self.coordinator.downloaded_file_paths.extend(scraper.downloaded_file_paths)
+                self.coordinator.renamed_file_paths.extend(scraper.renamed_file_paths)
+                self.coordinator.download_latencies.extend(scraper.download_latencies)
+                self.coordinator.failed_ids.extend(scraper.failed_ids)
+                done = {name for _, name in scraper.downloaded_file_paths + scraper.renamed_file_paths}
+                done |= {name for _, name, _ in scraper.failed_ids}
+
+            for target_id, target_name in shard:
+                if target_name not in done:
+                    reason = error or "Target not found by worker"
+                    self.coordinator.failed_ids.append((target_id, target_name, reason))
+
+        return targets
+
+    def write_manifest(self, targets: list):
+        """Write one JSON manifest describing every target's outcome."""
+        worker_of = {}
+        for worker_idx, shard, _, _ in self.workers:
+            for _, name in shard:
+                worker_of[name] = worker_idx
+
+        files = {name: path for path, name in self.coordinator.renamed_file_paths}
+        latencies = dict(self.coordinator.download_latencies)
+        reasons = {name: reason for _, name, reason in self.coordinator.failed_ids}
+
+        manifest = [
+            {
+                "id": target_id,
+                "name": target_name,
+                "worker": worker_of.get(target_name),
+                "status": "ok" if target_name in files else "failed",
+                "file": files.get(target_name),
+                "latency_s": latencies.get(target_name),
+                "reason": reasons.get(target_name),
+            }
+            for target_id, target_name in targets
+        ]
+
+        manifest_path = os.path.join(self.log_dir, f"download_manifest_{self.coordinator.date_info}.json")
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        print(f"📄 Saved manifest: {manifest_path}")
+        return manifest_path
+
+    def _cleanup_worker_dirs(self):
+        """Remove worker download folders once their files have been moved out."""
+        for worker_idx, _, _, _ in self.workers:
+            worker_dir = os.path.join(self.download_dir, f"worker_{worker_idx}")
+            try:
+                os.rmdir(worker_dir)
+            except OSError:
+                pass
+
+    def run(self):
+        """Execute the parallel download, then rename, log and write the manifest once."""
+        targets = self.download_all()
+        self.coordinator.rename_files()
+        self._cleanup_worker_dirs()
+        report_latency(self.coordinator.download_latencies)
+        self.coordinator.save_log()
+        self.coordinator.finish_checkpoint()
+        self.write_manifest(targets)
@@ -0,0 +1,135 @@
+# utils/storage.py
+
+import os
+import glob
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from config.mapping_info import column_mapping
+from utils.schema import apply_schema
+
+# Hive partition keys written by ingest_file (always strings, e.g. crawl_ts "20250516_1421")
+PARTITION_SCHEMA = pa.schema([pa.field("group", pa.string()), pa.field("crawl_ts", pa.string())])
+
+
+# Split a downloaded file name into (group, crawl timestamp)
+# e.g., "병원_auto_20250516_1421.xlsx" → ("병원", "20250516_1421")
+#       "의원_auto_내과_20250516_1945.xlsx" → ("의원_내과", "20250516_1945")
+def parse_snapshot_name(file_name):
+    parts = os.path.splitext(os.path.basename(file_name))[0].split("_")
+    if len(parts) < 3:
+        return "_".join(parts), "unknown"
+    crawl_ts = "_".join(parts[-2:])
+    group = "_".join(p for p in parts[:-2] if p != "auto")
+    return group, crawl_ts
+
+
+# Normalize a raw frame so every partition shares one schema
+def normalize_raw_frame(df):
+    df = df.rename(columns=column_mapping)
+    for col in df.columns:
+        if col == "NO":
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+        elif col == "postal_code":
+            df[col] = df[col].astype("string").str.replace(r"\.0$", "", regex=True).str.zfill(5)
+        else:
+            df[col] = df[col].astype("string")
+    return df
+
+
+def ingest_file(file_path, dataset_dir, group=None, crawl_ts=None, overwrite=False):
+    """
+    Convert one downloaded xlsx/csv file into a Parquet partition (done once per file).
+
+    Parameters:
+    - file_path (str): source xlsx or csv
+    - dataset_dir (str): root of the partitioned Parquet dataset
+    - group (str or None): category/department partition value (parsed from the name if None)
+    - crawl_ts (str or None): crawl timestamp partition value (parsed from the name if None)
+    - overwrite (bool): rewrite the partition if it already exists
+
+    Returns:
+    - str path of the written (or existing) partition file
+    """
+    parsed_group, parsed_ts = parse_snapshot_name(file_path)
+    group = group or parsed_group
+    crawl_ts = crawl_ts or parsed_ts
+
+    partition_dir = os.path.join(dataset_dir, f"group={group}", f"crawl_ts={crawl_ts}")
+    part_path = os.path.join(partition_dir, "part-0.parquet")
+    if os.path.exists(part_path) and not overwrite:
+        return part_path
+
+    if file_path.endswith(".csv"):
+        df = pd.read_csv(file_path, dtype=str)
+    else:
+        df = pd.read_excel(file_path, dtype=str)
+    df = normalize_raw_frame(df)
+    df["source_file"] = os.path.basename(file_path)
+
+    os.makedirs(partition_dir, exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, part_path, compression="zstd")
+    return part_path
+
+
+def ingest_folder(folder_path, dataset_dir, overwrite=False):
+    """
+    Convert every xlsx/csv file in a folder into the Parquet dataset.
+
+    Returns:
+    - list of partition file paths
+    """
+    files = sorted(
+        glob.glob(os.path.join(folder_path, "*.xls*")) + glob.glob(os.path.join(folder_path, "*.csv"))
+    )
+    print(f"📦 Ingesting {len(files)} file(s) into {dataset_dir}")
+    return [ingest_file(f, dataset_dir, overwrite=overwrite) for f in files]
+
+
+def open_dataset(dataset_dir):
+    """
+    Open the partitioned dataset with one schema unified across every file.
+
+    Crawls do not always share columns; without an explicit schema, pyarrow takes the
+    first file's schema and drops (or fails on) columns that only later crawls have.
+    Missing columns read as nulls.
+    """
+    files = ds.dataset(dataset_dir, format="parquet", partitioning="hive").files
+    schemas = [pq.read_schema(path).remove_metadata() for path in files]
+    schema = pa.unify_schemas(schemas + [PARTITION_SCHEMA], promote_options="permissive")
+    partitioning = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+    return ds.dataset(files, schema=schema, format="parquet", partitioning=partitioning,
+                      partition_base_dir=dataset_dir)
+
+
+def load_dataset(dataset_dir, columns=None, filters=None, optimize_dtypes=True):
+    """
+    Load the partitioned Parquet dataset with column projection and predicate pushdown.
+
+    Parameters:
+    - dataset_dir (str): root of the partitioned dataset
+    - columns (list or None): columns to read (all if None); partition keys
+      'group' and 'crawl_ts' can be requested like normal columns
+    - filters (list or None): pyarrow DNF filters, e.g. [("group", "=", "병원")];
+      filters on partition keys skip whole files
+    - optimize_dtypes (bool): cast columns with the declared schema (config/schema_info.py);
+      phone is reduced to digits (see apply_schema)
+
+    Returns:
+    - pd.DataFrame
+    """
+    dataset = open_dataset(dataset_dir)
+    expression = pq.filters_to_expression(filters) if filters else None
+    df = dataset.to_table(columns=columns, filter=expression).to_pandas()
+    return apply_schema(df, inplace=True) if optimize_dtypes else df
+
+
+def latest_crawl_ts(dataset_dir, group=None):
+    """Return the most recent crawl timestamp in the dataset (optionally for one group)."""
+    pattern = os.path.join(dataset_dir, f"group={group}" if group else "group=*", "crawl_ts=*")
+    stamps = [os.path.basename(p).split("=", 1)[1] for p in glob.glob(pattern)]
+    return max(stamps) if stamps else None
@@ -0,0 +1,296 @@
+# utils/streaming_etl.py
+
+import os
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config.mapping_info import column_mapping, category_mapping
+from utils.analysis_utils import extract_region_info_vectorized
+from utils.storage import parse_snapshot_name
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Output columns of the streamed registry table (fixed so every batch shares one schema)
+OUTPUT_COLUMNS = [
+    "hospital_name",
+    "category",
+    "category_en",
+    "phone",
+    "postal_code",
+    "address",
+    "province",
+    "city",
+    "province_en",
+    "homepage_address",
+    "source_file",
+]
+
+DEDUP_SUBSET = ["hospital_name", "phone", "postal_code"]
+
+
+# Peak resident set size of this process in MB (None where unsupported)
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / 1024 ** 2 if os.uname().sysname == "Darwin" else peak / 1024
+
+
+def iter_file_batches(file_path, batch_size=10000):
+    """
+    Yield a file as DataFrame batches without loading it whole.
+
+    xlsx is read with openpyxl in read-only mode, csv with pandas chunks and
+    Parquet with pyarrow row batches. Legacy .xls (BIFF) is not readable by
+    openpyxl: it is loaded whole with xlrd and then sliced into batches.
+    """
+    if file_path.endswith(".csv"):
+        yield from pd.read_csv(file_path, dtype=str, chunksize=batch_size)
+
+    elif file_path.endswith(".parquet"):
+        for batch in pq.ParquetFile(file_path).iter_batches(batch_size=batch_size):
+            yield batch.to_pandas()
+
+    elif file_path.lower().endswith(".xls"):
+        try:
+            df = pd.read_excel(file_path, engine="xlrd", dtype=object)
+        except ImportError as e:
+            raise ImportError(f"Reading legacy .xls requires xlrd (pip install xlrd): {file_path}") from e
+        for start in range(0, len(df), batch_size):
+            yield df.iloc[start:start + batch_size].reset_index(drop=True)
+
+    else:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.active
+            sheet.reset_dimensions()  # exported files may declare a wrong sheet size
+            rows = sheet.iter_rows(values_only=True)
+            header = [str(h) if h is not None else "" for h in next(rows, [])]
+            buffer = []
+            for row in rows:
+                buffer.append(row)
+                if len(buffer) >= batch_size:
+                    yield pd.DataFrame(buffer, columns=header, dtype=object)
+                    buffer = []
+            if buffer:
+                yield pd.DataFrame(buffer, columns=header, dtype=object)
+        finally:
+            workbook.close()
+
+
+def transform_batch(batch, source_file):
+    """Rename columns, derive region/category columns and fix the output schema."""
+    batch = batch.rename(columns=column_mapping)
+    batch["source_file"] = source_file
+
+    if "address" in batch.columns:
+        batch[["province", "city", "province_en"]] = extract_region_info_vectorized(batch["address"]).astype(object)
+    if "category" in batch.columns:
+        batch["category_en"] = batch["category"].map(category_mapping)
+
+    batch = batch.reindex(columns=OUTPUT_COLUMNS)
+    if "postal_code" in batch.columns:
+        batch["postal_code"] = (
+            batch["postal_code"].astype("string").str.replace(r"\.0$", "", regex=True).str.zfill(5)
+        )
+    return batch.astype("string")
+
+
+class StreamingDeduplicator:
+    """Drops rows whose key columns were already seen, keeping only 64-bit key hashes in memory."""
+
+    def __init__(self, subset=DEDUP_SUBSET):
+        self.subset = subset
+        self.seen = set()
+
+    def filter(self, batch):
+        hashes = pd.util.hash_pandas_object(batch[self.subset].fillna(""), index=False)
+        keep = ~hashes.duplicated() & ~hashes.isin(self.seen)
+        self.seen.update(hashes[keep].tolist())
+        return batch[keep.to_numpy()]
+
+
+class _CsvSink:
+    def __init__(self, path, columns=OUTPUT_COLUMNS):
+        self.path = path
+        self.columns = columns
+        self.header = True
+
+    def write(self, df):
+        # BOM only on the first write so Excel still detects UTF-8
+        if self.header:
+            df.to_csv(self.path, mode="w", index=False, encoding="utf-8-sig")
+            self.header = False
+        else:
+            df.to_csv(self.path, mode="a", header=False, index=False, encoding="utf-8")
+
+    def close(self):
+        # Header-only file when no row was written, like the Parquet sink's empty table
+        if self.header:
+            self.write(pd.DataFrame(columns=self.columns))
+
+
+class _ParquetSink:
+    def __init__(self, path, columns=OUTPUT_COLUMNS):
+        self.schema = pa.schema([(col, pa.string()) for col in columns])
+        self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write(self, df):
+        self.writer.write_table(pa.Table.from_pandas(df, schema=self.schema, preserve_index=False))
+
+    def close(self):
+        self.writer.close()
+
+
+def run_streaming_etl(file_paths, output_path, batch_size=10000, dedup=True):
+    """
+    Stream raw registry files through rename → dedup → region/category derivation
+    and append each batch to the output, so memory stays bounded by the batch size.
+
+    Parameters:
+    - file_paths (list): xlsx/csv/parquet sources (any number of crawl snapshots)
+    - output_path (str): '.csv' or '.parquet' output file
+    - batch_size (int): rows per batch
+    - dedup (bool): drop rows whose hospital_name/phone/postal_code was already written
+
+    Returns:
+    - dict with rows_in, rows_out, duplicates, seconds and peak_rss_mb
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    sink = _ParquetSink(output_path) if output_path.endswith(".parquet") else _CsvSink(output_path)
+    deduplicator = StreamingDeduplicator() if dedup else None
+
+    stats = {"rows_in": 0, "rows_out": 0, "duplicates": 0}
+    start = time.time()
+    try:
+        for file_path in file_paths:
+            source_file = os.path.basename(file_path)
+            for batch in iter_file_batches(file_path, batch_size):
+                stats["rows_in"] += len(batch)
+                batch = transform_batch(batch, source_file)
+                if deduplicator is not None:
+                    before = len(batch)
+                    batch = deduplicator.filter(batch)
+                    stats["duplicates"] += before - len(batch)
+                if len(batch):
+                    sink.write(batch)
+                    stats["rows_out"] += len(batch)
+            print(f"✅ Streamed: {source_file}")
+    finally:
+        sink.close()
+
+    stats["seconds"] = round(time.time() - start, 2)
+    stats["peak_rss_mb"] = peak_rss_mb()
+    print(f"📦 {stats['rows_in']} rows in → {stats['rows_out']} rows out ({stats['duplicates']} duplicates)")
+    if stats["peak_rss_mb"] is not None:
+        print(f"🧮 Peak RSS: {stats['peak_rss_mb']:.0f} MB in {stats['seconds']}s")
+    return stats
+
+
+# Department name from a clinic file name, for both naming rules
+# ("의원_auto_내과_20250516_1945.xlsx", "clinic_내과_auto_20250516_1945.xlsx" → "내과")
+def department_from_filename(file_name):
+    group, _ = parse_snapshot_name(file_name)
+    parts = group.split("_")
+    return parts[-1] if len(parts) > 1 else None
+
+
+class ClinicFingerprintIndex:
+    """
+    Compact index of clinics seen across department files.
+
+    Maps a 64-bit hash of the key columns to a department bitset, so memory grows
+    with the number of distinct clinics (not rows or files).
+    """
+
+    def __init__(self, subset=DEDUP_SUBSET):
+        self.subset = subset
+        self.departments = []  # bit position → department name
+        self._bits = {}
+        self.masks = {}
+
+    def department_bit(self, department):
+        if department not in self._bits:
+            self._bits[department] = 1 << len(self.departments)
+            self.departments.append(department)
+        return self._bits[department]
+
+    def fingerprints(self, batch):
+        return pd.util.hash_pandas_object(batch[self.subset].fillna(""), index=False).tolist()
+
+    def add(self, batch, department):
+        bit = self.department_bit(department)
+        masks = self.masks
+        for fp in self.fingerprints(batch):
+            masks[fp] = masks.get(fp, 0) | bit
+
+    def decode(self, mask):
+        return [dept for i, dept in enumerate(self.departments) if mask >> i & 1]
+
+
+def run_clinic_dedup(file_paths, output_path, batch_size=10000):
+    """
+    Deduplicate clinic department files while keeping every clinic's departments.
+
+    Two streaming passes: the first builds a fingerprint → department bitset index,
+    the second writes the first row of each clinic with its aggregated departments.
+    Works across any number of files/crawl snapshots without loading them at once.
+
+    Parameters:
+    - file_paths (list): clinic department files (e.g., data/clinic/의원_auto_*.xlsx)
+    - output_path (str): '.csv' or '.parquet' output file
+    - batch_size (int): rows per batch
+
+    Returns:
+    - dict with rows_in, clinics, departments, seconds and peak_rss_mb
+    """
+    start = time.time()
+    index = ClinicFingerprintIndex()
+    rows_in = 0
+
+    # 1. Build fingerprint → department bitset
+    for file_path in file_paths:
+        department = department_from_filename(file_path)
+        for batch in iter_file_batches(file_path, batch_size):
+            rows_in += len(batch)
+            index.add(transform_batch(batch, os.path.basename(file_path)), department)
+
+    # 2. Write one row per clinic with its departments
+    columns = OUTPUT_COLUMNS + ["departments", "department_bits"]
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    sink = _ParquetSink(output_path, columns) if output_path.endswith(".parquet") else _CsvSink(output_path, columns)
+    written = set()
+    try:
+        for file_path in file_paths:
+            for batch in iter_file_batches(file_path, batch_size):
+                batch = transform_batch(batch, os.path.basename(file_path))
+                fps = index.fingerprints(batch)
+                keep = [fp not in written and not written.add(fp) for fp in fps]
+                if not any(keep):
+                    continue
+                masks = [index.masks[fp] for fp, k in zip(fps, keep) if k]
+                batch = batch[keep].copy()
+                batch["departments"] = [", ".join(index.decode(m)) for m in masks]
+                batch["department_bits"] = [str(m) for m in masks]
+                sink.write(batch.astype("string"))
+    finally:
+        sink.close()
+
+    stats = {
+        "rows_in": rows_in,
+        "clinics": len(written),
+        "departments": len(index.departments),
+        "seconds": round(time.time() - start, 2),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    print(f"🩺 {rows_in} department rows → {stats['clinics']} clinics across {stats['departments']} departments")
+    return stats